@@ -2,12 +2,13 @@
 
 from fastapi import APIRouter
 
-from src.api import inventory, orders, platforms
+from src.api import inventory, orders, platforms, webhooks
 
 api_router = APIRouter()
 
 api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
 api_router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
 api_router.include_router(platforms.router, prefix="/platforms", tags=["platforms"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
 
 __all__ = ["api_router"]
@@ -1,15 +1,17 @@
 """Inventory API endpoints."""
 
-from typing import List, Optional
+from typing import Annotated, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from src.db.database import get_db
 from src.models.product import Product, InventoryLog
 from src.services.inventory import InventoryService
-from src.services.aggregator import OrderAggregator
+from src.services.inventory_import import IMPORT_FORMATS, ImportFormatError, InventoryImporter
+from src.services.aggregator import OrderAggregator, get_aggregator
 
 router = APIRouter()
 
@@ -33,7 +35,7 @@ class ProductResponse(BaseModel):
 
 class InventoryUpdateRequest(BaseModel):
     """Inventory update request model."""
-    quantity: int
+    quantity: int = Field(..., ge=0)
     sync_platforms: bool = True
 
 
@@ -54,6 +56,28 @@ class InventoryLogResponse(BaseModel):
         from_attributes = True
 
 
+class InventoryImportResponse(BaseModel):
+    """Bulk import response model."""
+    rows: int
+    changed: int
+    unchanged: int
+    unknown: int
+    invalid: int
+    errors: List[str]
+
+
+class ReservationItem(BaseModel):
+    """Reservation line model."""
+    sku: str
+    quantity: int = Field(..., gt=0)
+
+
+class ReservationRequest(BaseModel):
+    """Order reservation request model."""
+    order_id: int
+    items: List[ReservationItem] = Field(..., min_length=1)
+
+
 class PlatformSyncResponse(BaseModel):
     """Platform sync response model."""
     sku: str
@@ -61,6 +85,18 @@ class PlatformSyncResponse(BaseModel):
     platforms_synced: dict
 
 
+class BulkSyncRequest(BaseModel):
+    """Bulk platform sync request model."""
+    quantities: Dict[str, Annotated[int, Field(ge=0)]] = Field(..., min_length=1)
+
+
+class BulkSyncResponse(BaseModel):
+    """Bulk platform sync response model."""
+    synced: int
+    failed: int
+    results: Dict[str, Dict[str, bool]]
+
+
 @router.get("/", response_model=List[ProductResponse])
 async def list_inventory(
     skip: int = Query(0, ge=0),
@@ -140,29 +176,22 @@ async def update_inventory(
 
     - **sku**: Product SKU
     - **quantity**: New quantity (absolute, not delta)
-    - **sync_platforms**: Whether to sync to all platforms
+    - **sync_platforms**: Whether to sync to all platforms; the push is
+      queued and sent shortly after, batched with other recent changes
     """
     service = InventoryService(db)
-    product = service.get_product(sku)
-
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-
-    # Calculate change
-    quantity_change = update.quantity - product.quantity_available
 
     # Update inventory
-    updated_product = service.update_quantity(
+    updated_product = service.set_quantity(
         sku=sku,
-        quantity_change=quantity_change,
+        quantity=update.quantity,
         change_type="adjustment",
-        reason="Manual update via API"
+        reason="Manual update via API",
+        sync_platforms=update.sync_platforms,
     )
 
-    # Sync to platforms if requested
-    if update.sync_platforms:
-        aggregator = OrderAggregator()
-        aggregator.sync_inventory_across_platforms(sku, update.quantity)
+    if not updated_product:
+        raise HTTPException(status_code=404, detail="Product not found")
 
     return ProductResponse(
         sku=updated_product.sku,
@@ -181,8 +210,9 @@ async def update_inventory(
 @router.post("/sync", response_model=PlatformSyncResponse)
 async def sync_inventory(
     sku: str = Query(..., description="Product SKU"),
-    quantity: int = Query(..., description="Quantity to sync"),
+    quantity: int = Query(..., ge=0, description="Quantity to sync"),
     db: Session = Depends(get_db),
+    aggregator: OrderAggregator = Depends(get_aggregator),
 ):
     """
     Sync inventory across all platforms.
@@ -197,8 +227,7 @@ async def sync_inventory(
         raise HTTPException(status_code=404, detail="Product not found")
 
     # Sync to all platforms
-    aggregator = OrderAggregator()
-    results = aggregator.sync_inventory_across_platforms(sku, quantity)
+    results = await run_in_threadpool(aggregator.sync_inventory_across_platforms, sku, quantity)
 
     return PlatformSyncResponse(
         sku=sku,
@@ -207,6 +236,100 @@ async def sync_inventory(
     )
 
 
+@router.post("/sync/bulk", response_model=BulkSyncResponse)
+async def sync_inventory_bulk(
+    request: BulkSyncRequest,
+    db: Session = Depends(get_db),
+    aggregator: OrderAggregator = Depends(get_aggregator),
+):
+    """
+    Sync many inventory quantities across all platforms in batches.
+
+    - **quantities**: Quantity to sync per SKU
+    """
+    known = {
+        sku for (sku,) in db.query(Product.sku).filter(Product.sku.in_(request.quantities))
+    }
+    unknown = sorted(set(request.quantities) - known)
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Products not found: {', '.join(unknown)}")
+
+    results = await run_in_threadpool(aggregator.sync_inventory_bulk, request.quantities)
+    synced = sum(all(platforms.values()) for platforms in results.values())
+
+    return BulkSyncResponse(synced=synced, failed=len(results) - synced, results=results)
+
+
+# Upload content types accepted without an explicit ``format``
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@router.post("/import", response_model=InventoryImportResponse)
+async def import_inventory(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson (default: from Content-Type)"),
+    sync_platforms: bool = Query(True, description="Queue changed quantities for the platforms"),
+    db: Session = Depends(get_db),
+):
+    """
+    Set quantities for many SKUs from a streamed CSV or NDJSON upload.
+
+    The body is read line by line and applied in chunks, so the upload is
+    never held in memory. Only SKUs whose quantity changed are written.
+
+    - **format**: csv (header with sku and quantity columns) or ndjson
+      (one {"sku", "quantity"} object per line)
+    - **sync_platforms**: Whether to push changed quantities to all platforms
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = format or IMPORT_CONTENT_TYPES.get(content_type)
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=415, detail="Upload CSV or NDJSON, or pass format")
+
+    importer = InventoryImporter(db, sync_platforms=sync_platforms)
+    try:
+        result = await importer.run(request.stream(), fmt)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return InventoryImportResponse(
+        rows=result.rows,
+        changed=result.changed,
+        unchanged=result.unchanged,
+        unknown=result.unknown,
+        invalid=result.invalid,
+        errors=result.errors,
+    )
+
+
+@router.post("/reservations", status_code=201)
+async def reserve_order(
+    reservation: ReservationRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Reserve stock for every line of an order, all or nothing.
+
+    - **order_id**: Order ID
+    - **items**: Lines with SKU and quantity
+    """
+    service = InventoryService(db)
+    reserved = service.reserve_order(
+        reservation.order_id,
+        [item.model_dump() for item in reservation.items],
+    )
+
+    if not reserved:
+        raise HTTPException(status_code=409, detail="Insufficient stock")
+
+    return {"order_id": reservation.order_id, "reserved": True}
+
+
 @router.get("/{sku}/logs", response_model=List[InventoryLogResponse])
 async def get_inventory_logs(
     sku: str,
@@ -1,15 +1,23 @@
 """Orders API endpoints."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from src.db.database import get_db
 from src.models.order import Order, OrderStatus
-from src.services.aggregator import OrderAggregator
+from src.services.aggregator import OrderAggregator, get_aggregator
+from src.services.breaker import PlatformUnavailableError
+from src.services.filters import OrderFilter
+from src.services.ingest import OrderIngestor
+from src.services.orders import OrderService, parse_order_id
+from src.services.pagination import OrderPosition, decode_cursor, encode_cursor
+from src.services.response_cache import ResponseCache, cache_key, get_response_cache
+from src.services.scheduler import SyncScheduler, get_scheduler
 
 router = APIRouter()
 
@@ -55,222 +63,314 @@ class SyncResponse(BaseModel):
     success: bool
     orders_synced: int
     platforms_synced: List[str]
+    platforms_failed: List[str] = []
+    platforms_late: List[str] = []
+    platforms_skipped: List[str] = []
     timestamp: datetime
 
 
+def _order_response(order: Order) -> OrderResponse:
+    """Build an API response from a stored order."""
+    return OrderResponse(
+        id=order.platform_order_id,
+        platform=order.platform,
+        order_number=order.platform_order_number,
+        status=order.status.value,
+        order_date=order.order_date.isoformat(),
+        customer_name=order.customer_name,
+        customer_email=order.customer_email,
+        subtotal=float(order.subtotal),
+        tax=float(order.tax),
+        shipping_cost=float(order.shipping_cost),
+        total=float(order.total),
+        currency=order.currency,
+        tracking_number=order.tracking_number,
+        carrier=order.carrier,
+        items=[
+            OrderItemResponse(
+                sku=item.sku,
+                name=item.product_name,
+                quantity=item.quantity,
+                unit_price=float(item.unit_price),
+                total_price=float(item.total_price),
+                variant_title=item.variant_title
+            )
+            for item in order.items
+        ]
+    )
+
+
+def _platform_order_response(order: Dict[str, Any]) -> OrderResponse:
+    """Build an API response from an order in the unified platform format."""
+    return OrderResponse(
+        id=str(order["id"]),
+        platform=order["platform"],
+        order_number=order.get("order_number"),
+        status=order["status"],
+        order_date=order["order_date"],
+        customer_name=order["customer"]["name"],
+        customer_email=order["customer"].get("email"),
+        subtotal=float(order["subtotal"]),
+        tax=float(order.get("tax", 0)),
+        shipping_cost=float(order.get("shipping_cost", 0)),
+        total=float(order["total"]),
+        currency=order.get("currency", "USD"),
+        tracking_number=order.get("tracking_number"),
+        carrier=order.get("carrier"),
+        items=[
+            OrderItemResponse(
+                sku=item["sku"],
+                name=item["name"],
+                quantity=item["quantity"],
+                unit_price=float(item["unit_price"]),
+                total_price=float(item["total_price"]),
+                variant_title=item.get("variant_title")
+            )
+            for item in order.get("items", [])
+        ]
+    )
+
+
+async def _find_order(
+    order_id: str,
+    platform: Optional[str],
+    db: Session,
+    aggregator: OrderAggregator,
+    cache: ResponseCache,
+) -> Order:
+    """
+    Resolve an order by ID with a single indexed lookup.
+
+    Orders missing locally but with a known platform are fetched with one
+    single-order platform call and stored. Database and cache work runs in
+    the thread pool, off the event loop.
+    """
+    encoded_platform, platform_order_id = parse_order_id(order_id)
+    platform = platform or encoded_platform
+
+    service = OrderService(db)
+    order = await run_in_threadpool(service.get_order, platform_order_id, platform=platform)
+    if order:
+        return order
+
+    data = None
+    if platform in aggregator.async_clients:
+        try:
+            data = await aggregator.fetch_order(platform, platform_order_id)
+        except PlatformUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+    if not data:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    return await run_in_threadpool(_store_order, data, platform, db, cache)
+
+
+def _store_order(data: Dict[str, Any], platform: str, db: Session, cache: ResponseCache) -> Order:
+    """Store an order fetched from its platform and load it back."""
+    OrderIngestor(db).upsert([data])
+    db.commit()
+    cache.invalidate()
+    return OrderService(db).get_order(str(data["id"]), platform=platform)
+
+
+def _save_order(order: Order, db: Session, cache: ResponseCache) -> OrderResponse:
+    """Commit changes to a stored order and build its response."""
+    db.commit()
+    cache.invalidate()
+    db.refresh(order)
+    return _order_response(order)
+
+
 @router.get("/", response_model=List[OrderResponse])
-async def list_orders(
+def list_orders(
+    response: Response,
     platform: Optional[str] = Query(None, description="Filter by platform"),
     status: Optional[OrderStatus] = Query(None, description="Filter by status"),
+    created_after: Optional[datetime] = Query(None, description="Only orders placed at or after"),
+    created_before: Optional[datetime] = Query(None, description="Only orders placed at or before"),
     limit: int = Query(100, ge=1, le=500, description="Max orders to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    live: bool = Query(False, description="Read from the platforms instead of the local database"),
     db: Session = Depends(get_db),
+    aggregator: OrderAggregator = Depends(get_aggregator),
+    cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     List all orders from all platforms.
 
+    Orders are read from the local database, which the sync path keeps up to
+    date; no platform API is called. Pages are cached in Redis until the
+    next change to the stored orders. When more orders may follow, the
+    ``X-Next-Cursor`` response header holds the cursor for the next page.
+
+    With **live** set, the platforms are queried concurrently instead, with
+    the filters applied at the source, and their newest-first streams are
+    merged lazily up to **limit**. Platforms that miss their deadline or
+    fail are left out and named in the ``X-Late-Platforms`` and
+    ``X-Failed-Platforms`` response headers.
+
     - **platform**: Filter by specific platform (shopify, amazon, ebay, etsy)
     - **status**: Filter by order status
-    - **limit**: Maximum orders to return per platform
+    - **created_after**: Only orders placed at or after this time
+    - **created_before**: Only orders placed at or before this time
+    - **limit**: Maximum orders to return
+    - **cursor**: Resume after the last order of a previous page
+    - **live**: Read straight from the platforms
     """
-    aggregator = OrderAggregator()
-
-    # Determine which platforms to fetch from
-    platforms = [platform] if platform else None
-
-    # Get orders from aggregator
-    orders = aggregator.get_all_orders(
-        limit_per_platform=limit,
-        platforms=platforms
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filters = OrderFilter(
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
     )
 
-    # Filter by status if specified
-    if status:
-        orders = [o for o in orders if o.get("status") == status.value]
-
-    # Convert to response format
-    response_orders = []
-    for order in orders:
-        items = [
-            OrderItemResponse(
-                sku=item["sku"],
-                name=item["name"],
-                quantity=item["quantity"],
-                unit_price=float(item["unit_price"]),
-                total_price=float(item["total_price"]),
-                variant_title=item.get("variant_title")
-            )
-            for item in order.get("items", [])
-        ]
+    if live:
+        result = aggregator.fetch_orders(
+            limit_per_platform=limit,
+            platforms=[platform] if platform else None,
+            limit=limit,
+            after=after,
+            filters=filters,
+        )
+        if result.late_platforms:
+            response.headers["X-Late-Platforms"] = ",".join(result.late_platforms)
+        if result.failed_platforms:
+            response.headers["X-Failed-Platforms"] = ",".join(result.failed_platforms)
+        if result.next_cursor:
+            response.headers["X-Next-Cursor"] = result.next_cursor
+        return [_platform_order_response(order) for order in result.orders]
+
+    key = cache_key("orders", {
+        "platform": platform,
+        "status": status.value if status else None,
+        "created_after": created_after,
+        "created_before": created_before,
+        "limit": limit,
+        "cursor": cursor,
+    })
+    cached, generation = cache.get(key)
+    if cached is not None:
+        if cached["next_cursor"]:
+            response.headers["X-Next-Cursor"] = cached["next_cursor"]
+        return cached["orders"]
+
+    service = OrderService(db)
+    orders = service.list_orders(platform=platform, filters=filters, limit=limit, after=after)
+
+    next_cursor = None
+    if len(orders) == limit:
+        last = orders[-1]
+        next_cursor = encode_cursor(
+            OrderPosition(last.order_date, last.platform, last.platform_order_id)
+        )
+        response.headers["X-Next-Cursor"] = next_cursor
 
-        response_orders.append(OrderResponse(
-            id=order["id"],
-            platform=order["platform"],
-            order_number=order.get("order_number"),
-            status=order["status"],
-            order_date=order["order_date"],
-            customer_name=order["customer"]["name"],
-            customer_email=order["customer"].get("email"),
-            subtotal=float(order["subtotal"]),
-            tax=float(order["tax"]),
-            shipping_cost=float(order["shipping_cost"]),
-            total=float(order["total"]),
-            currency=order["currency"],
-            tracking_number=order.get("tracking_number"),
-            carrier=order.get("carrier"),
-            items=items
-        ))
-
-    return response_orders
+    results = [_order_response(order) for order in orders]
+    cache.set(key, {
+        "orders": [result.model_dump() for result in results],
+        "next_cursor": next_cursor,
+    }, generation)
+    return results
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: str,
+    platform: Optional[str] = Query(None, description="Platform the order belongs to"),
     db: Session = Depends(get_db),
+    aggregator: OrderAggregator = Depends(get_aggregator),
+    cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Get a specific order by ID.
 
-    - **order_id**: Platform-specific order ID
+    - **order_id**: Platform-specific order ID, optionally as ``platform:id``
+    - **platform**: Platform the order belongs to
     """
-    # In demo mode, return from aggregator
-    aggregator = OrderAggregator()
-    orders = aggregator.get_all_orders(limit_per_platform=100)
+    order = await _find_order(order_id, platform, db, aggregator, cache)
 
-    order = next((o for o in orders if o["id"] == order_id), None)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    items = [
-        OrderItemResponse(
-            sku=item["sku"],
-            name=item["name"],
-            quantity=item["quantity"],
-            unit_price=float(item["unit_price"]),
-            total_price=float(item["total_price"]),
-            variant_title=item.get("variant_title")
-        )
-        for item in order.get("items", [])
-    ]
-
-    return OrderResponse(
-        id=order["id"],
-        platform=order["platform"],
-        order_number=order.get("order_number"),
-        status=order["status"],
-        order_date=order["order_date"],
-        customer_name=order["customer"]["name"],
-        customer_email=order["customer"].get("email"),
-        subtotal=float(order["subtotal"]),
-        tax=float(order["tax"]),
-        shipping_cost=float(order["shipping_cost"]),
-        total=float(order["total"]),
-        currency=order["currency"],
-        tracking_number=order.get("tracking_number"),
-        carrier=order.get("carrier"),
-        items=items
-    )
+    return _order_response(order)
 
 
 @router.patch("/{order_id}", response_model=OrderResponse)
 async def update_order(
     order_id: str,
     update: OrderUpdateRequest,
+    platform: Optional[str] = Query(None, description="Platform the order belongs to"),
     db: Session = Depends(get_db),
+    aggregator: OrderAggregator = Depends(get_aggregator),
+    cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Update an order's status and tracking information.
 
-    - **order_id**: Platform-specific order ID
+    - **order_id**: Platform-specific order ID, optionally as ``platform:id``
+    - **platform**: Platform the order belongs to
     - **status**: New order status
     - **tracking_number**: Tracking number for shipments
     - **carrier**: Shipping carrier
     """
-    # Get the order first
-    aggregator = OrderAggregator()
-    orders = aggregator.get_all_orders(limit_per_platform=100)
-
-    order = next((o for o in orders if o["id"] == order_id), None)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
+    order = await _find_order(order_id, platform, db, aggregator, cache)
 
     # Update on the platform
     if update.status:
-        success = aggregator.sync_order_status(
-            platform=order["platform"],
-            order_id=order_id,
-            status=update.status.value,
-            tracking_number=update.tracking_number
-        )
+        try:
+            success = await aggregator.update_order_status(
+                order.platform,
+                order.platform_order_id,
+                update.status.value,
+                tracking_number=update.tracking_number
+            )
+        except PlatformUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e))
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update order on platform")
 
-        # Update local data
-        order["status"] = update.status.value
+        # Update local data; the order just changed on the platform, so
+        # copies fetched before this update must not roll it back
+        order.status = update.status
+        order.platform_updated_at = datetime.utcnow()
 
     if update.tracking_number:
-        order["tracking_number"] = update.tracking_number
+        order.tracking_number = update.tracking_number
 
     if update.carrier:
-        order["carrier"] = update.carrier
-
-    # Return updated order
-    items = [
-        OrderItemResponse(
-            sku=item["sku"],
-            name=item["name"],
-            quantity=item["quantity"],
-            unit_price=float(item["unit_price"]),
-            total_price=float(item["total_price"]),
-            variant_title=item.get("variant_title")
-        )
-        for item in order.get("items", [])
-    ]
+        order.carrier = update.carrier
 
-    return OrderResponse(
-        id=order["id"],
-        platform=order["platform"],
-        order_number=order.get("order_number"),
-        status=order["status"],
-        order_date=order["order_date"],
-        customer_name=order["customer"]["name"],
-        customer_email=order["customer"].get("email"),
-        subtotal=float(order["subtotal"]),
-        tax=float(order["tax"]),
-        shipping_cost=float(order["shipping_cost"]),
-        total=float(order["total"]),
-        currency=order["currency"],
-        tracking_number=order.get("tracking_number"),
-        carrier=order.get("carrier"),
-        items=items
-    )
+    return await run_in_threadpool(_save_order, order, db, cache)
 
 
 @router.post("/sync", response_model=SyncResponse)
 async def sync_orders(
     platforms: Optional[List[str]] = Query(None, description="Platforms to sync"),
-    db: Session = Depends(get_db),
+    full: bool = Query(False, description="Ignore watermarks and refetch the recent window"),
+    scheduler: SyncScheduler = Depends(get_scheduler),
 ):
     """
     Force synchronization of orders from all platforms.
 
+    Each platform is asked only for orders changed since its last successful
+    sync, unless **full** is set. Platforms are synced concurrently; one that
+    misses its deadline is listed in ``platforms_late``. A platform already
+    syncing, here or on its leader replica, is listed in ``platforms_skipped``.
+
     - **platforms**: Optional list of specific platforms to sync
+    - **full**: Refetch the recent window instead of syncing incrementally
     """
-    aggregator = OrderAggregator()
-
-    # Get orders to trigger sync
-    orders = aggregator.get_all_orders(
-        limit_per_platform=100,
-        platforms=platforms
-    )
-
-    # Determine which platforms were synced
-    synced_platforms = list(set(order["platform"] for order in orders))
+    outcomes = await run_in_threadpool(scheduler.run_now, platforms, full=full)
+    results = [result for result in outcomes.values() if result is not None]
 
     return SyncResponse(
-        success=True,
-        orders_synced=len(orders),
-        platforms_synced=synced_platforms,
+        success=all(r.success for r in results),
+        orders_synced=sum(r.orders_synced for r in results),
+        platforms_synced=[r.platform for r in results if r.success],
+        platforms_failed=[r.platform for r in results if not r.success and not r.late],
+        platforms_late=[r.platform for r in results if r.late],
+        platforms_skipped=[platform for platform, result in outcomes.items() if result is None],
         timestamp=datetime.utcnow()
     )
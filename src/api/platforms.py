@@ -2,12 +2,14 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from src.db.database import get_db
-from src.services.aggregator import OrderAggregator
+from src.services.aggregator import OrderAggregator, get_aggregator
+from src.services.orders import OrderService
+from src.services.response_cache import ResponseCache, cache_key, get_response_cache
 
 router = APIRouter()
 
@@ -17,6 +19,7 @@ class PlatformResponse(BaseModel):
     name: str
     type: str
     connected: bool
+    state: str
     orders_count: int
 
 
@@ -29,14 +32,24 @@ class PlatformStatsResponse(BaseModel):
 @router.get("/", response_model=PlatformStatsResponse)
 async def list_platforms(
     db: Session = Depends(get_db),
+    aggregator: OrderAggregator = Depends(get_aggregator),
+    cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     List all platforms and their connection status.
 
     Returns connection status, health check, and order counts for each platform.
+    Health is the live circuit breaker state of this process and counts come
+    from the local database, so no platform is called. Only the counts are
+    cached in Redis, until the stored orders change.
     """
-    aggregator = OrderAggregator()
-    stats = aggregator.get_platform_stats()
+    key = cache_key("platform_counts", {})
+    order_counts, generation = cache.get(key)
+    if order_counts is None:
+        order_counts = OrderService(db).count_by_platform()
+        cache.set(key, order_counts, generation)
+
+    stats = aggregator.get_platform_stats(order_counts)
 
     platforms = []
     total_orders = 0
@@ -53,6 +66,7 @@ async def list_platforms(
             name=platform_names.get(platform_type, platform_type.title()),
             type=platform_type,
             connected=platform_stats["connected"],
+            state=platform_stats["state"],
             orders_count=platform_stats["orders_count"]
         ))
         total_orders += platform_stats["orders_count"]
@@ -66,30 +80,41 @@ async def list_platforms(
 @router.get("/{platform}/health")
 async def check_platform_health(
     platform: str,
+    probe: bool = Query(False, description="Call the platform instead of reading cached health"),
     db: Session = Depends(get_db),
+    aggregator: OrderAggregator = Depends(get_aggregator),
 ):
     """
     Check if a specific platform connection is healthy.
 
+    Health is read from the platform's circuit breaker, which tracks the
+    outcome of real calls, unless **probe** is set.
+
     - **platform**: Platform name (shopify, amazon, ebay, etsy)
+    - **probe**: Make a live health check call
     """
-    aggregator = OrderAggregator()
-
-    client_map = {
-        "shopify": aggregator.shopify,
-        "amazon": aggregator.amazon,
-        "ebay": aggregator.ebay,
-        "etsy": aggregator.etsy,
-    }
-
-    client = client_map.get(platform)
+    client = aggregator.async_clients.get(platform)
     if not client:
         return {"platform": platform, "healthy": False, "error": "Unknown platform"}
 
-    healthy = client.health_check()
+    if probe:
+        await aggregator.check_health(platform)
+    health = aggregator.health(platform)
 
     return {
         "platform": platform,
-        "healthy": healthy,
+        "healthy": health["healthy"],
+        "state": health["state"],
+        "last_error": health["last_error"],
         "demo_mode": client.demo_mode
     }
+
+
+@router.get("/cache/stats")
+async def cache_stats(aggregator: OrderAggregator = Depends(get_aggregator)):
+    """
+    Hit and miss counters of this worker's per-platform read caches.
+
+    Use these to tune the ``ORDER_CACHE_*`` settings.
+    """
+    return aggregator.cache_stats()
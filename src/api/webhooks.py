@@ -0,0 +1,86 @@
+"""Platform webhook endpoints."""
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from src.config import get_settings
+from src.services.webhooks import (
+    WebhookConsumer,
+    WebhookEvent,
+    get_webhook_consumer,
+    verify_etsy_signature,
+    verify_shopify_signature,
+)
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+def _parse(body: bytes) -> dict:
+    """Decode a webhook's JSON body."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    return payload
+
+
+def _enqueue(consumer: WebhookConsumer, event: WebhookEvent) -> dict:
+    """Queue an event, or ask the platform to redeliver later."""
+    if not consumer.enqueue(event):
+        raise HTTPException(status_code=503, detail="Webhook queue full, retry later")
+    return {"status": "accepted"}
+
+
+@router.post("/shopify")
+async def shopify_webhook(
+    request: Request,
+    consumer: WebhookConsumer = Depends(get_webhook_consumer),
+):
+    """
+    Receive a Shopify order webhook.
+
+    The payload is verified against ``X-Shopify-Hmac-Sha256`` and queued;
+    it is stored shortly after, in a batch with other deliveries.
+    """
+    body = await request.body()
+    if not verify_shopify_signature(
+        body,
+        request.headers.get("X-Shopify-Hmac-Sha256"),
+        settings.shopify_webhook_secret,
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    topic = request.headers.get("X-Shopify-Topic", "")
+    if not topic.startswith("orders/"):
+        return {"status": "ignored"}
+
+    return _enqueue(consumer, WebhookEvent("shopify", topic, _parse(body)))
+
+
+@router.post("/etsy")
+async def etsy_webhook(
+    request: Request,
+    consumer: WebhookConsumer = Depends(get_webhook_consumer),
+):
+    """
+    Receive an Etsy order webhook.
+
+    The payload is verified against ``webhook-signature`` and queued; it is
+    stored shortly after, in a batch with other deliveries.
+    """
+    body = await request.body()
+    if not verify_etsy_signature(body, request.headers, settings.etsy_webhook_secret):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    payload = _parse(body)
+    topic = payload.get("event_type") or payload.get("type") or ""
+    # The receipt may be wrapped in an event envelope
+    if isinstance(payload.get("data"), dict):
+        payload = payload["data"]
+
+    return _enqueue(consumer, WebhookEvent("etsy", topic, payload))
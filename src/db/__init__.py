@@ -1,5 +1,14 @@
 """Database package."""
 
-from src.db.database import Base, SessionLocal, engine, get_db, init_db
+from src.db.database import Base, SessionLocal, engine, get_db, init_db, on_conflict_insert
+from src.db.redis_client import get_redis
 
-__all__ = ["Base", "SessionLocal", "engine", "get_db", "init_db"]
+__all__ = [
+    "Base",
+    "SessionLocal",
+    "engine",
+    "get_db",
+    "get_redis",
+    "init_db",
+    "on_conflict_insert",
+]
@@ -2,11 +2,13 @@
 
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Table, create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
 from src.config import get_settings
+from src.db.migrations import upgrade_schema
 
 settings = get_settings()
 
@@ -33,9 +35,26 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def on_conflict_insert(db: Session, table: Table):
+    """
+    Dialect-specific INSERT supporting ``ON CONFLICT``.
+
+    Args:
+        db: Session whose database the statement runs on
+        table: Table to insert into
+
+    Returns:
+        PostgreSQL or SQLite INSERT construct
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
 def init_db() -> None:
-    """Initialize database tables."""
+    """Initialize database tables, upgrading existing ones in place."""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     print("Database tables created successfully!")
 
 
@@ -0,0 +1,78 @@
+"""In-place upgrades for tables created before a schema change.
+
+``create_all`` only creates missing tables, so constraints and indexes added
+to an existing table are applied here. Every step checks the live schema
+first and is safe to run on each start.
+"""
+
+from sqlalchemy import DateTime, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+# Older copies of a platform order: another row with the same platform key
+# and a higher ID, i.e. written by a later sync
+_STALE_ORDER_IDS = """
+    SELECT id FROM orders AS stale
+    WHERE EXISTS (
+        SELECT 1 FROM orders AS newer
+        WHERE newer.platform = stale.platform
+          AND newer.platform_order_id = stale.platform_order_id
+          AND newer.id > stale.id
+    )
+"""
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Bring existing tables up to the current models.
+
+    Args:
+        engine: Engine of the database to upgrade
+    """
+    with engine.begin() as connection:
+        _upgrade_orders(connection)
+        _upgrade_inventory_outbox(connection)
+
+
+def _index_names(connection: Connection, table: str) -> set:
+    inspector = inspect(connection)
+    names = {index["name"] for index in inspector.get_indexes(table)}
+    names |= {constraint["name"] for constraint in inspector.get_unique_constraints(table)}
+    return names
+
+
+def _add_datetime_column(connection: Connection, table: str, column: str) -> None:
+    columns = {existing["name"] for existing in inspect(connection).get_columns(table)}
+    if column not in columns:
+        column_type = DateTime(timezone=True).compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
+
+
+def _upgrade_orders(connection: Connection) -> None:
+    """Add the platform change time, the platform order key and the keyset index to ``orders``."""
+    _add_datetime_column(connection, "orders", "platform_updated_at")
+
+    existing = _index_names(connection, "orders")
+
+    if "uq_orders_platform_order" not in existing:
+        # Earlier syncs could store an order more than once; keep the
+        # newest copy so the unique key can be built
+        connection.execute(text(f"DELETE FROM order_items WHERE order_id IN ({_STALE_ORDER_IDS})"))
+        removed = connection.execute(text(f"DELETE FROM orders WHERE id IN ({_STALE_ORDER_IDS})"))
+        if removed.rowcount:
+            print(f"Removed {removed.rowcount} duplicate orders")
+        # A unique index backs ON CONFLICT on both PostgreSQL and SQLite
+        connection.execute(text(
+            "CREATE UNIQUE INDEX uq_orders_platform_order ON orders (platform, platform_order_id)"
+        ))
+
+    if "ix_orders_keyset" not in existing:
+        connection.execute(text(
+            "CREATE INDEX ix_orders_keyset ON orders (order_date, platform, platform_order_id)"
+        ))
+
+
+def _upgrade_inventory_outbox(connection: Connection) -> None:
+    """Add the claim lease to ``inventory_outbox``."""
+    if not inspect(connection).has_table("inventory_outbox"):
+        return
+    _add_datetime_column(connection, "inventory_outbox", "claimed_until")
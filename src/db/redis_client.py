@@ -0,0 +1,23 @@
+"""Redis connection management."""
+
+from functools import lru_cache
+from typing import Optional
+
+import redis
+
+from src.config import get_settings
+
+settings = get_settings()
+
+
+@lru_cache()
+def get_redis() -> Optional[redis.Redis]:
+    """Get the shared Redis client, or None when Redis is not configured."""
+    if not settings.redis_url:
+        return None
+    return redis.Redis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=1.0,
+        socket_connect_timeout=1.0,
+    )
@@ -6,6 +6,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from src.api import api_router
 from src.config import get_settings
 from src.db.database import init_db
+from src.services.aggregator import get_aggregator
+from src.services.outbox import get_outbox_flusher
+from src.services.scheduler import get_scheduler
+from src.services.webhooks import get_webhook_consumer
 
 settings = get_settings()
 
@@ -32,11 +36,30 @@ app.include_router(api_router, prefix="/api")
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database, platform clients and background work on startup."""
     init_db()
+    get_aggregator()
+    get_webhook_consumer().start()
+    get_outbox_flusher().start()
+    if settings.sync_scheduler_enabled:
+        get_scheduler().start()
     print(f"OrderHub started in {'DEMO' if settings.demo_mode else 'PRODUCTION'} mode")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work and close platform clients on shutdown."""
+    if settings.sync_scheduler_enabled:
+        await get_scheduler().stop()
+        get_scheduler.cache_clear()
+    await get_webhook_consumer().stop()
+    get_webhook_consumer.cache_clear()
+    await get_outbox_flusher().stop()
+    get_outbox_flusher.cache_clear()
+    await get_aggregator().aclose()
+    get_aggregator.cache_clear()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
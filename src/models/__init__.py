@@ -2,7 +2,7 @@
 
 from src.models.order import Order, OrderItem, OrderStatus
 from src.models.platform import Platform, PlatformConnection, PlatformType
-from src.models.product import Product, InventoryLog
+from src.models.product import Product, InventoryLog, InventoryOutbox
 
 __all__ = [
     "Order",
@@ -13,4 +13,5 @@ __all__ = [
     "PlatformType",
     "Product",
     "InventoryLog",
+    "InventoryOutbox",
 ]
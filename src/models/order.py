@@ -10,10 +10,12 @@ from sqlalchemy import (
     DateTime,
     Enum as SQLEnum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -36,6 +38,12 @@ class Order(Base):
     """Unified order from any platform."""
 
     __tablename__ = "orders"
+    __table_args__ = (
+        # One row per platform order; the key sync upserts on
+        UniqueConstraint("platform", "platform_order_id", name="uq_orders_platform_order"),
+        # Matches the keyset order used to page through the order list
+        Index("ix_orders_keyset", "order_date", "platform", "platform_order_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -81,6 +89,8 @@ class Order(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     synced_at = Column(DateTime(timezone=True), nullable=True)
+    # Last change on the platform; older copies of the order are not stored
+    platform_updated_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
@@ -76,3 +76,27 @@ class InventoryLog(Base):
 
     # Timestamp
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class InventoryOutbox(Base):
+    """Latest quantity per SKU waiting to be pushed to the platforms."""
+
+    __tablename__ = "inventory_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # One row per SKU; a newer change overwrites the quantity
+    sku = Column(String(100), unique=True, nullable=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    # Bumped on every change so a push only clears the value it sent
+    version = Column(Integer, default=1, nullable=False)
+
+    # Delivery state
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
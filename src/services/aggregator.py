@@ -1,12 +1,99 @@
 """Order aggregation service."""
 
-from typing import List, Dict, Any, Optional
+import heapq
+import math
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
-from src.services.shopify import ShopifyClient
-from src.services.amazon import AmazonClient
-from src.services.ebay import EbayClient
-from src.services.etsy import EtsyClient
+from src.config import get_settings
+from src.services.base import AsyncPlatformClient, order_updated_at
+from src.services.breaker import CircuitBreaker, PlatformUnavailableError
+from src.services.bulkhead import Bulkhead
+from src.services.cache import TTLCache
+from src.services.filters import OrderFilter
+from src.services.http import close_http_clients
+from src.services.pagination import OrderPosition, encode_cursor
+from src.services.ratelimit import Priority, RateLimitError, get_limiter
+from src.services.retry import (
+    LatencyTracker,
+    acall_with_retry,
+    ahedged_call,
+    call_with_retry,
+    get_retry_policy,
+    hedged_call,
+)
+from src.services.singleflight import SingleFlight
+from src.services.shopify import AsyncShopifyClient, ShopifyClient
+from src.services.amazon import AmazonClient, AsyncAmazonClient
+from src.services.ebay import AsyncEbayClient, EbayClient
+from src.services.etsy import AsyncEtsyClient, EtsyClient
+
+settings = get_settings()
+
+PLATFORMS = ["shopify", "amazon", "ebay", "etsy"]
+
+
+def merge_newest_first(streams: Iterable[Iterable[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily merge per-platform order streams into one newest-first stream.
+
+    Each stream must already be ordered newest first, as the platform APIs
+    return them. The merge keeps one pending order per stream on a heap, so
+    it reads only as far into each stream as the consumer asks for and parses
+    each order date exactly once. Ties on date are broken by platform and ID,
+    the same order the keyset cursors use.
+
+    Args:
+        streams: Per-platform iterables of orders, newest first
+
+    Returns:
+        Iterator over all orders, newest first
+    """
+    return heapq.merge(*streams, key=OrderPosition.of, reverse=True)
+
+
+def _narrow(
+    orders: Iterable[Dict[str, Any]],
+    filters: OrderFilter,
+    after: Optional[OrderPosition],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily drop a platform's orders outside the filters or up to the cursor.
+
+    Platforms apply the filters at the source; this only settles what they
+    cannot express exactly, such as ties on the cursor date.
+    """
+    for order in orders:
+        if not filters.matches(order):
+            continue
+        if after is not None and not OrderPosition.of(order) < after:
+            continue
+        yield order
+
+
+@dataclass
+class OrderFetchResult:
+    """Outcome of a concurrent fetch across platforms."""
+
+    orders: List[Dict[str, Any]] = field(default_factory=list)
+    late_platforms: List[str] = field(default_factory=list)
+    failed_platforms: List[str] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class OrderChangesResult:
+    """Outcome of a concurrent fetch of changed orders across platforms."""
+
+    orders: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    late_platforms: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
 
 
 class OrderAggregator:
@@ -18,97 +105,599 @@ class OrderAggregator:
         self.amazon = AmazonClient()
         self.ebay = EbayClient()
         self.etsy = EtsyClient()
+        self.clients = {
+            "shopify": self.shopify,
+            "amazon": self.amazon,
+            "ebay": self.ebay,
+            "etsy": self.etsy,
+        }
+        self.async_clients: Dict[str, AsyncPlatformClient] = {
+            "shopify": AsyncShopifyClient(self.shopify),
+            "amazon": AsyncAmazonClient(self.amazon),
+            "ebay": AsyncEbayClient(self.ebay),
+            "etsy": AsyncEtsyClient(self.etsy),
+        }
 
-    def get_all_orders(
+        # Each platform gets its own bounded pool and queue, so a hung
+        # platform ties up only its own slots and then fails fast
+        self.bulkheads: Dict[str, Bulkhead] = {}
+        for platform in PLATFORMS:
+            limits = settings.bulkhead_platform_limits.get(platform, {})
+            self.bulkheads[platform] = Bulkhead(
+                platform,
+                max_concurrent=limits.get("max_concurrent", settings.bulkhead_max_concurrent),
+                queue_depth=limits.get("queue_depth", settings.bulkhead_queue_depth),
+            )
+        self.latencies: Dict[Tuple[str, str], LatencyTracker] = {}
+
+        # Repeated reads of the same page within the TTL skip the platform
+        self.caches = {
+            platform: TTLCache(
+                max_size=settings.order_cache_max_entries,
+                ttl_seconds=settings.order_cache_platform_ttl_seconds.get(
+                    platform, settings.order_cache_ttl_seconds
+                ),
+                stale_seconds=settings.order_cache_stale_seconds,
+                executor=self.bulkheads[platform],
+            )
+            for platform in PLATFORMS
+        }
+        # Concurrent misses for the same platform query share one fetch
+        self.flights = SingleFlight()
+        # Fed by every platform call; also the platforms' cached health
+        self.breakers = {
+            platform: CircuitBreaker(
+                platform,
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_seconds=settings.circuit_reset_seconds,
+            )
+            for platform in PLATFORMS
+        }
+
+    def fetch_orders(
         self,
         limit_per_platform: int = 50,
-        platforms: Optional[List[str]] = None
-    ) -> List[Dict[str, Any]]:
+        platforms: Optional[List[str]] = None,
+        platform_timeouts: Optional[Dict[str, float]] = None,
+        timeout: Optional[float] = None,
+        limit: Optional[int] = None,
+        after: Optional[OrderPosition] = None,
+        filters: Optional[OrderFilter] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> OrderFetchResult:
         """
-        Fetch and aggregate orders from all platforms.
+        Fetch orders from all platforms concurrently.
+
+        Every platform is queried at the same time, so latency is bounded by
+        the slowest platform rather than the sum of all of them. A platform
+        that misses its deadline is dropped from the merge and reported in
+        ``late_platforms`` instead of blocking the whole request.
 
         Args:
             limit_per_platform: Max orders to fetch per platform
             platforms: List of platforms to fetch from (None = all)
+            platform_timeouts: Per-platform deadline overrides in seconds
+            timeout: Global deadline in seconds for the whole fan-out
+            limit: Max orders to return across all platforms (None = all)
+            after: Resume after this position of the merged list (exclusive)
+            filters: Status and date filters, pushed down to every platform
+            priority: Queue priority for platform rate limits
 
         Returns:
-            Aggregated list of orders sorted by date (newest first)
+            Fetch result with orders sorted by date (newest first)
         """
-        all_orders = []
+        if limit is not None:
+            # No platform can contribute more than the overall limit
+            limit_per_platform = min(limit_per_platform, limit)
 
-        # Determine which platforms to query
-        active_platforms = platforms or ["shopify", "amazon", "ebay", "etsy"]
+        active_platforms = [p for p in PLATFORMS if p in (platforms or PLATFORMS)]
+        platform_timeouts = platform_timeouts or {}
+        if timeout is None:
+            timeout = settings.aggregate_timeout_seconds
 
-        # Fetch from each platform
-        if "shopify" in active_platforms:
-            try:
-                shopify_orders = self.shopify.get_orders(limit=limit_per_platform)
-                all_orders.extend(shopify_orders)
-            except Exception as e:
-                print(f"Error fetching Shopify orders: {e}")
+        started = time.monotonic()
+        global_deadline = started + timeout
 
-        if "amazon" in active_platforms:
-            try:
-                amazon_orders = self.amazon.get_orders(limit=limit_per_platform)
-                all_orders.extend(amazon_orders)
-            except Exception as e:
-                print(f"Error fetching Amazon orders: {e}")
+        filters = filters or OrderFilter()
+        query = filters.to_query()
 
-        if "ebay" in active_platforms:
+        # Each platform resumes at the cursor's date. The bound is inclusive,
+        # so ask for one extra order to cover the cursor's own order, which
+        # _narrow then drops along with any other ties on that date.
+        if after:
+            query["created_before"] = min(
+                after.order_date, query.get("created_before", after.order_date)
+            )
+            limit_per_platform += 1
+
+        result = OrderFetchResult()
+        futures = {}
+        for platform in active_platforms:
             try:
-                ebay_orders = self.ebay.get_orders(limit=limit_per_platform)
-                all_orders.extend(ebay_orders)
-            except Exception as e:
-                print(f"Error fetching eBay orders: {e}")
+                futures[platform] = self.bulkheads[platform].submit(
+                    self._get_orders, platform, limit_per_platform, query, priority
+                )
+            except PlatformUnavailableError as e:
+                print(f"Error fetching {platform} orders: {e}")
+                result.failed_platforms.append(platform)
 
-        if "etsy" in active_platforms:
+        streams = []
+        for platform, future in futures.items():
+            platform_timeout = platform_timeouts.get(platform, settings.platform_timeout_seconds)
+            deadline = min(started + platform_timeout, global_deadline)
             try:
-                etsy_orders = self.etsy.get_orders(limit=limit_per_platform)
-                all_orders.extend(etsy_orders)
+                orders = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                future.cancel()
+                print(f"{platform} missed its deadline, dropping its orders")
+                self.breakers[platform].record_failure("missed deadline")
+                result.late_platforms.append(platform)
             except Exception as e:
-                print(f"Error fetching Etsy orders: {e}")
+                print(f"Error fetching {platform} orders: {e}")
+                result.failed_platforms.append(platform)
+            else:
+                streams.append(_narrow(orders, filters, after))
 
-        # Sort by order date (newest first)
-        all_orders.sort(
-            key=lambda x: datetime.fromisoformat(x["order_date"]),
-            reverse=True
+        result.orders = list(islice(merge_newest_first(streams), limit))
+        if limit is not None and len(result.orders) == limit:
+            result.next_cursor = encode_cursor(OrderPosition.of(result.orders[-1]))
+
+        return result
+
+    def _get_orders(
+        self,
+        platform: str,
+        limit: int,
+        query: Dict[str, Any],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> List[Dict[str, Any]]:
+        """Fetch a page of a platform's orders through its cache."""
+        key = ("orders", limit, tuple(sorted(query.items())))
+        return self.caches[platform].get_or_load(
+            key,
+            lambda: self.flights.do(
+                (platform, key),
+                lambda: self._call(
+                    platform,
+                    "get_orders",
+                    lambda: self.clients[platform].get_orders(limit=limit, **query),
+                    priority,
+                ),
+            ),
         )
 
-        return all_orders
-
-    def get_platform_stats(self) -> Dict[str, Any]:
-        """Get statistics for each platform."""
-        stats = {
-            "shopify": {
-                "connected": self.shopify.health_check(),
-                "orders_count": 0,
-            },
-            "amazon": {
-                "connected": self.amazon.health_check(),
-                "orders_count": 0,
-            },
-            "ebay": {
-                "connected": self.ebay.health_check(),
-                "orders_count": 0,
-            },
-            "etsy": {
-                "connected": self.etsy.health_check(),
-                "orders_count": 0,
-            },
-        }
+    def _call(
+        self,
+        platform: str,
+        operation: str,
+        fn: Callable[[], Any],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Any:
+        """
+        Make a platform call under the operation's retry policy.
+
+        Retryable failures are retried with backoff. A user-facing read that
+        has not answered by the operation's p95 latency gets one duplicate.
+        """
+        policy = get_retry_policy(platform, operation)
+        hedge_after = self._hedge_after(platform, operation, policy.hedge, priority)
+
+        def attempt() -> Any:
+            if hedge_after is None:
+                return self._attempt(platform, operation, fn, priority)
+            return hedged_call(
+                self.bulkheads[platform].hedge_executor,
+                lambda: self._attempt(platform, operation, fn, priority),
+                hedge_after,
+            )
+
+        return call_with_retry(policy, attempt, f"{platform} {operation}")
+
+    async def _acall(
+        self,
+        platform: str,
+        operation: str,
+        fn: Callable[[], Awaitable[Any]],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Any:
+        """Make an async platform call under the operation's retry policy."""
+        policy = get_retry_policy(platform, operation)
+        hedge_after = self._hedge_after(platform, operation, policy.hedge, priority)
+
+        async def attempt() -> Any:
+            if hedge_after is None:
+                return await self._aattempt(platform, operation, fn, priority)
+            return await ahedged_call(
+                lambda: self._aattempt(platform, operation, fn, priority),
+                hedge_after,
+            )
+
+        return await acall_with_retry(policy, attempt, f"{platform} {operation}")
+
+    def _hedge_after(
+        self,
+        platform: str,
+        operation: str,
+        hedge: bool,
+        priority: Priority,
+    ) -> Optional[float]:
+        """Seconds before hedging a call, or None to not hedge it."""
+        if not (hedge and settings.hedge_reads and priority == Priority.INTERACTIVE):
+            return None
+        tracker = self.latencies.get((platform, operation))
+        return tracker.percentile(settings.hedge_percentile) if tracker else None
 
-        # Count orders per platform
+    def _record_latency(self, platform: str, operation: str, seconds: float) -> None:
+        tracker = self.latencies.get((platform, operation))
+        if tracker is None:
+            tracker = self.latencies.setdefault((platform, operation), LatencyTracker())
+        tracker.record(seconds)
+
+    def _attempt(
+        self,
+        platform: str,
+        operation: str,
+        fn: Callable[[], Any],
+        priority: Priority,
+    ) -> Any:
+        """
+        Make one platform call through the platform's circuit breaker and
+        shared rate limit.
+        """
+        breaker = self.breakers[platform]
+        breaker.before_call()
+        started = time.monotonic()
         try:
-            all_orders = self.get_all_orders()
-            for order in all_orders:
-                platform = order.get("platform")
-                if platform in stats:
-                    stats[platform]["orders_count"] += 1
+            if self.clients[platform].demo_mode or not settings.rate_limit_enabled:
+                result = fn()
+            else:
+                with get_limiter(platform, operation).slot(priority):
+                    result = fn()
+        except RateLimitError:
+            # Throttled, but the platform is up
+            breaker.record_success()
+            raise
         except Exception as e:
-            print(f"Error getting platform stats: {e}")
+            breaker.record_failure(f"{operation}: {e}")
+            raise
+        breaker.record_success()
+        self._record_latency(platform, operation, time.monotonic() - started)
+        return result
+
+    async def _aattempt(
+        self,
+        platform: str,
+        operation: str,
+        fn: Callable[[], Awaitable[Any]],
+        priority: Priority,
+    ) -> Any:
+        """
+        Make one async platform call through the platform's circuit breaker
+        and shared rate limit.
+        """
+        breaker = self.breakers[platform]
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            if self.clients[platform].demo_mode or not settings.rate_limit_enabled:
+                result = await fn()
+            else:
+                async with get_limiter(platform, operation).aslot(priority):
+                    result = await fn()
+        except RateLimitError:
+            breaker.record_success()
+            raise
+        except Exception as e:
+            breaker.record_failure(f"{operation}: {e}")
+            raise
+        except BaseException:
+            # Cancelled, e.g. the losing half of a hedged read
+            breaker.record_cancelled()
+            raise
+        breaker.record_success()
+        self._record_latency(platform, operation, time.monotonic() - started)
+        return result
+
+    async def fetch_order(
+        self,
+        platform: str,
+        order_id: str,
+        fresh: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a single order from a platform through its cache.
+
+        Args:
+            platform: Platform name (shopify, amazon, ebay, etsy)
+            order_id: Platform-specific order ID
+            fresh: Skip the cached copy, e.g. after the order is known to change
+
+        Returns:
+            Order or None if not found
+        """
+        client = self.async_clients.get(platform)
+        if not client:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        async def load() -> Optional[Dict[str, Any]]:
+            async with self.bulkheads[platform].aslot():
+                return await self._acall(platform, "get_order", lambda: client.get_order(order_id))
+
+        key = ("order", order_id)
+        if fresh:
+            order = await self.flights.ado((platform, key), load)
+            self.caches[platform].set(key, order)
+            return order
+        return await self.caches[platform].aget_or_load(
+            key, lambda: self.flights.ado((platform, key), load)
+        )
+
+    async def update_order_status(
+        self,
+        platform: str,
+        order_id: str,
+        status: str,
+        tracking_number: Optional[str] = None,
+    ) -> bool:
+        """
+        Update order status on a platform without blocking the event loop.
+
+        Args:
+            platform: Platform name (shopify, amazon, ebay, etsy)
+            order_id: Platform-specific order ID
+            status: New order status
+            tracking_number: Optional tracking number for shipments
+
+        Returns:
+            True if update successful
+        """
+        client = self.async_clients.get(platform)
+        if not client:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        async with self.bulkheads[platform].aslot():
+            updated = await self._acall(
+                platform,
+                "update_order_status",
+                lambda: client.update_order_status(
+                    order_id, status, tracking_number=tracking_number
+                ),
+            )
+        self.invalidate(platform)
+        return updated
+
+    async def check_health(self, platform: str) -> bool:
+        """
+        Probe a platform connection, updating its cached health.
+
+        A platform whose circuit is open is reported unhealthy without
+        being called.
+
+        Args:
+            platform: Platform name (shopify, amazon, ebay, etsy)
+
+        Returns:
+            True if the platform answered
+        """
+        client = self.async_clients.get(platform)
+        if not client:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        async def probe() -> bool:
+            if not await client.health_check():
+                raise PlatformUnavailableError(f"{platform} health check failed")
+            return True
+
+        try:
+            async with self.bulkheads[platform].aslot():
+                return await self._acall(platform, "health_check", probe)
+        except PlatformUnavailableError:
+            return False
+
+    def health(self, platform: str) -> Dict[str, Any]:
+        """
+        Cached health of a platform, from the outcome of recent calls.
+
+        Args:
+            platform: Platform name (shopify, amazon, ebay, etsy)
+
+        Returns:
+            Circuit state, failure count and last error
+        """
+        breaker = self.breakers.get(platform)
+        if not breaker:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        return breaker.snapshot()
 
+    def invalidate(self, platform: str) -> None:
+        """Drop a platform's cached reads after changing its data."""
+        self.caches[platform].clear()
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit and miss counters of each platform's read cache."""
+        stats: Dict[str, Dict[str, Any]] = {
+            platform: cache.stats() for platform, cache in self.caches.items()
+        }
+        stats["single_flight"] = self.flights.stats()
+        stats["bulkheads"] = {
+            platform: bulkhead.stats() for platform, bulkhead in self.bulkheads.items()
+        }
         return stats
 
+    def fetch_platform_orders(
+        self,
+        platform: str,
+        limit: int = 50,
+        updated_after: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch orders from a single platform.
+
+        This is the sync path, so it always reads from the platform and never
+        from the cache.
+
+        Args:
+            platform: Platform name (shopify, amazon, ebay, etsy)
+            limit: Max orders to fetch
+            updated_after: Only fetch orders changed after this time
+
+        Returns:
+            Platform orders, newest first; oldest change first when
+            ``updated_after`` is given
+        """
+        if platform not in self.clients:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        return self.bulkheads[platform].call(
+            lambda: self._get_changed_orders(platform, limit, updated_after)
+        )
+
+    def fetch_changed_orders(
+        self,
+        since: Dict[str, Optional[datetime]],
+        limit: int = 50,
+        platform_timeouts: Optional[Dict[str, float]] = None,
+        timeout: Optional[float] = None,
+    ) -> OrderChangesResult:
+        """
+        Fetch changed orders from several platforms concurrently.
+
+        Each platform runs on its own bulkhead under the same deadlines as
+        :meth:`fetch_orders`. A platform that misses its deadline is reported
+        in ``late_platforms`` and its orders are dropped, so the caller never
+        stores a page it has stopped waiting for.
+
+        Args:
+            since: Watermark per platform to fetch from (None = everything)
+            limit: Max orders to fetch per platform
+            platform_timeouts: Per-platform deadline overrides in seconds
+            timeout: Global deadline in seconds for the whole fan-out
+
+        Returns:
+            Orders per platform, oldest change first, plus late and failed
+            platforms
+        """
+        platform_timeouts = platform_timeouts or {}
+        if timeout is None:
+            timeout = settings.aggregate_timeout_seconds
+
+        started = time.monotonic()
+        global_deadline = started + timeout
+
+        result = OrderChangesResult()
+        futures = {}
+        for platform in PLATFORMS:
+            if platform not in since:
+                continue
+            try:
+                futures[platform] = self.bulkheads[platform].submit(
+                    self._get_changed_orders, platform, limit, since[platform]
+                )
+            except PlatformUnavailableError as e:
+                print(f"Error fetching {platform} orders: {e}")
+                result.errors[platform] = str(e)
+
+        for platform, future in futures.items():
+            platform_timeout = platform_timeouts.get(platform, settings.platform_timeout_seconds)
+            deadline = min(started + platform_timeout, global_deadline)
+            try:
+                result.orders[platform] = future.result(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except FuturesTimeoutError:
+                future.cancel()
+                print(f"{platform} missed its deadline, dropping its orders")
+                self.breakers[platform].record_failure("missed deadline")
+                result.late_platforms.append(platform)
+            except Exception as e:
+                print(f"Error fetching {platform} orders: {e}")
+                result.errors[platform] = str(e)
+
+        return result
+
+    def _get_changed_orders(
+        self,
+        platform: str,
+        limit: int,
+        updated_after: Optional[datetime],
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a page of a platform's changed orders, bypassing the cache.
+
+        Platforms resume from a timestamp, inclusively. A capped page whose
+        orders all changed at the same moment would come back unchanged from
+        that moment, so it is widened until it reaches a later change.
+        """
+        client = self.clients[platform]
+        while True:
+            orders = self._call(
+                platform,
+                "get_orders",
+                lambda: client.get_orders(limit=limit, updated_after=updated_after),
+                Priority.BACKGROUND,
+            )
+            if (
+                updated_after is None
+                or len(orders) < limit
+                or order_updated_at(orders[0]) != order_updated_at(orders[-1])
+            ):
+                return orders
+            limit *= 2
+
+    def get_all_orders(
+        self,
+        limit_per_platform: int = 50,
+        platforms: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and aggregate orders from all platforms.
+
+        Args:
+            limit_per_platform: Max orders to fetch per platform
+            platforms: List of platforms to fetch from (None = all)
+
+        Returns:
+            Aggregated list of orders sorted by date (newest first)
+        """
+        return self.fetch_orders(
+            limit_per_platform=limit_per_platform,
+            platforms=platforms
+        ).orders
+
+    def close(self) -> None:
+        """Release the fan-out worker threads."""
+        for bulkhead in self.bulkheads.values():
+            bulkhead.shutdown()
+
+    async def aclose(self) -> None:
+        """Release worker threads and pooled HTTP connections."""
+        self.close()
+        await close_http_clients()
+
+    def get_platform_stats(
+        self,
+        order_counts: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get statistics for each platform without calling any platform.
+
+        Args:
+            order_counts: Stored orders per platform
+
+        Returns:
+            Cached health and order count per platform
+        """
+        order_counts = order_counts or {}
+        return {
+            platform: {
+                "connected": breaker.healthy,
+                "state": breaker.state.value,
+                "orders_count": order_counts.get(platform, 0),
+            }
+            for platform, breaker in self.breakers.items()
+        }
+
     def sync_order_status(
         self,
         platform: str,
@@ -128,18 +717,17 @@ class OrderAggregator:
         Returns:
             True if update successful
         """
-        client_map = {
-            "shopify": self.shopify,
-            "amazon": self.amazon,
-            "ebay": self.ebay,
-            "etsy": self.etsy,
-        }
-
-        client = client_map.get(platform)
+        client = self.clients.get(platform)
         if not client:
             raise ValueError(f"Unknown platform: {platform}")
 
-        return client.update_order_status(order_id, status, tracking_number)
+        return self.bulkheads[platform].call(
+            lambda: self._call(
+                platform,
+                "update_order_status",
+                lambda: client.update_order_status(order_id, status, tracking_number),
+            )
+        )
 
     def sync_inventory_across_platforms(self, sku: str, quantity: int) -> Dict[str, bool]:
         """
@@ -152,20 +740,134 @@ class OrderAggregator:
         Returns:
             Dict of platform: success status
         """
-        results = {}
+        return self.sync_inventory_bulk({sku: quantity}, priority=Priority.INTERACTIVE)[sku]
 
-        clients = {
-            "shopify": self.shopify,
-            "amazon": self.amazon,
-            "ebay": self.ebay,
-            "etsy": self.etsy,
+    def sync_inventory_bulk(
+        self,
+        quantities: Dict[str, int],
+        platforms: Optional[List[str]] = None,
+        priority: Priority = Priority.BACKGROUND,
+        platform_timeouts: Optional[Dict[str, float]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict[str, bool]]:
+        """
+        Sync many inventory quantities across platforms.
+
+        Platforms are pushed to in parallel, each on its own bulkhead. Within
+        a platform SKUs go out in chunks through its batch inventory endpoint
+        (Shopify ``inventorySetQuantities``, Amazon listings feeds, eBay
+        ``bulkUpdatePriceQuantity``); platforms without one, and chunks of a
+        single SKU, use the per-SKU call. A failed chunk fails only its SKUs.
+
+        The deadlines apply per chunk, so a large push gets proportionally
+        longer. A platform that misses its deadline stops after the chunk in
+        flight; chunks it finished keep their outcome and only the rest fail.
+
+        Args:
+            quantities: New quantity per SKU
+            platforms: List of platforms to sync to (None = all)
+            priority: Queue priority for platform rate limits
+            platform_timeouts: Per-chunk deadline overrides in seconds
+            timeout: Per-chunk global deadline in seconds for the whole fan-out
+
+        Returns:
+            Dict of SKU: {platform: success status}
+        """
+        active_platforms = [p for p in PLATFORMS if p in (platforms or PLATFORMS)]
+        platform_timeouts = platform_timeouts or {}
+        if timeout is None:
+            timeout = settings.aggregate_timeout_seconds
+
+        chunks = {
+            platform: math.ceil(len(quantities) / self.clients[platform].inventory_batch_size)
+            for platform in active_platforms
         }
+        started = time.monotonic()
+        global_deadline = started + timeout * max(chunks.values(), default=0)
 
-        for platform, client in clients.items():
+        futures = {}
+        synced: Dict[str, Dict[str, bool]] = {}
+        stops: Dict[str, threading.Event] = {}
+        for platform in active_platforms:
+            synced[platform] = {}
+            stops[platform] = threading.Event()
             try:
-                results[platform] = client.sync_inventory(sku, quantity)
-            except Exception as e:
+                futures[platform] = self.bulkheads[platform].submit(
+                    self._sync_platform_inventory,
+                    platform,
+                    quantities,
+                    priority,
+                    synced[platform],
+                    stops[platform],
+                )
+            except PlatformUnavailableError as e:
                 print(f"Error syncing inventory to {platform}: {e}")
-                results[platform] = False
+
+        results: Dict[str, Dict[str, bool]] = {sku: {} for sku in quantities}
+        for platform in active_platforms:
+            if platform in futures:
+                platform_timeout = platform_timeouts.get(
+                    platform, settings.platform_timeout_seconds
+                )
+                deadline = min(started + platform_timeout * chunks[platform], global_deadline)
+                try:
+                    futures[platform].result(timeout=max(0.0, deadline - time.monotonic()))
+                except FuturesTimeoutError:
+                    stops[platform].set()
+                    futures[platform].cancel()
+                    print(f"{platform} missed its inventory sync deadline")
+                    self.breakers[platform].record_failure("missed deadline")
+            # Chunks still in flight report after this copy and count as failed
+            done = dict(synced[platform])
+            for sku in quantities:
+                results[sku][platform] = done.get(sku, False)
 
         return results
+
+    def _sync_platform_inventory(
+        self,
+        platform: str,
+        quantities: Dict[str, int],
+        priority: Priority,
+        synced: Dict[str, bool],
+        stop: threading.Event,
+    ) -> None:
+        """
+        Push quantities to one platform in chunks of its batch size.
+
+        Each chunk's outcome goes into ``synced`` as soon as it finishes, and
+        no further chunk starts once ``stop`` is set.
+        """
+        client = self.clients[platform]
+        items = list(quantities.items())
+
+        for start in range(0, len(items), client.inventory_batch_size):
+            if stop.is_set():
+                return
+            chunk = dict(items[start:start + client.inventory_batch_size])
+            try:
+                if len(chunk) == 1:
+                    [(sku, quantity)] = chunk.items()
+                    outcome = {sku: self._call(
+                        platform,
+                        "sync_inventory",
+                        lambda: client.sync_inventory(sku, quantity),
+                        priority,
+                    )}
+                else:
+                    outcome = self._call(
+                        platform,
+                        "sync_inventory_bulk",
+                        lambda: client.sync_inventory_bulk(chunk),
+                        priority,
+                    )
+            except Exception as e:
+                print(f"Error syncing {len(chunk)} SKUs to {platform}: {e}")
+                outcome = dict.fromkeys(chunk, False)
+            synced.update(outcome)
+
+
+@lru_cache()
+def get_aggregator() -> OrderAggregator:
+    """Get the process-wide aggregator instance."""
+    return OrderAggregator()
@@ -6,13 +6,26 @@ from typing import List, Dict, Any, Optional
 
 from src.config import get_settings
 from src.models.order import OrderStatus
+from src.services.base import AsyncClientBase, filter_demo_orders
 
 settings = get_settings()
 
+# SP-API OrderStatuses for each unified order status
+STATUS_FILTERS = {
+    "pending": ["Pending"],
+    "processing": ["Unshipped", "PartiallyShipped"],
+    "shipped": ["Shipped"],
+    "delivered": ["Shipped"],
+    "cancelled": ["Canceled"],
+}
+
 
 class AmazonClient:
     """Client for Amazon SP-API."""
 
+    # One JSON_LISTINGS_FEED document carries many SKUs
+    inventory_batch_size = 2000
+
     def __init__(
         self,
         refresh_token: str = "",
@@ -30,10 +43,24 @@ class AmazonClient:
             self.refresh_token, self.client_id, self.client_secret
         ])
 
-    def get_orders(self, limit: int = 50, created_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
-        """Fetch orders from Amazon."""
+    def get_orders(
+        self,
+        limit: int = 50,
+        *,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch orders from Amazon, filtered at the source."""
         if self.demo_mode:
-            return self._get_demo_orders(limit)
+            return filter_demo_orders(
+                self._get_demo_orders(limit),
+                status=status,
+                created_after=created_after,
+                created_before=created_before,
+                updated_after=updated_after,
+            )
 
         # Real implementation would use Amazon SP-API
         # from sp_api.api import Orders
@@ -43,8 +70,14 @@ class AmazonClient:
         #     refresh_token=self.refresh_token,
         #     marketplace=Marketplaces[self.region.upper().replace('-', '_')]
         # )
-        # response = orders_api.get_orders(CreatedAfter=created_after, MaxResultsPerPage=limit)
-        # return [self._format_order(order) for order in response.payload.get('Orders', [])]
+        # response = orders_api.get_orders(
+        #     CreatedAfter=created_after,
+        #     CreatedBefore=created_before,
+        #     LastUpdatedAfter=updated_after,
+        #     OrderStatuses=STATUS_FILTERS.get(status),
+        #     MaxResultsPerPage=limit,
+        # )
+        # return [self.format_order(order) for order in response.payload.get('Orders', [])]
 
         return []
 
@@ -75,6 +108,14 @@ class AmazonClient:
         # Real implementation would use FBAInventory API
         return False
 
+    def sync_inventory_bulk(self, quantities: Dict[str, int]) -> Dict[str, bool]:
+        """Sync many inventory quantities to Amazon in one listings feed."""
+        if self.demo_mode:
+            return {sku: True for sku in quantities}
+
+        # Real implementation would submit a JSON_LISTINGS_FEED through the Feeds API
+        return {sku: False for sku in quantities}
+
     def _get_demo_orders(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Generate demo orders for testing."""
         demo_orders = []
@@ -94,13 +135,16 @@ class AmazonClient:
             status = random.choice(statuses)
 
             order_date = datetime.now() - timedelta(days=random.randint(0, 30))
+            # Orders keep changing after they are placed, e.g. when they ship
+            updated_at = min(datetime.now(), order_date + timedelta(hours=random.randint(0, 72)))
 
             order = {
-                "id": f"AMZ{2000 + i}-{random.randint(1000000, 9999999)}",
+                "id": f"AMZ{2000 + i}",
                 "order_number": f"AMZ-{2000 + i}",
                 "platform": "amazon",
                 "status": status.value,
                 "order_date": order_date.isoformat(),
+                "updated_at": updated_at.isoformat(),
                 "customer": {
                     "name": f"Amazon Customer {i + 1}",
                     "email": None,  # Amazon doesn't provide customer emails
@@ -133,6 +177,9 @@ class AmazonClient:
 
             demo_orders.append(order)
 
+        # Platform APIs return orders newest first
+        demo_orders.sort(key=lambda o: o["order_date"], reverse=True)
+
         return demo_orders
 
     def health_check(self) -> bool:
@@ -141,3 +188,25 @@ class AmazonClient:
             return True
 
         return bool(self.refresh_token and self.client_id and self.client_secret)
+
+
+AMAZON_ENDPOINTS = {
+    "us-east-1": "https://sellingpartnerapi-na.amazon.com",
+    "eu-west-1": "https://sellingpartnerapi-eu.amazon.com",
+    "us-west-2": "https://sellingpartnerapi-fe.amazon.com",
+}
+
+
+class AsyncAmazonClient(AsyncClientBase):
+    """Async client for Amazon Selling Partner API."""
+
+    platform = "amazon"
+
+    def base_url(self) -> str:
+        """SP-API endpoint for the configured region."""
+        return AMAZON_ENDPOINTS.get(self.client.region, AMAZON_ENDPOINTS["us-east-1"])
+
+    async def _fetch_orders(self, limit: int) -> List[Dict[str, Any]]:
+        # Real implementation would exchange the refresh token for an LWA
+        # access token and call GET /orders/v0/orders with x-amz-access-token
+        return []
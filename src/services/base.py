@@ -0,0 +1,185 @@
+"""Async platform client interface."""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+
+import httpx
+
+from src.services.http import get_http_client
+from src.services.ratelimit import RateLimitError, get_limiter, rate_limit_pressure
+
+
+def platform_timestamp(value: Any) -> str:
+    """
+    Normalize a platform timestamp to the naive UTC ISO format orders use.
+
+    Args:
+        value: ISO 8601 string (with or without offset) or Unix epoch seconds
+
+    Returns:
+        Naive UTC ISO timestamp
+    """
+    if isinstance(value, (int, float)):
+        parsed = datetime.fromtimestamp(value, tz=timezone.utc)
+    else:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def order_updated_at(order: Dict[str, Any]) -> datetime:
+    """When a unified order last changed on its platform."""
+    return datetime.fromisoformat(order.get("updated_at") or order["order_date"])
+
+
+def filter_demo_orders(
+    orders: List[Dict[str, Any]],
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Apply platform-side query filters to newest-first demo orders.
+
+    Like the platform APIs when asked for changes since a point in time, an
+    ``updated_after`` result holds orders changed at or after it, ordered
+    oldest change first so a capped page is a contiguous prefix the caller
+    can resume from.
+    """
+    if status is not None:
+        orders = [o for o in orders if o["status"] == status]
+    if created_after is not None:
+        orders = [o for o in orders if datetime.fromisoformat(o["order_date"]) >= created_after]
+    if created_before is not None:
+        orders = [o for o in orders if datetime.fromisoformat(o["order_date"]) <= created_before]
+    if updated_after is not None:
+        orders = sorted(
+            (o for o in orders if order_updated_at(o) >= updated_after),
+            key=order_updated_at,
+        )
+    return orders
+
+
+@runtime_checkable
+class AsyncPlatformClient(Protocol):
+    """Operations every async platform client supports."""
+
+    platform: str
+    demo_mode: bool
+
+    async def get_orders(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Fetch recent orders."""
+        ...
+
+    async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single order by ID."""
+        ...
+
+    async def update_order_status(
+        self, order_id: str, status: str, tracking_number: Optional[str] = None
+    ) -> bool:
+        """Update order fulfillment status."""
+        ...
+
+    async def sync_inventory(self, sku: str, quantity: int) -> bool:
+        """Sync inventory quantity to the platform."""
+        ...
+
+    async def health_check(self) -> bool:
+        """Check if the platform connection is healthy."""
+        ...
+
+
+class AsyncClientBase:
+    """
+    Base for async platform clients.
+
+    Wraps the synchronous client for credentials and demo data. Live calls go
+    through the platform's shared, pooled ``httpx.AsyncClient``.
+    """
+
+    platform = ""
+
+    def __init__(self, client: Any):
+        """Initialize async client around a synchronous platform client."""
+        self.client = client
+
+    @property
+    def demo_mode(self) -> bool:
+        """Whether the wrapped client serves demo data."""
+        return self.client.demo_mode
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled HTTP client for this platform."""
+        return get_http_client(self.platform, self.base_url(), self.headers())
+
+    def base_url(self) -> str:
+        """API base URL."""
+        raise NotImplementedError
+
+    def headers(self) -> Dict[str, str]:
+        """Default request headers, including authentication."""
+        return {}
+
+    async def get_orders(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Fetch recent orders."""
+        if self.demo_mode:
+            return self.client.get_orders(limit=limit)
+        return await self._fetch_orders(limit)
+
+    async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single order by ID."""
+        if self.demo_mode:
+            return self.client.get_order(order_id)
+        return await self._fetch_order(order_id)
+
+    async def update_order_status(
+        self, order_id: str, status: str, tracking_number: Optional[str] = None
+    ) -> bool:
+        """Update order fulfillment status."""
+        if self.demo_mode:
+            return self.client.update_order_status(order_id, status, tracking_number)
+        return await self._update_order_status(order_id, status, tracking_number)
+
+    async def sync_inventory(self, sku: str, quantity: int) -> bool:
+        """Sync inventory quantity to the platform."""
+        if self.demo_mode:
+            return self.client.sync_inventory(sku, quantity)
+        return await self._sync_inventory(sku, quantity)
+
+    async def health_check(self) -> bool:
+        """Check if the platform connection is healthy."""
+        if self.demo_mode:
+            return self.client.health_check()
+        return await self._health_check()
+
+    def _check_response(self, response: httpx.Response, operation: str) -> None:
+        """Raise on throttling and slow the platform's limiter when it is near its limit."""
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise RateLimitError(
+                f"{self.platform} rate limited {operation}",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        if rate_limit_pressure(self.platform, response.headers):
+            get_limiter(self.platform, operation).slow_down()
+
+    async def _fetch_orders(self, limit: int) -> List[Dict[str, Any]]:
+        return []
+
+    async def _fetch_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    async def _update_order_status(
+        self, order_id: str, status: str, tracking_number: Optional[str]
+    ) -> bool:
+        return False
+
+    async def _sync_inventory(self, sku: str, quantity: int) -> bool:
+        return False
+
+    async def _health_check(self) -> bool:
+        return self.client.health_check()
@@ -0,0 +1,105 @@
+"""Circuit breakers tracking platform health."""
+
+import enum
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class PlatformUnavailableError(Exception):
+    """A platform call failed because the platform is unhealthy."""
+
+
+class CircuitOpenError(PlatformUnavailableError):
+    """Raised instead of calling a platform whose circuit is open."""
+
+
+class CircuitState(str, enum.Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker fed by the outcome of real platform calls.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast with :class:`CircuitOpenError`. Once ``reset_seconds``
+    have passed a single probe call is let through (half-open); its outcome
+    closes or reopens the circuit. The state doubles as the platform's
+    cached health, readable without calling the platform.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        """Initialize breaker, closed."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error: Optional[str] = None
+        self.last_success_at: Optional[datetime] = None
+        self.last_failure_at: Optional[datetime] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        """Whether calls are currently expected to succeed."""
+        return self.state == CircuitState.CLOSED
+
+    def before_call(self) -> None:
+        """Admit a call, or raise CircuitOpenError to fail fast."""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return
+            if self.state == CircuitState.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    raise CircuitOpenError(f"{self.name} circuit is open: {self.last_error}")
+                self.state = CircuitState.HALF_OPEN
+            if self._probing:
+                raise CircuitOpenError(f"{self.name} circuit is half-open, probe in flight")
+            self._probing = True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self._probing = False
+            self.last_success_at = datetime.utcnow()
+
+    def record_cancelled(self) -> None:
+        """Record a call abandoned before it finished."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, error: str) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self.last_failure_at = datetime.utcnow()
+            if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != CircuitState.OPEN:
+                    print(f"Opening {self.name} circuit after {self.failures} failures: {error}")
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current health state."""
+        with self._lock:
+            return {
+                "state": self.state.value,
+                "healthy": self.state == CircuitState.CLOSED,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "last_success_at": self.last_success_at,
+                "last_failure_at": self.last_failure_at,
+            }
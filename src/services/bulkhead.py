@@ -0,0 +1,189 @@
+"""Per-platform bulkheads isolating platform calls."""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from src.services.breaker import PlatformUnavailableError
+
+
+class BulkheadFullError(PlatformUnavailableError):
+    """Raised instead of queueing a call on a platform with no free slots."""
+
+
+class Bulkhead:
+    """
+    Bounded worker pool and admission limit for one platform.
+
+    At most ``max_concurrent`` calls run at once and ``queue_depth`` more
+    wait for a slot; anything beyond that is rejected at once with
+    :class:`BulkheadFullError`. Calls made directly in the caller's thread
+    or event loop share the same slots as calls on the pool, so a hung
+    platform can only ever tie up its own slots.
+
+    Hedged reads run on a separate pool of the platform, two threads per
+    slot, so a duplicate never queues behind the call it is hedging and a
+    slow platform's hedges never hold threads another platform needs.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, queue_depth: int):
+        """Initialize bulkhead."""
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.queue_depth = queue_depth
+        self.in_flight = 0
+        self.running = 0
+        self.rejected = 0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent,
+            thread_name_prefix=f"orderhub-{name}",
+        )
+        self.hedge_executor = ThreadPoolExecutor(
+            max_workers=max_concurrent * 2,
+            thread_name_prefix=f"orderhub-{name}-hedge",
+        )
+
+    def _admit(self) -> None:
+        """Count a call as running or waiting, or reject it if both are full."""
+        with self._cond:
+            if self.in_flight >= self.max_concurrent + self.queue_depth:
+                self.rejected += 1
+                raise BulkheadFullError(
+                    f"{self.name} has {self.in_flight} calls in flight, rejecting"
+                )
+            self.in_flight += 1
+
+    def _leave(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+
+    def _acquire(self, cancel: Optional[threading.Event] = None, blocking: bool = True) -> bool:
+        """
+        Take a running slot, waiting for one if ``blocking``.
+
+        Returns:
+            True once the slot is held, False if none was free or ``cancel``
+            was set first
+        """
+        with self._cond:
+            while self.running >= self.max_concurrent:
+                if not blocking or (cancel is not None and cancel.is_set()):
+                    return False
+                self._cond.wait()
+            self.running += 1
+            return True
+
+    def _release(self) -> None:
+        with self._cond:
+            self.running -= 1
+            self._cond.notify_all()
+
+    def _cancel(self, event: threading.Event) -> None:
+        """Stop the :meth:`_acquire` waiting on ``event``."""
+        with self._cond:
+            event.set()
+            self._cond.notify_all()
+
+    def _release_if_acquired(self, acquiring: "asyncio.Future[bool]") -> None:
+        if not acquiring.cancelled() and acquiring.exception() is None and acquiring.result():
+            self._release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Run ``fn`` on the platform's pool.
+
+        Raises:
+            BulkheadFullError: If every slot is taken and the queue is full
+        """
+        self._admit()
+
+        def run() -> Any:
+            try:
+                self._acquire()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._release()
+            finally:
+                self._leave()
+
+        try:
+            future = self._executor.submit(run)
+        except BaseException:
+            self._leave()
+            raise
+
+        def leave_if_cancelled(done: Future) -> None:
+            # A queued call cancelled before it started never runs ``run``
+            if done.cancelled():
+                self._leave()
+
+        future.add_done_callback(leave_if_cancelled)
+        return future
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` in the calling thread once one of the platform's slots is free.
+
+        Raises:
+            BulkheadFullError: If every slot is taken and the queue is full
+        """
+        self._admit()
+        try:
+            self._acquire()
+            try:
+                return fn()
+            finally:
+                self._release()
+        finally:
+            self._leave()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """
+        Hold one of the platform's slots for an async call.
+
+        A free slot is taken without leaving the event loop; otherwise the
+        wait runs on a worker thread. If the caller is cancelled while
+        waiting, the wait is told to give up, and a slot it had already won
+        is handed straight back.
+
+        Raises:
+            BulkheadFullError: If every slot is taken and the queue is full
+        """
+        self._admit()
+        try:
+            if not self._acquire(blocking=False):
+                cancel = threading.Event()
+                acquiring = asyncio.ensure_future(asyncio.to_thread(self._acquire, cancel))
+                try:
+                    await asyncio.shield(acquiring)
+                except asyncio.CancelledError:
+                    self._cancel(cancel)
+                    acquiring.add_done_callback(self._release_if_acquired)
+                    raise
+            try:
+                yield
+            finally:
+                self._release()
+        finally:
+            self._leave()
+
+    def stats(self) -> Dict[str, int]:
+        """Calls running, waiting and rejected."""
+        with self._cond:
+            return {
+                "in_flight": self.in_flight,
+                "running": self.running,
+                "max_concurrent": self.max_concurrent,
+                "queue_depth": self.queue_depth,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pools, dropping queued calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.hedge_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,177 @@
+"""In-process TTL cache for platform reads."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a TTL.
+
+    With ``stale_seconds`` set, an entry that expired less than that long ago
+    is still served immediately while one background call refreshes it
+    (stale-while-revalidate). Hit and miss counters are kept for tuning.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        stale_seconds: float = 0.0,
+        executor: Optional[Executor] = None,
+    ):
+        """Initialize cache."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.executor = executor
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether anything is cached."""
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, calling ``loader`` on a miss.
+
+        Args:
+            key: Cache key
+            loader: Produces the value when it is not cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        state, value = self._lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            if self._begin_refresh(key):
+                self._submit(key, lambda: self._refresh(key, loader))
+            return value
+
+        value = loader()
+        self.set(key, value)
+        return value
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached value, awaiting ``loader`` on a miss.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value when it is not cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        state, value = self._lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            if self._begin_refresh(key):
+                asyncio.create_task(self._arefresh(key, loader))
+            return value
+
+        value = await loader()
+        self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and size counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _lookup(self, key: Hashable) -> Tuple[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if now < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return FRESH, value
+                if now < expires + self.stale_seconds:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return STALE, value
+                del self._entries[key]
+            self.misses += 1
+            return MISS, None
+
+    def _begin_refresh(self, key: Hashable) -> bool:
+        # One background refresh per key at a time
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _submit(self, key: Hashable, fn: Callable[[], None]) -> None:
+        try:
+            if self.executor is not None:
+                self.executor.submit(fn)
+            else:
+                threading.Thread(target=fn, daemon=True).start()
+        except Exception as e:
+            print(f"Could not refresh cached {key}: {e}")
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        try:
+            self.set(key, loader())
+        except Exception as e:
+            print(f"Error refreshing cached {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _arefresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self.set(key, await loader())
+        except Exception as e:
+            print(f"Error refreshing cached {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
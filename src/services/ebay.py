@@ -6,13 +6,26 @@ from typing import List, Dict, Any, Optional
 
 from src.config import get_settings
 from src.models.order import OrderStatus
+from src.services.base import AsyncClientBase, filter_demo_orders
 
 settings = get_settings()
 
+# Trading API OrderStatus for each unified order status
+STATUS_FILTERS = {
+    "pending": "Active",
+    "processing": "Completed",
+    "shipped": "Completed",
+    "delivered": "Completed",
+    "cancelled": "Cancelled",
+}
+
 
 class EbayClient:
     """Client for eBay Trading API."""
 
+    # bulkUpdatePriceQuantity takes up to 25 SKUs per call
+    inventory_batch_size = 25
+
     def __init__(
         self,
         app_id: str = "",
@@ -30,10 +43,25 @@ class EbayClient:
             self.app_id, self.cert_id, self.dev_id, self.user_token
         ])
 
-    def get_orders(self, limit: int = 50, days: int = 30) -> List[Dict[str, Any]]:
-        """Fetch orders from eBay."""
+    def get_orders(
+        self,
+        limit: int = 50,
+        days: int = 30,
+        *,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch orders from eBay, filtered at the source."""
         if self.demo_mode:
-            return self._get_demo_orders(limit)
+            return filter_demo_orders(
+                self._get_demo_orders(limit),
+                status=status,
+                created_after=created_after,
+                created_before=created_before,
+                updated_after=updated_after,
+            )
 
         # Real implementation would use eBay Trading API
         # from ebaysdk.trading import Connection as Trading
@@ -46,12 +74,13 @@ class EbayClient:
         #     config_file=None
         # )
         # response = api.execute('GetOrders', {
-        #     'CreateTimeFrom': (datetime.now() - timedelta(days=days)).isoformat(),
-        #     'CreateTimeTo': datetime.now().isoformat(),
+        #     'CreateTimeFrom': (created_after or datetime.now() - timedelta(days=days)).isoformat(),
+        #     'CreateTimeTo': (created_before or datetime.now()).isoformat(),
+        #     'ModTimeFrom': updated_after.isoformat() if updated_after else None,
         #     'OrderRole': 'Seller',
-        #     'OrderStatus': 'All',
+        #     'OrderStatus': STATUS_FILTERS.get(status, 'All'),
         # })
-        # return [self._format_order(order) for order in response.dict().get('OrderArray', {}).get('Order', [])]
+        # return [self.format_order(order) for order in response.dict().get('OrderArray', {}).get('Order', [])]
 
         return []
 
@@ -82,6 +111,14 @@ class EbayClient:
         # Real implementation would use ReviseInventoryStatus
         return False
 
+    def sync_inventory_bulk(self, quantities: Dict[str, int]) -> Dict[str, bool]:
+        """Sync many inventory quantities to eBay in one call."""
+        if self.demo_mode:
+            return {sku: True for sku in quantities}
+
+        # Real implementation would use the Inventory API bulkUpdatePriceQuantity
+        return {sku: False for sku in quantities}
+
     def _get_demo_orders(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Generate demo orders for testing."""
         demo_orders = []
@@ -101,13 +138,16 @@ class EbayClient:
             status = random.choice(statuses)
 
             order_date = datetime.now() - timedelta(days=random.randint(0, 30))
+            # Orders keep changing after they are placed, e.g. when they ship
+            updated_at = min(datetime.now(), order_date + timedelta(hours=random.randint(0, 72)))
 
             order = {
-                "id": f"EBAY{3000 + i}-{random.randint(10000, 99999)}",
+                "id": f"EBAY{3000 + i}",
                 "order_number": f"EBAY-{3000 + i}",
                 "platform": "ebay",
                 "status": status.value,
                 "order_date": order_date.isoformat(),
+                "updated_at": updated_at.isoformat(),
                 "customer": {
                     "name": f"eBay Buyer {i + 1}",
                     "email": f"ebaybuyer{i+1}@example.com",
@@ -140,6 +180,9 @@ class EbayClient:
 
             demo_orders.append(order)
 
+        # Platform APIs return orders newest first
+        demo_orders.sort(key=lambda o: o["order_date"], reverse=True)
+
         return demo_orders
 
     def health_check(self) -> bool:
@@ -148,3 +191,25 @@ class EbayClient:
             return True
 
         return bool(self.app_id and self.cert_id and self.dev_id and self.user_token)
+
+
+class AsyncEbayClient(AsyncClientBase):
+    """Async client for eBay Sell APIs."""
+
+    platform = "ebay"
+
+    def base_url(self) -> str:
+        """eBay API base URL for the configured environment."""
+        if self.client.environment == "sandbox":
+            return "https://api.sandbox.ebay.com"
+        return "https://api.ebay.com"
+
+    def headers(self) -> Dict[str, str]:
+        """eBay OAuth user token header."""
+        return {"Authorization": f"Bearer {self.client.user_token}"}
+
+    async def _fetch_orders(self, limit: int) -> List[Dict[str, Any]]:
+        # Real implementation would use the Fulfillment API
+        # response = await self.http.get("/sell/fulfillment/v1/order", params={"limit": limit})
+        # return [self.format_order(order) for order in response.json().get("orders", [])]
+        return []
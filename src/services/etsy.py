@@ -4,15 +4,30 @@ import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
+import httpx
+
 from src.config import get_settings
 from src.models.order import OrderStatus
+from src.services.base import AsyncClientBase, filter_demo_orders, platform_timestamp
 
 settings = get_settings()
 
+# Etsy receipt filters for each unified order status
+STATUS_FILTERS = {
+    "pending": {"was_paid": False},
+    "processing": {"was_paid": True, "was_shipped": False},
+    "shipped": {"was_shipped": True},
+    "delivered": {"was_shipped": True},
+    "cancelled": {"was_canceled": True},
+}
+
 
 class EtsyClient:
     """Client for Etsy Open API."""
 
+    # Etsy has no batch inventory endpoint; listings are updated one by one
+    inventory_batch_size = 1
+
     def __init__(
         self,
         api_key: str = "",
@@ -27,10 +42,25 @@ class EtsyClient:
             self.api_key, self.shop_id, self.access_token
         ])
 
-    def get_orders(self, limit: int = 50, days: int = 30) -> List[Dict[str, Any]]:
-        """Fetch orders from Etsy."""
+    def get_orders(
+        self,
+        limit: int = 50,
+        days: int = 30,
+        *,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch orders from Etsy, filtered at the source."""
         if self.demo_mode:
-            return self._get_demo_orders(limit)
+            return filter_demo_orders(
+                self._get_demo_orders(limit),
+                status=status,
+                created_after=created_after,
+                created_before=created_before,
+                updated_after=updated_after,
+            )
 
         # Real implementation would use Etsy Open API v3
         # import requests
@@ -42,9 +72,16 @@ class EtsyClient:
         # response = requests.get(
         #     f'https://openapi.etsy.com/v3/application/shops/{self.shop_id}/receipts',
         #     headers=headers,
-        #     params={'limit': limit, 'was_paid': True}
+        #     params={
+        #         'limit': limit,
+        #         'was_paid': True,
+        #         'min_created': int(created_after.timestamp()) if created_after else None,
+        #         'max_created': int(created_before.timestamp()) if created_before else None,
+        #         'min_last_modified': int(updated_after.timestamp()) if updated_after else None,
+        #         **STATUS_FILTERS.get(status, {}),
+        #     }
         # )
-        # return [self._format_order(order) for order in response.json().get('results', [])]
+        # return [self.format_order(order) for order in response.json().get('results', [])]
 
         return []
 
@@ -75,6 +112,71 @@ class EtsyClient:
         # Real implementation would use updateListingInventory
         return False
 
+    def format_order(self, receipt: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an Etsy shop receipt (API or webhook payload) to the unified format."""
+
+        def money(value: Optional[Dict[str, Any]]) -> float:
+            # Etsy amounts are integers in the currency's minor unit
+            if not value:
+                return 0.0
+            return value["amount"] / value.get("divisor", 100)
+
+        etsy_status = (receipt.get("status") or "").lower()
+        if etsy_status == "canceled":
+            status = OrderStatus.CANCELLED
+        elif etsy_status == "fully refunded":
+            status = OrderStatus.REFUNDED
+        elif receipt.get("is_shipped"):
+            status = OrderStatus.SHIPPED
+        elif receipt.get("is_paid") or etsy_status == "paid":
+            status = OrderStatus.PROCESSING
+        else:
+            status = OrderStatus.PENDING
+
+        shipment = (receipt.get("shipments") or [{}])[-1]
+        grandtotal = receipt.get("grandtotal") or {}
+
+        return {
+            "id": str(receipt["receipt_id"]),
+            "order_number": f"ETSY-{receipt['receipt_id']}",
+            "platform": "etsy",
+            "status": status.value,
+            "order_date": platform_timestamp(receipt["create_timestamp"]),
+            "updated_at": platform_timestamp(
+                receipt.get("update_timestamp") or receipt["create_timestamp"]
+            ),
+            "customer": {
+                "name": receipt.get("name") or "",
+                "email": receipt.get("buyer_email"),
+            },
+            "shipping_address": {
+                "line1": receipt.get("first_line"),
+                "line2": receipt.get("second_line"),
+                "city": receipt.get("city"),
+                "state": receipt.get("state"),
+                "postal_code": receipt.get("zip"),
+                "country": receipt.get("country_iso"),
+            },
+            "items": [
+                {
+                    "sku": item.get("sku") or str(item.get("listing_id")),
+                    "name": item["title"],
+                    "quantity": item["quantity"],
+                    "unit_price": money(item.get("price")),
+                    "total_price": money(item.get("price")) * item["quantity"],
+                    "variant_title": None,
+                }
+                for item in receipt.get("transactions", [])
+            ],
+            "subtotal": money(receipt.get("subtotal")),
+            "tax": money(receipt.get("total_tax_cost")),
+            "shipping_cost": money(receipt.get("total_shipping_cost")),
+            "total": money(grandtotal),
+            "currency": grandtotal.get("currency_code") or "USD",
+            "tracking_number": shipment.get("tracking_code"),
+            "carrier": shipment.get("carrier_name"),
+        }
+
     def _get_demo_orders(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Generate demo orders for testing."""
         demo_orders = []
@@ -94,6 +196,8 @@ class EtsyClient:
             status = random.choice(statuses)
 
             order_date = datetime.now() - timedelta(days=random.randint(0, 30))
+            # Orders keep changing after they are placed, e.g. when they ship
+            updated_at = min(datetime.now(), order_date + timedelta(hours=random.randint(0, 72)))
 
             order = {
                 "id": f"ETSY{4000 + i}",
@@ -101,6 +205,7 @@ class EtsyClient:
                 "platform": "etsy",
                 "status": status.value,
                 "order_date": order_date.isoformat(),
+                "updated_at": updated_at.isoformat(),
                 "customer": {
                     "name": f"Etsy Shopper {i + 1}",
                     "email": f"etsyshopper{i+1}@example.com",
@@ -133,6 +238,9 @@ class EtsyClient:
 
             demo_orders.append(order)
 
+        # Platform APIs return orders newest first
+        demo_orders.sort(key=lambda o: o["order_date"], reverse=True)
+
         return demo_orders
 
     def health_check(self) -> bool:
@@ -141,3 +249,37 @@ class EtsyClient:
             return True
 
         return bool(self.api_key and self.shop_id and self.access_token)
+
+
+class AsyncEtsyClient(AsyncClientBase):
+    """Async client for Etsy Open API v3."""
+
+    platform = "etsy"
+
+    def base_url(self) -> str:
+        """Etsy Open API base URL."""
+        return "https://openapi.etsy.com/v3/application"
+
+    def headers(self) -> Dict[str, str]:
+        """Etsy API key and OAuth token headers."""
+        return {
+            "x-api-key": self.client.api_key,
+            "Authorization": f"Bearer {self.client.access_token}",
+        }
+
+    async def _fetch_orders(self, limit: int) -> List[Dict[str, Any]]:
+        # Real implementation would list shop receipts
+        # response = await self.http.get(
+        #     f"/shops/{self.client.shop_id}/receipts",
+        #     params={"limit": limit, "was_paid": True},
+        # )
+        # return [self.format_order(order) for order in response.json().get("results", [])]
+        return []
+
+    async def _health_check(self) -> bool:
+        try:
+            response = await self.http.get("/openapi-ping")
+        except httpx.HTTPError:
+            return False
+        self._check_response(response, "health_check")
+        return response.status_code == 200
@@ -0,0 +1,45 @@
+"""Order filter specification."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.models.order import OrderStatus
+
+
+@dataclass(frozen=True)
+class OrderFilter:
+    """
+    Filters applied to an order query.
+
+    The same specification drives the SQL read model and the platform
+    fetches, where each client translates it into its native query so the
+    filtering happens at the source.
+    """
+
+    status: Optional[OrderStatus] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+    def to_query(self) -> Dict[str, Any]:
+        """Keyword arguments for a platform client's ``get_orders``."""
+        query: Dict[str, Any] = {}
+        if self.status:
+            query["status"] = self.status.value
+        if self.created_after:
+            query["created_after"] = self.created_after
+        if self.created_before:
+            query["created_before"] = self.created_before
+        return query
+
+    def matches(self, order: Dict[str, Any]) -> bool:
+        """Check an order in the unified platform format against the filter."""
+        if self.status and order["status"] != self.status.value:
+            return False
+        if self.created_after or self.created_before:
+            order_date = datetime.fromisoformat(order["order_date"])
+            if self.created_after and order_date < self.created_after:
+                return False
+            if self.created_before and order_date > self.created_before:
+                return False
+        return True
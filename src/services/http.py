@@ -0,0 +1,53 @@
+"""Shared HTTP connection pools for platform APIs."""
+
+from typing import Dict, Optional
+
+import httpx
+
+from src.config import get_settings
+
+settings = get_settings()
+
+# One long-lived client per platform so keep-alive connections (and their
+# TLS sessions) are reused across requests instead of renegotiated per call.
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(
+    platform: str,
+    base_url: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for a platform.
+
+    Args:
+        platform: Platform name (shopify, amazon, ebay, etsy)
+        base_url: API base URL used when the client is first created
+        headers: Default headers used when the client is first created
+
+    Returns:
+        Pooled async HTTP client
+    """
+    client = _clients.get(platform)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers or {},
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_seconds,
+            ),
+            timeout=settings.http_timeout_seconds,
+        )
+        _clients[platform] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every pooled HTTP client."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,178 @@
+"""Order ingestion into the local database."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import delete, func, insert, or_
+from sqlalchemy.orm import Session
+
+from src.db.database import on_conflict_insert
+from src.models.order import Order, OrderItem, OrderStatus
+from src.services.base import order_updated_at
+
+# Columns refreshed when an order that is already stored is fetched again
+UPSERT_COLUMNS = [
+    "platform_order_number",
+    "status",
+    "order_date",
+    "customer_name",
+    "customer_email",
+    "shipping_address_line1",
+    "shipping_address_line2",
+    "shipping_city",
+    "shipping_state",
+    "shipping_postal_code",
+    "shipping_country",
+    "subtotal",
+    "tax",
+    "shipping_cost",
+    "total",
+    "currency",
+    "tracking_number",
+    "carrier",
+    "synced_at",
+    "platform_updated_at",
+]
+
+
+def normalize_order(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a unified platform order into an ``orders`` row.
+
+    Args:
+        data: Order in the unified format returned by the platform clients
+
+    Returns:
+        Column values for the ``orders`` table
+    """
+    address = data.get("shipping_address") or {}
+    customer = data.get("customer") or {}
+
+    return {
+        "platform": data["platform"],
+        "platform_order_id": str(data["id"]),
+        "platform_order_number": data.get("order_number"),
+        "status": OrderStatus(data["status"]),
+        "order_date": datetime.fromisoformat(data["order_date"]),
+        "customer_name": customer.get("name") or "",
+        "customer_email": customer.get("email"),
+        "shipping_address_line1": address.get("line1"),
+        "shipping_address_line2": address.get("line2"),
+        "shipping_city": address.get("city"),
+        "shipping_state": address.get("state"),
+        "shipping_postal_code": address.get("postal_code"),
+        "shipping_country": address.get("country"),
+        "subtotal": Decimal(str(data["subtotal"])),
+        "tax": Decimal(str(data.get("tax") or 0)),
+        "shipping_cost": Decimal(str(data.get("shipping_cost") or 0)),
+        "total": Decimal(str(data["total"])),
+        "currency": data.get("currency") or "USD",
+        "tracking_number": data.get("tracking_number"),
+        "carrier": data.get("carrier"),
+        "synced_at": datetime.utcnow(),
+        "platform_updated_at": order_updated_at(data),
+    }
+
+
+def normalize_items(data: Dict[str, Any], order_id: int) -> List[Dict[str, Any]]:
+    """
+    Convert a unified order's line items into ``order_items`` rows.
+
+    Args:
+        data: Order in the unified format returned by the platform clients
+        order_id: Local ``orders.id`` the items belong to
+
+    Returns:
+        Column values for the ``order_items`` table
+    """
+    return [
+        {
+            "order_id": order_id,
+            "sku": item["sku"],
+            "product_name": item["name"],
+            "quantity": item["quantity"],
+            "unit_price": Decimal(str(item["unit_price"])),
+            "total_price": Decimal(str(item["total_price"])),
+            "variant_title": item.get("variant_title"),
+        }
+        for item in data.get("items", [])
+    ]
+
+
+class OrderIngestor:
+    """Write platform orders to the database in batches."""
+
+    def __init__(self, db: Session, batch_size: int = 1000):
+        """Initialize ingestor."""
+        self.db = db
+        self.batch_size = batch_size
+
+    def upsert(self, orders: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update orders and replace their line items.
+
+        Each batch costs three statements regardless of its size: one
+        ``INSERT ... ON CONFLICT (platform, platform_order_id) DO UPDATE``
+        for the orders, one ``DELETE`` and one multi-row ``INSERT`` for the
+        items. A stored order is only replaced by a copy that changed on the
+        platform at the same time or later, so a late webhook retry or an
+        older polled page cannot roll it back. The caller owns the
+        transaction.
+
+        Args:
+            orders: Orders in the unified platform format
+
+        Returns:
+            Number of orders written
+        """
+        written = 0
+        for start in range(0, len(orders), self.batch_size):
+            written += self._upsert_batch(orders[start:start + self.batch_size])
+        return written
+
+    def _upsert_batch(self, orders: List[Dict[str, Any]]) -> int:
+        # A statement may not touch the same row twice, so the newest copy
+        # of a repeated order wins
+        latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for data in orders:
+            key = (data["platform"], str(data["id"]))
+            if key not in latest or order_updated_at(data) >= order_updated_at(latest[key]):
+                latest[key] = data
+        if not latest:
+            return 0
+
+        stmt = on_conflict_insert(self.db, Order.__table__).values([normalize_order(d) for d in latest.values()])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["platform", "platform_order_id"],
+            set_={
+                **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                "updated_at": func.now(),
+            },
+            where=or_(
+                Order.platform_updated_at.is_(None),
+                stmt.excluded.platform_updated_at >= Order.platform_updated_at,
+            ),
+        ).returning(Order.id, Order.platform, Order.platform_order_id)
+
+        # Orders kept because the stored copy is newer are not returned
+        order_ids = {
+            (row.platform, row.platform_order_id): row.id
+            for row in self.db.execute(stmt)
+        }
+        if not order_ids:
+            return 0
+
+        self.db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids.values())))
+
+        items = [
+            item
+            for key, data in latest.items()
+            if key in order_ids
+            for item in normalize_items(data, order_ids[key])
+        ]
+        if items:
+            self.db.execute(insert(OrderItem), items)
+
+        return len(order_ids)
+
@@ -1,11 +1,13 @@
 """Inventory management service."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import bindparam, case, insert, literal, select, true, update
 from sqlalchemy.orm import Session
 
 from src.models.product import Product, InventoryLog
+from src.services.outbox import InventoryOutboxService
 
 
 class InventoryService:
@@ -32,6 +34,11 @@ class InventoryService:
         """
         Update product quantity and log the change.
 
+        The change is logged from the product row, locking it, and applied
+        with one ``UPDATE ... RETURNING`` in the same transaction, so
+        concurrent changes to the same SKU never overwrite each other. A
+        change that would take stock below zero clamps it at zero.
+
         Args:
             sku: Product SKU
             quantity_change: Amount to change (positive or negative)
@@ -44,39 +51,74 @@ class InventoryService:
         Returns:
             Updated product or None if not found
         """
-        product = self.get_product(sku)
-        if not product:
+        quantity = Product.quantity_available + quantity_change
+        quantity = case((quantity < 0, 0), else_=quantity)
+
+        logged = self._log_change(
+            sku,
+            quantity_after=quantity,
+            quantity_change=literal(quantity_change),
+            change_type=change_type,
+            platform=platform,
+            order_id=order_id,
+            reason=reason,
+            notes=notes,
+        )
+        if not logged:
             return None
+        product = self._update(sku, true(), quantity_available=quantity)
+        self.db.commit()
 
-        # Record before quantity
-        quantity_before = product.quantity_available
+        return product
 
-        # Update quantity
-        product.quantity_available += quantity_change
-        product.updated_at = datetime.utcnow()
+    def set_quantity(
+        self,
+        sku: str,
+        quantity: int,
+        change_type: str,
+        platform: Optional[str] = None,
+        reason: Optional[str] = None,
+        sync_platforms: bool = False,
+    ) -> Optional[Product]:
+        """
+        Set product quantity to an absolute value and log the change.
+
+        Like :meth:`update_quantity`, the change is logged from the locked
+        row and written with one ``UPDATE ... RETURNING``, so the logged
+        difference is always exact.
+
+        Args:
+            sku: Product SKU
+            quantity: New available quantity
+            change_type: Type of change (sale, restock, adjustment, sync)
+            platform: Platform where change originated
+            reason: Reason for change
+            sync_platforms: Queue the new quantity in the outbox, committed
+                with the change, for pushing to all platforms
 
-        # Prevent negative inventory
-        if product.quantity_available < 0:
-            product.quantity_available = 0
+        Returns:
+            Updated product or None if not found
 
-        quantity_after = product.quantity_available
+        Raises:
+            ValueError: If the quantity is negative
+        """
+        if quantity < 0:
+            raise ValueError(f"Quantity cannot be negative: {quantity}")
 
-        # Create audit log
-        log = InventoryLog(
-            sku=sku,
+        logged = self._log_change(
+            sku,
+            quantity_after=literal(quantity),
+            quantity_change=quantity - Product.quantity_available,
             change_type=change_type,
-            quantity_before=quantity_before,
-            quantity_after=quantity_after,
-            quantity_change=quantity_change,
             platform=platform,
-            order_id=order_id,
             reason=reason,
-            notes=notes,
         )
-
-        self.db.add(log)
+        if not logged:
+            return None
+        product = self._update(sku, true(), quantity_available=quantity)
+        if sync_platforms:
+            InventoryOutboxService(self.db).enqueue({sku: quantity})
         self.db.commit()
-        self.db.refresh(product)
 
         return product
 
@@ -84,6 +126,9 @@ class InventoryService:
         """
         Reserve inventory for an order.
 
+        Stock moves from available to reserved in one conditional
+        ``UPDATE``, which matches nothing if too little is available.
+
         Args:
             sku: Product SKU
             quantity: Quantity to reserve
@@ -92,21 +137,16 @@ class InventoryService:
         Returns:
             True if reservation successful
         """
-        product = self.get_product(sku)
-        if not product:
-            return False
-
-        # Check if enough available
-        if product.quantity_available < quantity:
+        product = self._update(
+            sku,
+            Product.quantity_available >= quantity,
+            quantity_available=Product.quantity_available - quantity,
+            quantity_reserved=Product.quantity_reserved + quantity,
+        )
+        if product is None:
             return False
 
-        # Move from available to reserved
-        product.quantity_available -= quantity
-        product.quantity_reserved += quantity
-        product.updated_at = datetime.utcnow()
-
-        # Log the reservation
-        log = InventoryLog(
+        self._log(
             sku=sku,
             change_type="reservation",
             quantity_before=product.quantity_available + quantity,
@@ -115,12 +155,97 @@ class InventoryService:
             order_id=order_id,
             reason="Order placed",
         )
-
-        self.db.add(log)
         self.db.commit()
 
         return True
 
+    def reserve_order(self, order_id: int, items: List[Dict[str, Any]]) -> bool:
+        """
+        Reserve every line of an order, or none of them.
+
+        Args:
+            order_id: Order ID
+            items: Order lines with ``sku`` and ``quantity``
+
+        Returns:
+            True if all lines were reserved
+        """
+        return self.reserve_orders({order_id: items})[order_id]
+
+    def reserve_orders(self, orders: Dict[int, List[Dict[str, Any]]]) -> Dict[int, bool]:
+        """
+        Reserve inventory for a batch of orders in one transaction.
+
+        The affected products are locked with ``SELECT ... FOR UPDATE`` in
+        SKU order, so concurrent batches always lock in the same order and
+        cannot deadlock. Each order is reserved all or nothing against the
+        locked stock; the quantity changes are applied with one executemany
+        ``UPDATE`` and the audit rows with one bulk ``INSERT``, then the
+        batch is committed once.
+
+        Args:
+            orders: Order lines with ``sku`` and ``quantity``, keyed by order ID
+
+        Returns:
+            Whether each order was reserved, keyed by order ID
+        """
+        wanted: Dict[int, Dict[str, int]] = {}
+        for order_id, items in orders.items():
+            lines = wanted[order_id] = {}
+            for item in items:
+                lines[item["sku"]] = lines.get(item["sku"], 0) + item["quantity"]
+
+        skus = sorted({sku for lines in wanted.values() for sku in lines})
+        available = {
+            row.sku: row.quantity_available
+            for row in self.db.execute(
+                select(Product.sku, Product.quantity_available)
+                .where(Product.sku.in_(skus))
+                .order_by(Product.sku)
+                .with_for_update()
+            )
+        }
+
+        results: Dict[int, bool] = {}
+        reserved: Dict[str, int] = {}
+        logs = []
+        for order_id, lines in wanted.items():
+            results[order_id] = all(
+                sku in available and available[sku] >= quantity
+                for sku, quantity in lines.items()
+            )
+            if not results[order_id]:
+                continue
+            for sku, quantity in lines.items():
+                logs.append({
+                    "sku": sku,
+                    "change_type": "reservation",
+                    "quantity_before": available[sku],
+                    "quantity_after": available[sku] - quantity,
+                    "quantity_change": -quantity,
+                    "order_id": order_id,
+                    "reason": "Order placed",
+                })
+                available[sku] -= quantity
+                reserved[sku] = reserved.get(sku, 0) + quantity
+
+        if reserved:
+            products = Product.__table__
+            self.db.execute(
+                update(products)
+                .where(products.c.sku == bindparam("b_sku"))
+                .values(
+                    quantity_available=products.c.quantity_available - bindparam("b_quantity"),
+                    quantity_reserved=products.c.quantity_reserved + bindparam("b_quantity"),
+                    updated_at=datetime.utcnow(),
+                ),
+                [{"b_sku": sku, "b_quantity": quantity} for sku, quantity in sorted(reserved.items())],
+            )
+            self.db.execute(insert(InventoryLog), logs)
+        self.db.commit()
+
+        return results
+
     def release_reservation(self, sku: str, quantity: int, order_id: int, reason: str = "Order cancelled") -> bool:
         """
         Release reserved inventory back to available.
@@ -134,21 +259,20 @@ class InventoryService:
         Returns:
             True if release successful
         """
-        product = self.get_product(sku)
-        if not product:
+        product = self._update(
+            sku,
+            true(),
+            quantity_available=Product.quantity_available + quantity,
+            # Prevent negative reserved
+            quantity_reserved=case(
+                (Product.quantity_reserved > quantity, Product.quantity_reserved - quantity),
+                else_=0,
+            ),
+        )
+        if product is None:
             return False
 
-        # Move from reserved back to available
-        product.quantity_reserved -= quantity
-        product.quantity_available += quantity
-        product.updated_at = datetime.utcnow()
-
-        # Prevent negative reserved
-        if product.quantity_reserved < 0:
-            product.quantity_reserved = 0
-
-        # Log the release
-        log = InventoryLog(
+        self._log(
             sku=sku,
             change_type="release",
             quantity_before=product.quantity_available - quantity,
@@ -157,12 +281,73 @@ class InventoryService:
             order_id=order_id,
             reason=reason,
         )
-
-        self.db.add(log)
         self.db.commit()
 
         return True
 
+    def _update(self, sku: str, condition: Any, **values: Any) -> Optional[Product]:
+        """
+        Apply ``values`` to a product in one ``UPDATE ... RETURNING``.
+
+        Args:
+            sku: Product SKU
+            condition: Extra WHERE clause the row must still satisfy
+            **values: Column values or SQL expressions to set
+
+        Returns:
+            Updated product, or None if no row matched
+        """
+        stmt = (
+            update(Product)
+            .where(Product.sku == sku, condition)
+            .values(**values, updated_at=datetime.utcnow())
+            .returning(Product)
+            .execution_options(synchronize_session="fetch")
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def _log_change(
+        self,
+        sku: str,
+        quantity_after: Any,
+        quantity_change: Any,
+        **values: Any,
+    ) -> bool:
+        """
+        Audit a change computed from the product's current row.
+
+        The row is read and locked by the ``INSERT ... SELECT ... FOR UPDATE``
+        itself (on SQLite, the insert takes the database write lock), so it
+        cannot change between being logged and being updated.
+
+        Args:
+            sku: Product SKU
+            quantity_after: SQL expression for the new quantity
+            quantity_change: SQL expression for the logged change
+            **values: Other log columns
+
+        Returns:
+            False if there is no such product
+        """
+        columns = {
+            "sku": Product.sku,
+            "quantity_before": Product.quantity_available,
+            "quantity_after": quantity_after,
+            "quantity_change": quantity_change,
+            **{name: literal(value) for name, value in values.items() if value is not None},
+        }
+        row = (
+            select(*(expr.label(name) for name, expr in columns.items()))
+            .where(Product.sku == sku)
+            .with_for_update()
+        )
+        result = self.db.execute(insert(InventoryLog).from_select(list(columns), row))
+        return result.rowcount > 0
+
+    def _log(self, **values: Any) -> None:
+        """Add an audit row, written in the same transaction as the change."""
+        self.db.execute(insert(InventoryLog), [values])
+
     def check_reorder_needed(self, sku: str) -> bool:
         """
         Check if product needs reordering.
@@ -0,0 +1,256 @@
+"""Streaming bulk inventory import."""
+
+import asyncio
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, bindparam, column, insert, select, update, values
+from sqlalchemy.orm import Session
+
+from src.models.product import InventoryLog, Product
+from src.services.outbox import InventoryOutboxService
+
+# SKUs diffed and written per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+# Row errors reported back; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+class ImportFormatError(ValueError):
+    """Raised when an upload cannot be read at all, e.g. a CSV without a SKU column."""
+
+
+@dataclass
+class InventoryImportResult:
+    """Outcome of a bulk inventory import."""
+
+    rows: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    unknown: int = 0
+    invalid: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def add_error(self, line: int, error: Exception) -> None:
+        """Count an unusable row, keeping the first few messages."""
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Line {line}: {error}")
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a UTF-8 byte stream into lines without reading it all.
+
+    Args:
+        stream: Request body chunks
+
+    Returns:
+        Async iterator over lines, without line endings
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in stream:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+def parse_quantity(value: Any) -> int:
+    """Validate a quantity from an upload."""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"invalid quantity {value!r}")
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid quantity {value!r}") from None
+    if quantity < 0:
+        raise ValueError(f"negative quantity {quantity}")
+    return quantity
+
+
+def parse_sku(value: Any) -> str:
+    """Validate a SKU from an upload."""
+    sku = str(value or "").strip()
+    if not sku:
+        raise ValueError("missing sku")
+    return sku
+
+
+class InventoryImporter:
+    """
+    Apply a streamed quantity upload to the product catalog.
+
+    Rows are read one line at a time and applied in chunks: each chunk is
+    diffed against the stored quantities in one query, and only the SKUs
+    that changed are updated, audited and queued for the platforms, with
+    one statement each and one commit per chunk.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        sync_platforms: bool = True,
+    ):
+        """Initialize importer."""
+        self.db = db
+        self.chunk_size = chunk_size
+        self.sync_platforms = sync_platforms
+
+    async def run(self, stream: AsyncIterator[bytes], fmt: str) -> InventoryImportResult:
+        """
+        Import a CSV or NDJSON upload.
+
+        CSV needs a header row with ``sku`` and ``quantity`` columns; NDJSON
+        needs one ``{"sku": ..., "quantity": ...}`` object per line. Rows
+        that cannot be parsed are counted and skipped.
+
+        Args:
+            stream: Upload body chunks
+            fmt: ``csv`` or ``ndjson``
+
+        Returns:
+            Import counts and the first row errors
+
+        Raises:
+            ImportFormatError: If the upload cannot be read at all
+        """
+        if fmt not in IMPORT_FORMATS:
+            raise ImportFormatError(f"Unsupported import format: {fmt}")
+
+        result = InventoryImportResult()
+        columns: Optional[Tuple[int, int]] = None
+        chunk: Dict[str, int] = {}
+        line_number = 0
+
+        async for line in iter_lines(stream):
+            line_number += 1
+            if not line.strip():
+                continue
+            if fmt == "csv" and columns is None:
+                columns = self._csv_columns(line)
+                continue
+            try:
+                if fmt == "csv":
+                    sku, quantity = self._parse_csv(line, columns)
+                else:
+                    sku, quantity = self._parse_ndjson(line)
+            except ValueError as e:
+                result.add_error(line_number, e)
+                continue
+
+            result.rows += 1
+            chunk[sku] = quantity
+            if len(chunk) >= self.chunk_size:
+                await asyncio.to_thread(self.apply, chunk, result)
+                chunk = {}
+
+        if chunk:
+            await asyncio.to_thread(self.apply, chunk, result)
+        return result
+
+    def apply(self, quantities: Dict[str, int], result: InventoryImportResult) -> None:
+        """
+        Apply one chunk of quantities in a single transaction.
+
+        Args:
+            quantities: New quantity per SKU
+            result: Counts to update
+        """
+        # Locked in SKU order, like batch reservations, so the two never deadlock
+        current = {
+            row.sku: row.quantity_available
+            for row in self.db.execute(
+                select(Product.sku, Product.quantity_available)
+                .where(Product.sku.in_(quantities))
+                .order_by(Product.sku)
+                .with_for_update()
+            )
+        }
+        changes = {
+            sku: quantity
+            for sku, quantity in quantities.items()
+            if sku in current and current[sku] != quantity
+        }
+
+        if changes:
+            self._update(changes)
+            self.db.execute(insert(InventoryLog), [
+                {
+                    "sku": sku,
+                    "change_type": "sync",
+                    "quantity_before": current[sku],
+                    "quantity_after": quantity,
+                    "quantity_change": quantity - current[sku],
+                    "reason": "Bulk import",
+                }
+                for sku, quantity in changes.items()
+            ])
+            if self.sync_platforms:
+                InventoryOutboxService(self.db).enqueue(changes)
+        self.db.commit()
+
+        result.changed += len(changes)
+        result.unchanged += len(current) - len(changes)
+        result.unknown += len(quantities) - len(current)
+
+    def _update(self, changes: Dict[str, int]) -> None:
+        """Set the changed quantities with one statement."""
+        products = Product.__table__
+        now = datetime.utcnow()
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            incoming = values(
+                column("sku", String), column("quantity", Integer), name="incoming"
+            ).data(list(changes.items()))
+            self.db.execute(
+                update(products)
+                .where(products.c.sku == incoming.c.sku)
+                .values(quantity_available=incoming.c.quantity, updated_at=now)
+            )
+            return
+
+        self.db.execute(
+            update(products)
+            .where(products.c.sku == bindparam("b_sku"))
+            .values(quantity_available=bindparam("b_quantity"), updated_at=now),
+            [{"b_sku": sku, "b_quantity": quantity} for sku, quantity in changes.items()],
+        )
+
+    @staticmethod
+    def _csv_columns(header: str) -> Tuple[int, int]:
+        names = [name.strip().lower() for name in next(csv.reader([header]))]
+        missing = [name for name in ("sku", "quantity") if name not in names]
+        if missing:
+            raise ImportFormatError(f"CSV header is missing {', '.join(missing)}")
+        return names.index("sku"), names.index("quantity")
+
+    @staticmethod
+    def _parse_csv(line: str, columns: Tuple[int, int]) -> Tuple[str, int]:
+        row = next(csv.reader([line]))
+        sku_column, quantity_column = columns
+        if len(row) <= max(columns):
+            raise ValueError("missing columns")
+        return parse_sku(row[sku_column]), parse_quantity(row[quantity_column].strip())
+
+    @staticmethod
+    def _parse_ndjson(line: str) -> Tuple[str, int]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON ({e.msg})") from None
+        if not isinstance(record, dict):
+            raise ValueError("expected an object")
+        return parse_sku(record.get("sku")), parse_quantity(record.get("quantity"))
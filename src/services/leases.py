@@ -0,0 +1,144 @@
+"""Leases for electing a single sync leader across replicas."""
+
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Protocol, Tuple
+
+import redis
+
+from src.db.redis_client import get_redis
+
+# Extend the lease only if this holder still owns it
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the lease only if this holder still owns it
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class Lease(Protocol):
+    """Time-limited exclusive ownership of a named job."""
+
+    name: str
+    held: bool
+
+    def acquire(self) -> bool:
+        """Take the lease, or renew it if already held. True while held."""
+        ...
+
+    def release(self) -> None:
+        """Give up the lease if held."""
+        ...
+
+
+class RedisLease:
+    """
+    Lease stored in Redis, shared by every replica.
+
+    The holder keeps it with periodic :meth:`acquire` calls; if the holder
+    dies, the key expires after ``ttl_seconds`` and another replica takes
+    over on its next attempt. While Redis cannot be reached nobody holds the
+    lease, so runs are skipped everywhere rather than every replica electing
+    itself leader.
+    """
+
+    def __init__(self, client: redis.Redis, name: str, ttl_seconds: int):
+        """Initialize lease."""
+        self.client = client
+        self.name = name
+        self.key = f"orderhub:lease:{name}"
+        self.token = uuid.uuid4().hex
+        self.ttl_ms = ttl_seconds * 1000
+        self.held = False
+        self.unavailable = False
+
+    def acquire(self) -> bool:
+        """Take the lease, or renew it if already held. True while held."""
+        try:
+            # After an outage the key may still be ours, so try renewing it
+            renewable = self.held or self.unavailable
+            if renewable and self.client.eval(RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms):
+                self.held = True
+            else:
+                self.held = bool(self.client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+            self.unavailable = False
+        except redis.RedisError as e:
+            if not self.unavailable:
+                print(f"Lease {self.name} unavailable, skipping runs until Redis is back: {e}")
+            self.unavailable = True
+            self.held = False
+        return self.held
+
+    def release(self) -> None:
+        """Give up the lease if held."""
+        if not self.held:
+            return
+        self.held = False
+        try:
+            self.client.eval(RELEASE_SCRIPT, 1, self.key, self.token)
+        except redis.RedisError as e:
+            print(f"Error releasing lease {self.name}: {e}")
+
+
+class LocalLease:
+    """In-process lease used when Redis is not configured."""
+
+    _owners: Dict[str, Tuple[str, float]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, name: str, ttl_seconds: int):
+        """Initialize lease."""
+        self.name = name
+        self.token = uuid.uuid4().hex
+        self.ttl = ttl_seconds
+
+    @property
+    def held(self) -> bool:
+        """Whether this holder currently owns the lease."""
+        owner = self._owners.get(self.name)
+        return bool(owner and owner[0] == self.token and owner[1] > time.monotonic())
+
+    def acquire(self) -> bool:
+        """Take the lease, or renew it if already held. True while held."""
+        now = time.monotonic()
+        with self._lock:
+            owner = self._owners.get(self.name)
+            if owner is None or owner[0] == self.token or owner[1] <= now:
+                self._owners[self.name] = (self.token, now + self.ttl)
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give up the lease if held."""
+        with self._lock:
+            owner = self._owners.get(self.name)
+            if owner and owner[0] == self.token:
+                del self._owners[self.name]
+
+
+def create_lease(name: str, ttl_seconds: int, client: Optional[redis.Redis] = None) -> Lease:
+    """
+    Create a lease on Redis when it is configured, otherwise in-process.
+
+    Args:
+        name: Job the lease guards
+        ttl_seconds: How long the lease survives without renewal
+        client: Redis client (defaults to the configured one)
+
+    Returns:
+        Lease for the job
+    """
+    client = client or get_redis()
+    if client is None:
+        return LocalLease(name, ttl_seconds)
+    return RedisLease(client, name, ttl_seconds)
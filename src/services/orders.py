@@ -0,0 +1,121 @@
+"""Order read model service."""
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session, selectinload
+
+from src.models.order import Order
+from src.services.aggregator import PLATFORMS
+from src.services.filters import OrderFilter
+from src.services.pagination import OrderPosition
+
+
+def parse_order_id(order_id: str) -> Tuple[Optional[str], str]:
+    """
+    Split a ``platform:id`` order reference.
+
+    Args:
+        order_id: Plain platform order ID, or one qualified with its platform
+
+    Returns:
+        Platform (None if not encoded) and the platform order ID
+    """
+    platform, sep, platform_order_id = order_id.partition(":")
+    if sep and platform in PLATFORMS:
+        return platform, platform_order_id
+    return None, order_id
+
+
+class OrderService:
+    """Query orders persisted by the sync path."""
+
+    def __init__(self, db: Session):
+        """Initialize order service."""
+        self.db = db
+
+    def list_orders(
+        self,
+        platform: Optional[str] = None,
+        filters: Optional[OrderFilter] = None,
+        limit: int = 100,
+        after: Optional[OrderPosition] = None,
+    ) -> List[Order]:
+        """
+        List stored orders, newest first.
+
+        Paging uses a keyset predicate on ``(order_date, platform,
+        platform_order_id)`` rather than an offset, so every page costs the
+        same index range scan.
+
+        Args:
+            platform: Only orders from this platform
+            filters: Status and order date filters
+            limit: Max orders to return
+            after: Resume after this position (exclusive)
+
+        Returns:
+            Orders with their items loaded
+        """
+        query = self.db.query(Order).options(selectinload(Order.items))
+
+        if platform:
+            query = query.filter(Order.platform == platform)
+        if filters and filters.status:
+            query = query.filter(Order.status == filters.status)
+        if filters and filters.created_after:
+            query = query.filter(Order.order_date >= filters.created_after)
+        if filters and filters.created_before:
+            query = query.filter(Order.order_date <= filters.created_before)
+        if after:
+            query = query.filter(
+                tuple_(Order.order_date, Order.platform, Order.platform_order_id)
+                < tuple_(after.order_date, after.platform, after.order_id)
+            )
+
+        return (
+            query.order_by(
+                Order.order_date.desc(),
+                Order.platform.desc(),
+                Order.platform_order_id.desc(),
+            )
+            .limit(limit)
+            .all()
+        )
+
+    def get_order(self, order_id: str, platform: Optional[str] = None) -> Optional[Order]:
+        """
+        Get a stored order by its platform order ID.
+
+        With a platform this is a single probe of the unique
+        ``(platform, platform_order_id)`` index.
+
+        Args:
+            order_id: Platform-specific order ID
+            platform: Platform the order belongs to, if known
+
+        Returns:
+            Order or None if not found
+        """
+        query = (
+            self.db.query(Order)
+            .options(selectinload(Order.items))
+            .filter(Order.platform_order_id == order_id)
+        )
+        if platform:
+            query = query.filter(Order.platform == platform)
+        return query.first()
+
+    def count_by_platform(self) -> Dict[str, int]:
+        """
+        Count stored orders per platform with one grouped query.
+
+        Returns:
+            Dict of platform: order count
+        """
+        rows = (
+            self.db.query(Order.platform, func.count(Order.id))
+            .group_by(Order.platform)
+            .all()
+        )
+        return {platform: count for platform, count in rows}
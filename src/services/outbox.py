@@ -0,0 +1,274 @@
+"""Inventory outbox for debounced, batched platform pushes."""
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, case, delete, func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.db.database import SessionLocal, on_conflict_insert
+from src.models.product import InventoryOutbox
+from src.services.aggregator import OrderAggregator, get_aggregator
+
+settings = get_settings()
+
+# A claimed entry becomes due again after this long, in case the replica
+# pushing it dies before recording the outcome
+CLAIM_SECONDS = 60
+
+
+class InventoryOutboxService:
+    """Record inventory changes to push and track their delivery."""
+
+    def __init__(self, db: Session):
+        """Initialize outbox service."""
+        self.db = db
+
+    def enqueue(self, quantities: Dict[str, int], delay_seconds: Optional[float] = None) -> None:
+        """
+        Record the latest quantity of each SKU for pushing to the platforms.
+
+        A SKU already waiting keeps its place: the quantity is replaced, so
+        any number of edits inside the debounce window cost one push. The
+        caller owns the transaction, so the outbox row commits together with
+        the stock change it describes.
+
+        Args:
+            quantities: New quantity per SKU
+            delay_seconds: Debounce window (default from settings)
+        """
+        if not quantities:
+            return
+        if delay_seconds is None:
+            delay_seconds = settings.inventory_outbox_debounce_seconds
+        now = datetime.utcnow()
+        due = now + timedelta(seconds=delay_seconds)
+
+        outbox = InventoryOutbox.__table__
+        stmt = on_conflict_insert(self.db, outbox)
+        claimed = outbox.c.claimed_until > now
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sku"],
+            set_={
+                "quantity": stmt.excluded.quantity,
+                "version": outbox.c.version + 1,
+                "attempts": 0,
+                "last_error": None,
+                # An entry being pushed stays claimed until the push settles
+                # or its lease runs out, whichever comes first; otherwise keep
+                # an earlier due time, and a failing entry is rescheduled to
+                # go out with the new value
+                "next_attempt_at": case(
+                    (
+                        claimed & (outbox.c.claimed_until > stmt.excluded.next_attempt_at),
+                        outbox.c.claimed_until,
+                    ),
+                    (claimed, stmt.excluded.next_attempt_at),
+                    (
+                        (outbox.c.attempts == 0)
+                        & (outbox.c.next_attempt_at < stmt.excluded.next_attempt_at),
+                        outbox.c.next_attempt_at,
+                    ),
+                    else_=stmt.excluded.next_attempt_at,
+                ),
+                "updated_at": func.now(),
+            },
+        )
+        # Bound as an executemany so the statement compiles once and is cached
+        self.db.execute(stmt, [
+            {"sku": sku, "quantity": quantity, "version": 1, "attempts": 0, "next_attempt_at": due}
+            for sku, quantity in quantities.items()
+        ])
+
+    def claim(self, limit: int) -> List[Row]:
+        """
+        Claim due entries for pushing.
+
+        Claiming leases an entry and moves its due time past the push, so
+        concurrent flushers, in this process or another replica, never push
+        it twice, even when it changes while the push is in flight.
+
+        Args:
+            limit: Max entries to claim
+
+        Returns:
+            Claimed entries with sku, quantity, version, attempts and claimed_until
+        """
+        now = datetime.utcnow()
+        lease = now + timedelta(seconds=CLAIM_SECONDS)
+        due = (
+            select(InventoryOutbox.id)
+            .where(InventoryOutbox.next_attempt_at <= now)
+            .order_by(InventoryOutbox.next_attempt_at)
+            .limit(limit)
+        )
+        stmt = (
+            update(InventoryOutbox)
+            .where(InventoryOutbox.id.in_(due), InventoryOutbox.next_attempt_at <= now)
+            .values(next_attempt_at=lease, claimed_until=lease)
+            .returning(
+                InventoryOutbox.sku,
+                InventoryOutbox.quantity,
+                InventoryOutbox.version,
+                InventoryOutbox.attempts,
+                InventoryOutbox.claimed_until,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        entries = self.db.execute(stmt).all()
+        self.db.commit()
+        return entries
+
+    def settle(self, entries: List[Row], results: Dict[str, Dict[str, bool]]) -> None:
+        """
+        Record the outcome of pushing claimed entries.
+
+        Entries pushed to every platform are removed; the rest are retried
+        with exponential backoff. Entries changed since they were claimed are
+        released to go out right away, as their newer value was held back
+        while the push was in flight.
+
+        Args:
+            entries: Entries returned by :meth:`claim`
+            results: Success per platform, keyed by SKU
+        """
+        done = []
+        failed = []
+        now = datetime.utcnow()
+        for entry in entries:
+            platforms = [p for p, ok in results.get(entry.sku, {}).items() if not ok]
+            if not platforms and entry.sku in results:
+                done.append({"b_sku": entry.sku, "b_version": entry.version})
+                continue
+            delay = min(
+                settings.inventory_outbox_max_backoff_seconds,
+                settings.inventory_outbox_debounce_seconds * 2 ** (entry.attempts + 1),
+            )
+            failed.append({
+                "b_sku": entry.sku,
+                "b_version": entry.version,
+                "b_next_attempt_at": now + timedelta(seconds=delay),
+                "b_last_error": f"Failed on {', '.join(platforms) or 'all platforms'}",
+            })
+
+        outbox = InventoryOutbox.__table__
+        current = (outbox.c.sku == bindparam("b_sku")) & (outbox.c.version == bindparam("b_version"))
+        if done:
+            self.db.execute(delete(outbox).where(current), done)
+        if failed:
+            self.db.execute(
+                update(outbox)
+                .where(current)
+                .values(
+                    attempts=outbox.c.attempts + 1,
+                    next_attempt_at=bindparam("b_next_attempt_at"),
+                    claimed_until=None,
+                    last_error=bindparam("b_last_error"),
+                ),
+                failed,
+            )
+        # Whatever still holds this claim changed during the push
+        claims = [
+            {"b_sku": entry.sku, "b_claimed_until": entry.claimed_until}
+            for entry in entries
+        ]
+        if claims:
+            self.db.execute(
+                update(outbox)
+                .where(
+                    outbox.c.sku == bindparam("b_sku"),
+                    outbox.c.claimed_until == bindparam("b_claimed_until"),
+                )
+                .values(claimed_until=None, next_attempt_at=now),
+                claims,
+            )
+        self.db.commit()
+
+    def pending(self) -> int:
+        """Number of SKUs waiting to be pushed."""
+        return self.db.query(func.count(InventoryOutbox.id)).scalar()
+
+
+class InventoryOutboxFlusher:
+    """
+    Push outbox entries to the platforms in the background.
+
+    Every debounce window the flusher claims the due entries in batches and
+    pushes each batch with one bulk inventory sync, so a burst of edits to a
+    SKU becomes a single platform call per platform.
+    """
+
+    def __init__(
+        self,
+        aggregator: OrderAggregator,
+        batch_size: Optional[int] = None,
+        interval_seconds: Optional[float] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize flusher."""
+        self.aggregator = aggregator
+        self.batch_size = batch_size or settings.inventory_outbox_batch_size
+        self.interval = (
+            settings.inventory_outbox_debounce_seconds
+            if interval_seconds is None
+            else interval_seconds
+        )
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start flushing on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop flushing; unsent entries stay in the outbox."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def flush(self) -> int:
+        """
+        Push every due entry now.
+
+        Returns:
+            Number of SKUs pushed to every platform
+        """
+        pushed = 0
+        while True:
+            db = self.session_factory()
+            try:
+                service = InventoryOutboxService(db)
+                entries = service.claim(self.batch_size)
+                if not entries:
+                    break
+                results = self.aggregator.sync_inventory_bulk(
+                    {entry.sku: entry.quantity for entry in entries}
+                )
+                service.settle(entries, results)
+            finally:
+                db.close()
+
+            pushed += sum(all(results[entry.sku].values()) for entry in entries)
+            if len(entries) < self.batch_size:
+                break
+        return pushed
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                print(f"Error flushing inventory outbox: {e}")
+
+
+@lru_cache()
+def get_outbox_flusher() -> InventoryOutboxFlusher:
+    """Get the process-wide inventory outbox flusher."""
+    return InventoryOutboxFlusher(get_aggregator())
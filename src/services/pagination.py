@@ -0,0 +1,58 @@
+"""Keyset cursors for paging through orders."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, NamedTuple
+
+
+class OrderPosition(NamedTuple):
+    """Position of an order in the newest-first order list."""
+
+    order_date: datetime
+    platform: str
+    order_id: str
+
+    @classmethod
+    def of(cls, order: Dict[str, Any]) -> "OrderPosition":
+        """Position of an order in the unified platform format."""
+        return cls(
+            datetime.fromisoformat(order["order_date"]),
+            order["platform"],
+            str(order["id"]),
+        )
+
+
+def encode_cursor(position: OrderPosition) -> str:
+    """
+    Encode a position as an opaque cursor.
+
+    Args:
+        position: Last order returned on the current page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([position.order_date.isoformat(), position.platform, position.order_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> OrderPosition:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Position to resume after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        order_date, platform, order_id = json.loads(base64.urlsafe_b64decode(padded))
+        return OrderPosition(datetime.fromisoformat(order_date), platform, str(order_id))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,278 @@
+"""Per-platform adaptive rate limiting."""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from src.config import get_settings
+
+settings = get_settings()
+
+DAY = 24 * 60 * 60
+
+# (tokens per second, burst) buckets per platform and operation. Operations
+# without an entry share the platform's "default" limiter. A daily quota is
+# a bucket that refills over a day.
+PLATFORM_RATE_LIMITS: Dict[str, Dict[str, List[Tuple[float, int]]]] = {
+    # One leaky bucket per store for every REST call
+    "shopify": {
+        "default": [(2.0, 40)],
+    },
+    # SP-API limits each operation separately
+    "amazon": {
+        "get_orders": [(0.0167, 20)],
+        "get_order": [(0.5, 30)],
+        "update_order_status": [(2.0, 10)],
+        "sync_inventory": [(5.0, 10)],
+        "sync_inventory_bulk": [(0.0083, 15)],
+        "default": [(1.0, 5)],
+    },
+    "ebay": {
+        "default": [(5.0, 10), (100_000 / DAY, 5_000)],
+    },
+    "etsy": {
+        "default": [(10.0, 10), (10_000 / DAY, 1_000)],
+    },
+}
+
+
+class Priority(IntEnum):
+    """Queue priority of a platform call; lower runs first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class RateLimitError(Exception):
+    """Raised by a platform client when the platform throttles a call."""
+
+    def __init__(self, message: str = "Rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket refilled at a constant rate up to its burst size."""
+
+    def __init__(self, rate: float, burst: int):
+        """Initialize bucket, full."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        """Spend one token."""
+        self.tokens -= 1
+
+
+class AdaptiveLimiter:
+    """
+    Token-bucket limiter with an AIMD concurrency limit and a priority queue.
+
+    A call needs a token from every bucket and a free concurrency slot. The
+    concurrency limit halves whenever the platform throttles us and grows
+    back by about one slot per limit's worth of successful calls. Waiting
+    calls are granted in priority order, then in arrival order.
+    """
+
+    def __init__(
+        self,
+        buckets: List[TokenBucket],
+        max_concurrency: int,
+        min_concurrency: int = 1,
+    ):
+        """Initialize limiter."""
+        self.buckets = buckets
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def acquire(
+        self,
+        priority: Priority = Priority.INTERACTIVE,
+        cancel: Optional[threading.Event] = None,
+    ) -> bool:
+        """
+        Block until this call may run.
+
+        Args:
+            priority: Queue priority of the call
+            cancel: Gives up waiting once set (see :meth:`cancel`)
+
+        Returns:
+            True once the slot is held, False if cancelled first
+        """
+        with self._cond:
+            ticket = (int(priority), next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        self._queue.remove(ticket)
+                        heapq.heapify(self._queue)
+                        self._cond.notify_all()
+                        return False
+                    if self._queue[0] != ticket or self.in_flight >= int(self.limit):
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    wait = max(
+                        [self.paused_until - now] + [b.wait_time(now) for b in self.buckets]
+                    )
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            for bucket in self.buckets:
+                bucket.take()
+            self.in_flight += 1
+            self._cond.notify_all()
+            return True
+
+    def cancel(self, event: threading.Event) -> None:
+        """Stop the :meth:`acquire` waiting on ``event``."""
+        with self._cond:
+            event.set()
+            self._cond.notify_all()
+
+    def release(self, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """Finish a call, adapting the concurrency limit to its outcome."""
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self._decrease()
+                self.paused_until = max(
+                    self.paused_until, time.monotonic() + (1.0 if retry_after is None else retry_after)
+                )
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def slow_down(self) -> None:
+        """Back off because the platform reports its limit is nearly spent."""
+        with self._cond:
+            self._decrease()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.min_concurrency, self.limit / 2)
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.INTERACTIVE) -> Iterator[None]:
+        """Hold a slot for the duration of a call."""
+        self.acquire(priority)
+        try:
+            yield
+        except RateLimitError as e:
+            self.release(throttled=True, retry_after=e.retry_after)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, priority: Priority = Priority.INTERACTIVE):
+        """
+        Hold a slot for the duration of an async call.
+
+        The wait runs on a worker thread, which cannot be cancelled. If the
+        caller is cancelled while waiting, the wait is told to give up, and
+        a slot it had already won is handed straight back.
+        """
+        cancel = threading.Event()
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self.acquire, priority, cancel))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            self.cancel(cancel)
+            acquiring.add_done_callback(self._release_if_acquired)
+            raise
+        try:
+            yield
+        except RateLimitError as e:
+            self.release(throttled=True, retry_after=e.retry_after)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            self.release()
+
+    def _release_if_acquired(self, acquiring: "asyncio.Future[bool]") -> None:
+        if not acquiring.cancelled() and acquiring.exception() is None and acquiring.result():
+            self.release()
+
+
+def rate_limit_pressure(platform: str, headers: Mapping[str, str]) -> bool:
+    """
+    Whether a platform's response headers say its limit is nearly spent.
+
+    Args:
+        platform: Platform name (shopify, amazon, ebay, etsy)
+        headers: Response headers
+
+    Returns:
+        True if callers should slow down
+    """
+    try:
+        if platform == "shopify" and "X-Shopify-Shop-Api-Call-Limit" in headers:
+            used, size = headers["X-Shopify-Shop-Api-Call-Limit"].split("/")
+            return int(used) >= 0.8 * int(size)
+        if platform == "etsy" and "x-remaining-today" in headers:
+            return int(headers["x-remaining-today"]) < 0.1 * int(headers["x-limit-per-day"])
+    except (KeyError, ValueError):
+        return False
+    return False
+
+
+# One limiter per platform operation for the whole process, so every caller
+# draws from the same budget
+_limiters: Dict[Tuple[str, str], AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(platform: str, operation: str) -> AdaptiveLimiter:
+    """
+    Get the shared limiter for a platform operation.
+
+    Args:
+        platform: Platform name (shopify, amazon, ebay, etsy)
+        operation: Client method name, e.g. ``get_orders``
+
+    Returns:
+        Limiter for the operation, or the platform default
+    """
+    limits = PLATFORM_RATE_LIMITS[platform]
+    key = (platform, operation if operation in limits else "default")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = AdaptiveLimiter(
+                [TokenBucket(rate, burst) for rate, burst in limits[key[1]]],
+                max_concurrency=settings.rate_limit_max_concurrency,
+            )
+        return limiter
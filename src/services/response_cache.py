@@ -0,0 +1,119 @@
+"""Shared Redis cache for API responses."""
+
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+from src.config import get_settings
+from src.db.redis_client import get_redis
+
+settings = get_settings()
+
+
+def cache_key(name: str, params: Dict[str, Any]) -> str:
+    """
+    Build a cache key from an endpoint name and its query parameters.
+
+    Parameters are normalized so that the same query always maps to the same
+    key: unset values are dropped, keys are sorted and values stringified.
+
+    Args:
+        name: Endpoint the response belongs to
+        params: Query parameters of the request
+
+    Returns:
+        Cache key
+    """
+    normalized = {k: str(v) for k, v in sorted(params.items()) if v is not None}
+    digest = hashlib.sha1(json.dumps(normalized).encode()).hexdigest()
+    return f"{name}:{digest}"
+
+
+class ResponseCache:
+    """
+    Response cache shared by every worker through Redis.
+
+    Entries are stamped with the cache generation they were built in, and
+    :meth:`invalidate` bumps the generation when orders change. A response
+    computed before an invalidation but stored after it is therefore never
+    served. A hit costs a single ``MGET``. Without a Redis client the cache
+    is disabled and every lookup misses.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis],
+        ttl_seconds: int,
+        prefix: str = "orderhub:cache",
+    ):
+        """Initialize response cache."""
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.generation_key = f"{prefix}:generation"
+
+    @property
+    def enabled(self) -> bool:
+        """Whether responses are cached."""
+        return self.client is not None and self.ttl_seconds > 0
+
+    def get(self, key: str) -> Tuple[Optional[Any], int]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key of the response
+
+        Returns:
+            Cached response, or None on a miss, and the current generation
+            to pass to :meth:`set` when storing the response
+        """
+        if not self.enabled:
+            return None, 0
+        try:
+            value, generation = self.client.mget(f"{self.prefix}:{key}", self.generation_key)
+        except redis.RedisError as e:
+            print(f"Response cache unavailable: {e}")
+            return None, 0
+        generation = int(generation or 0)
+        if value is None:
+            return None, generation
+        entry = json.loads(value)
+        if entry["generation"] != generation:
+            return None, generation
+        return entry["value"], generation
+
+    def set(self, key: str, value: Any, generation: int) -> None:
+        """
+        Store a JSON-serializable response.
+
+        Args:
+            key: Cache key of the response
+            value: Response to store
+            generation: Generation returned by the :meth:`get` that missed
+        """
+        if not self.enabled:
+            return
+        entry = {"generation": generation, "value": value}
+        try:
+            self.client.set(f"{self.prefix}:{key}", json.dumps(entry), ex=self.ttl_seconds)
+        except redis.RedisError as e:
+            print(f"Error writing response cache: {e}")
+
+    def invalidate(self) -> None:
+        """Drop every cached response, including ones being built right now."""
+        if not self.enabled:
+            return
+        try:
+            self.client.incr(self.generation_key)
+        except redis.RedisError as e:
+            print(f"Error invalidating response cache: {e}")
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache."""
+    return ResponseCache(get_redis(), settings.response_cache_ttl_seconds)
@@ -0,0 +1,224 @@
+"""Retry and hedging policies for platform calls."""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, TimeoutError as FuturesTimeoutError, wait
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Deque, Optional
+
+import httpx
+
+from src.config import get_settings
+from src.services.breaker import CircuitOpenError, PlatformUnavailableError
+from src.services.ratelimit import RateLimitError
+
+settings = get_settings()
+
+# Failures worth another attempt; anything else (bad input, an open
+# circuit, a 4xx answer) fails the same way every time
+RETRYABLE_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    httpx.TransportError,
+    RateLimitError,
+    PlatformUnavailableError,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How a platform operation is retried and hedged."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    # Only reads are hedged; a duplicate write could apply twice
+    hedge: bool = False
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before the next attempt (exponential, full jitter)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if isinstance(error, RateLimitError) and error.retry_after:
+            delay = max(delay, min(self.max_delay, error.retry_after))
+        return delay
+
+
+# Reads and absolute inventory writes are idempotent. Status updates create
+# fulfillments on some platforms, so they are never repeated.
+DEFAULT_POLICIES = {
+    "get_orders": RetryPolicy(hedge=True),
+    "get_order": RetryPolicy(hedge=True),
+    "sync_inventory": RetryPolicy(),
+    "sync_inventory_bulk": RetryPolicy(),
+    "update_order_status": RetryPolicy(max_attempts=1),
+    "health_check": RetryPolicy(max_attempts=1),
+}
+
+
+def get_retry_policy(platform: str, operation: str) -> RetryPolicy:
+    """
+    Get the retry policy for a platform operation.
+
+    ``Settings.retry_policies`` overrides the defaults per operation
+    (``"get_orders"``) or per platform operation (``"ebay.get_orders"``).
+
+    Args:
+        platform: Platform name (shopify, amazon, ebay, etsy)
+        operation: Client method name, e.g. ``get_orders``
+
+    Returns:
+        Retry policy
+    """
+    policy = DEFAULT_POLICIES.get(operation, RetryPolicy(max_attempts=1))
+    for key in (operation, f"{platform}.{operation}"):
+        if key in settings.retry_policies:
+            policy = replace(policy, **settings.retry_policies[key])
+    return policy
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed call may succeed if attempted again."""
+    return isinstance(error, RETRYABLE_ERRORS) and not isinstance(error, CircuitOpenError)
+
+
+def call_with_retry(policy: RetryPolicy, fn: Callable[[], Any], name: str) -> Any:
+    """
+    Call ``fn``, retrying retryable failures with backoff.
+
+    Args:
+        policy: Retry policy of the operation
+        fn: Makes one attempt
+        name: Operation name for logging
+
+    Returns:
+        Result of the first successful attempt
+    """
+    attempt = 1
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.backoff(attempt, e)
+            print(f"Retrying {name} in {delay:.2f}s after attempt {attempt} failed: {e}")
+            time.sleep(delay)
+            attempt += 1
+
+
+async def acall_with_retry(
+    policy: RetryPolicy,
+    fn: Callable[[], Awaitable[Any]],
+    name: str,
+) -> Any:
+    """
+    Await ``fn``, retrying retryable failures with backoff.
+
+    Args:
+        policy: Retry policy of the operation
+        fn: Coroutine function making one attempt
+        name: Operation name for logging
+
+    Returns:
+        Result of the first successful attempt
+    """
+    attempt = 1
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.backoff(attempt, e)
+            print(f"Retrying {name} in {delay:.2f}s after attempt {attempt} failed: {e}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class LatencyTracker:
+    """Recent latencies of one platform operation."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        """Initialize tracker."""
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a successful call."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at quantile ``q``, or None until enough calls are seen."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def hedged_call(executor: Executor, fn: Callable[[], Any], hedge_after: float) -> Any:
+    """
+    Call ``fn``, starting a duplicate if it has not answered in time.
+
+    Args:
+        executor: Runs both attempts
+        fn: Makes one attempt; must be idempotent
+        hedge_after: Seconds to wait before sending the duplicate
+
+    Returns:
+        Result of whichever attempt succeeds first
+    """
+    first = executor.submit(fn)
+    try:
+        return first.result(timeout=hedge_after)
+    except FuturesTimeoutError:
+        pass
+
+    pending = {first, executor.submit(fn)}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def ahedged_call(fn: Callable[[], Awaitable[Any]], hedge_after: float) -> Any:
+    """
+    Await ``fn``, starting a duplicate if it has not answered in time.
+
+    Args:
+        fn: Coroutine function making one attempt; must be idempotent
+        hedge_after: Seconds to wait before sending the duplicate
+
+    Returns:
+        Result of whichever attempt succeeds first
+    """
+    tasks = {asyncio.ensure_future(fn())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            tasks.add(asyncio.ensure_future(fn()))
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,181 @@
+"""Background order sync scheduler."""
+
+import asyncio
+import random
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.db.database import SessionLocal
+from src.services.aggregator import PLATFORMS, OrderAggregator, get_aggregator
+from src.services.leases import Lease, create_lease
+from src.services.sync import OrderSyncService, PlatformSyncResult
+
+settings = get_settings()
+
+
+class SyncScheduler:
+    """
+    Periodically sync every platform in the background.
+
+    Each platform runs as its own job on a jittered interval, so platforms do
+    not hit their APIs in lockstep and a slow platform never delays another.
+    A platform's runs never overlap, and across replicas only the holder of
+    the platform's lease runs its job; the holder heartbeats the lease and
+    another replica takes over if it stops.
+    """
+
+    def __init__(
+        self,
+        aggregator: OrderAggregator,
+        interval_minutes: Optional[float] = None,
+        max_orders: Optional[int] = None,
+        jitter_ratio: Optional[float] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        lease_factory: Callable[[str, int], Lease] = create_lease,
+    ):
+        """Initialize scheduler."""
+        self.aggregator = aggregator
+        self.interval = 60 * (interval_minutes or settings.sync_interval_minutes)
+        self.max_orders = max_orders or settings.max_orders_per_sync
+        self.jitter_ratio = settings.sync_jitter_ratio if jitter_ratio is None else jitter_ratio
+        self.session_factory = session_factory
+        self.lease_ttl = settings.sync_lease_ttl_seconds
+        self.leases = {
+            platform: lease_factory(f"sync:{platform}", self.lease_ttl)
+            for platform in PLATFORMS
+        }
+        self._locks = {platform: threading.Lock() for platform in PLATFORMS}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self) -> None:
+        """Start one background job per platform on the running event loop."""
+        for platform in PLATFORMS:
+            if platform not in self._tasks:
+                self._tasks[platform] = asyncio.create_task(self._run(platform))
+                self._tasks[f"{platform}:heartbeat"] = asyncio.create_task(
+                    self._heartbeat(platform)
+                )
+
+    async def stop(self) -> None:
+        """Cancel all jobs and wait for them to finish."""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for lease in self.leases.values():
+            await asyncio.to_thread(lease.release)
+
+    def next_delay(self) -> float:
+        """Seconds until a platform's next run."""
+        jitter = self.interval * self.jitter_ratio
+        return max(0.0, self.interval + random.uniform(-jitter, jitter))
+
+    def run_once(self, platform: str) -> Optional[PlatformSyncResult]:
+        """
+        Sync one platform if this process leads it and no sync is running.
+
+        Args:
+            platform: Platform name (shopify, amazon, ebay, etsy)
+
+        Returns:
+            Sync result, or None if the run was skipped
+        """
+        if not self._claim(platform):
+            return None
+
+        try:
+            db = self.session_factory()
+            try:
+                return OrderSyncService(db, self.aggregator).sync_platform(
+                    platform, limit=self.max_orders
+                )
+            finally:
+                db.close()
+        finally:
+            self._unclaim(platform)
+
+    def run_now(
+        self,
+        platforms: Optional[List[str]] = None,
+        full: bool = False,
+    ) -> Dict[str, Optional[PlatformSyncResult]]:
+        """
+        Sync platforms on demand, e.g. for a manual sync request.
+
+        Each platform is claimed exactly like a scheduled :meth:`run_once`,
+        so a manual sync never overlaps a scheduled one or runs beside
+        another replica's leader. The claimed platforms are then synced
+        concurrently under the platform deadlines.
+
+        Args:
+            platforms: List of platforms to sync (None = all)
+            full: Ignore watermarks and refetch the recent window
+
+        Returns:
+            Sync result per platform, or None where the run was skipped
+        """
+        active_platforms = [p for p in PLATFORMS if p in (platforms or PLATFORMS)]
+        claimed = [platform for platform in active_platforms if self._claim(platform)]
+
+        results: Dict[str, PlatformSyncResult] = {}
+        try:
+            if claimed:
+                db = self.session_factory()
+                try:
+                    for result in OrderSyncService(db, self.aggregator).sync_all(
+                        claimed, limit=self.max_orders, full=full
+                    ):
+                        results[result.platform] = result
+                finally:
+                    db.close()
+        finally:
+            for platform in claimed:
+                self._unclaim(platform)
+
+        return {platform: results.get(platform) for platform in active_platforms}
+
+    def _claim(self, platform: str) -> bool:
+        """Take the platform's lease and run lock, or report it busy."""
+        if not self.leases[platform].acquire():
+            return False
+
+        if not self._locks[platform].acquire(blocking=False):
+            print(f"Skipping {platform} sync, previous run still in progress")
+            return False
+        return True
+
+    def _unclaim(self, platform: str) -> None:
+        self._locks[platform].release()
+        if not self._tasks:
+            # Nothing here renews the lease, so hand it back rather than
+            # block a scheduled leader elsewhere until it expires
+            self.leases[platform].release()
+
+    async def _run(self, platform: str) -> None:
+        # Spread the first runs out so platforms start out of phase
+        await asyncio.sleep(random.uniform(0, self.interval * self.jitter_ratio))
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once, platform)
+            except Exception as e:
+                print(f"Scheduled {platform} sync failed: {e}")
+            await asyncio.sleep(self.next_delay())
+
+    async def _heartbeat(self, platform: str) -> None:
+        # Renew well inside the TTL so a long sync never loses the lease,
+        # and keep trying to take it over while another replica holds it
+        lease = self.leases[platform]
+        while True:
+            await asyncio.to_thread(lease.acquire)
+            await asyncio.sleep(self.lease_ttl / 3)
+
+
+@lru_cache()
+def get_scheduler() -> SyncScheduler:
+    """Get the process-wide sync scheduler."""
+    return SyncScheduler(get_aggregator())
@@ -4,15 +4,31 @@ import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
+import httpx
+
 from src.config import get_settings
 from src.models.order import OrderStatus
+from src.services.base import AsyncClientBase, filter_demo_orders, platform_timestamp
 
 settings = get_settings()
 
+# Shopify order filters for each unified order status
+STATUS_FILTERS = {
+    "pending": {"financial_status": "pending"},
+    "processing": {"fulfillment_status": "unshipped"},
+    "shipped": {"fulfillment_status": "shipped"},
+    "delivered": {"fulfillment_status": "shipped"},
+    "cancelled": {"status": "cancelled"},
+    "refunded": {"financial_status": "refunded"},
+}
+
 
 class ShopifyClient:
     """Client for Shopify Admin API."""
 
+    # inventorySetQuantities takes up to 250 quantities per mutation
+    inventory_batch_size = 250
+
     def __init__(self, shop_url: str = "", access_token: str = ""):
         """Initialize Shopify client."""
         self.shop_url = shop_url or settings.shopify_shop_url
@@ -20,17 +36,38 @@ class ShopifyClient:
         self.api_version = settings.shopify_api_version
         self.demo_mode = settings.demo_mode or not (self.shop_url and self.access_token)
 
-    def get_orders(self, limit: int = 50, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Fetch orders from Shopify."""
+    def get_orders(
+        self,
+        limit: int = 50,
+        *,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch orders from Shopify, filtered at the source."""
         if self.demo_mode:
-            return self._get_demo_orders(limit)
+            return filter_demo_orders(
+                self._get_demo_orders(limit),
+                status=status,
+                created_after=created_after,
+                created_before=created_before,
+                updated_after=updated_after,
+            )
 
         # Real implementation would use Shopify API
         # import shopify
         # shopify.ShopifyResource.set_site(f"https://{self.shop_url}/admin/api/{self.api_version}")
         # shopify.Session.setup(api_key=settings.shopify_api_key, secret=settings.shopify_api_secret)
-        # orders = shopify.Order.find(limit=limit, status=status)
-        # return [self._format_order(order) for order in orders]
+        # orders = shopify.Order.find(
+        #     limit=limit,
+        #     status="any",
+        #     created_at_min=created_after,
+        #     created_at_max=created_before,
+        #     updated_at_min=updated_after,
+        #     **STATUS_FILTERS.get(status, {}),
+        # )
+        # return [self.format_order(order) for order in orders]
 
         return []
 
@@ -62,6 +99,75 @@ class ShopifyClient:
         # Real implementation would update inventory levels
         return False
 
+    def sync_inventory_bulk(self, quantities: Dict[str, int]) -> Dict[str, bool]:
+        """Sync many inventory quantities to Shopify in one mutation."""
+        if self.demo_mode:
+            return {sku: True for sku in quantities}
+
+        # Real implementation would use the inventorySetQuantities GraphQL mutation
+        return {sku: False for sku in quantities}
+
+    def format_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Shopify REST order (API or webhook payload) to the unified format."""
+        if order.get("cancelled_at"):
+            status = OrderStatus.CANCELLED
+        elif order.get("financial_status") == "refunded":
+            status = OrderStatus.REFUNDED
+        elif order.get("fulfillment_status") == "fulfilled":
+            status = OrderStatus.SHIPPED
+        elif order.get("financial_status") == "pending":
+            status = OrderStatus.PENDING
+        else:
+            status = OrderStatus.PROCESSING
+
+        customer = order.get("customer") or {}
+        address = order.get("shipping_address") or {}
+        name = " ".join(
+            part for part in [customer.get("first_name"), customer.get("last_name")] if part
+        )
+        fulfillment = (order.get("fulfillments") or [{}])[-1]
+
+        return {
+            "id": str(order["id"]),
+            "order_number": order.get("name"),
+            "platform": "shopify",
+            "status": status.value,
+            "order_date": platform_timestamp(order["created_at"]),
+            "updated_at": platform_timestamp(order.get("updated_at") or order["created_at"]),
+            "customer": {
+                "name": name or address.get("name") or "",
+                "email": order.get("email"),
+            },
+            "shipping_address": {
+                "line1": address.get("address1"),
+                "line2": address.get("address2"),
+                "city": address.get("city"),
+                "state": address.get("province_code"),
+                "postal_code": address.get("zip"),
+                "country": address.get("country_code"),
+            },
+            "items": [
+                {
+                    "sku": item.get("sku") or str(item.get("variant_id")),
+                    "name": item["title"],
+                    "quantity": item["quantity"],
+                    "unit_price": float(item["price"]),
+                    "total_price": float(item["price"]) * item["quantity"],
+                    "variant_title": item.get("variant_title"),
+                }
+                for item in order.get("line_items", [])
+            ],
+            "subtotal": float(order.get("subtotal_price") or 0),
+            "tax": float(order.get("total_tax") or 0),
+            "shipping_cost": sum(
+                float(line.get("price") or 0) for line in order.get("shipping_lines", [])
+            ),
+            "total": float(order.get("total_price") or 0),
+            "currency": order.get("currency") or "USD",
+            "tracking_number": fulfillment.get("tracking_number"),
+            "carrier": fulfillment.get("tracking_company"),
+        }
+
     def _get_demo_orders(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Generate demo orders for testing."""
         demo_orders = []
@@ -81,6 +187,8 @@ class ShopifyClient:
             status = random.choice(statuses)
 
             order_date = datetime.now() - timedelta(days=random.randint(0, 30))
+            # Orders keep changing after they are placed, e.g. when they ship
+            updated_at = min(datetime.now(), order_date + timedelta(hours=random.randint(0, 72)))
 
             order = {
                 "id": f"SHOP{1000 + i}",
@@ -88,6 +196,7 @@ class ShopifyClient:
                 "platform": "shopify",
                 "status": status.value,
                 "order_date": order_date.isoformat(),
+                "updated_at": updated_at.isoformat(),
                 "customer": {
                     "name": f"Customer {i + 1}",
                     "email": f"customer{i+1}@example.com",
@@ -120,6 +229,9 @@ class ShopifyClient:
 
             demo_orders.append(order)
 
+        # Platform APIs return orders newest first
+        demo_orders.sort(key=lambda o: o["order_date"], reverse=True)
+
         return demo_orders
 
     def health_check(self) -> bool:
@@ -129,3 +241,31 @@ class ShopifyClient:
 
         # Real implementation would test API connection
         return bool(self.shop_url and self.access_token)
+
+
+class AsyncShopifyClient(AsyncClientBase):
+    """Async client for Shopify Admin API."""
+
+    platform = "shopify"
+
+    def base_url(self) -> str:
+        """Shopify Admin API base URL."""
+        return f"https://{self.client.shop_url}/admin/api/{self.client.api_version}"
+
+    def headers(self) -> Dict[str, str]:
+        """Shopify access token header."""
+        return {"X-Shopify-Access-Token": self.client.access_token}
+
+    async def _fetch_orders(self, limit: int) -> List[Dict[str, Any]]:
+        # Real implementation would page through the REST orders endpoint
+        # response = await self.http.get("/orders.json", params={"limit": limit, "status": "any"})
+        # return [self.format_order(order) for order in response.json()["orders"]]
+        return []
+
+    async def _health_check(self) -> bool:
+        try:
+            response = await self.http.get("/shop.json")
+        except httpx.HTTPError:
+            return False
+        self._check_response(response, "health_check")
+        return response.status_code == 200
@@ -0,0 +1,209 @@
+"""Incremental order synchronization."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.models.platform import PlatformConnection, PlatformType
+from src.services.aggregator import PLATFORMS, OrderAggregator
+from src.services.base import order_updated_at
+from src.services.ingest import OrderIngestor
+from src.services.response_cache import ResponseCache, get_response_cache
+
+settings = get_settings()
+
+# Re-read a little before the watermark so clock skew between us and the
+# platform cannot hide an order. Writes are idempotent, so overlap is harmless.
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a timestamp to naive UTC for comparisons."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class PlatformSyncResult:
+    """Outcome of syncing one platform."""
+
+    platform: str
+    orders_synced: int = 0
+    success: bool = True
+    complete: bool = True
+    late: bool = False
+    error: Optional[str] = None
+
+
+class OrderSyncService:
+    """Sync orders from platforms into the local database."""
+
+    def __init__(
+        self,
+        db: Session,
+        aggregator: OrderAggregator,
+        cache: Optional[ResponseCache] = None,
+    ):
+        """Initialize sync service."""
+        self.db = db
+        self.aggregator = aggregator
+        self.cache = cache or get_response_cache()
+
+    def get_connection(self, platform: str) -> PlatformConnection:
+        """Get or create the sync bookkeeping row for a platform."""
+        platform_type = PlatformType(platform)
+        connection = (
+            self.db.query(PlatformConnection)
+            .filter(PlatformConnection.platform_type == platform_type)
+            .first()
+        )
+        if not connection:
+            connection = PlatformConnection(
+                platform_type=platform_type,
+                credentials="{}",
+                orders_synced=0,
+            )
+            self.db.add(connection)
+            self.db.flush()
+        return connection
+
+    def sync_platform(
+        self,
+        platform: str,
+        limit: Optional[int] = None,
+        full: bool = False,
+    ) -> PlatformSyncResult:
+        """
+        Fetch orders changed since the platform's watermark and store them.
+
+        Args:
+            platform: Platform name (shopify, amazon, ebay, etsy)
+            limit: Max orders to fetch this cycle
+            full: Ignore the watermark and refetch the recent window
+
+        Returns:
+            Sync result for the platform
+        """
+        limit = limit or settings.max_orders_per_sync
+        started_at = datetime.utcnow()
+        since = self._since(platform, started_at, full)
+
+        try:
+            orders = self.aggregator.fetch_platform_orders(
+                platform, limit=limit, updated_after=since
+            )
+        except Exception as e:
+            print(f"Error syncing {platform} orders: {e}")
+            return self._record_error(platform, str(e))
+        return self._store(platform, orders, limit, started_at)
+
+    def sync_all(
+        self,
+        platforms: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        full: bool = False,
+    ) -> List[PlatformSyncResult]:
+        """
+        Sync every requested platform.
+
+        Platforms are fetched concurrently, each on its own bulkhead and
+        under the platform deadlines; a platform that misses its deadline is
+        reported as late and keeps its watermark. The pages that arrived are
+        then stored one platform at a time.
+
+        Args:
+            platforms: List of platforms to sync (None = all)
+            limit: Max orders to fetch per platform
+            full: Ignore watermarks and refetch the recent window
+
+        Returns:
+            Sync result per platform
+        """
+        limit = limit or settings.max_orders_per_sync
+        active_platforms = [p for p in PLATFORMS if p in (platforms or PLATFORMS)]
+        started_at = datetime.utcnow()
+        since = {
+            platform: self._since(platform, started_at, full)
+            for platform in active_platforms
+        }
+        # Release the read transaction before waiting on the platforms
+        self.db.commit()
+
+        fetched = self.aggregator.fetch_changed_orders(since, limit=limit)
+
+        results = []
+        for platform in active_platforms:
+            if platform in fetched.orders:
+                results.append(
+                    self._store(platform, fetched.orders[platform], limit, started_at)
+                )
+            elif platform in fetched.late_platforms:
+                result = self._record_error(platform, "Missed its deadline")
+                result.late = True
+                results.append(result)
+            else:
+                results.append(self._record_error(platform, fetched.errors[platform]))
+        return results
+
+    def _since(self, platform: str, started_at: datetime, full: bool) -> datetime:
+        """Point to fetch a platform's changes from."""
+        connection = self.get_connection(platform)
+        watermark = None if full else _as_naive_utc(connection.last_sync_at)
+        if watermark is None:
+            # First or full sync: walk the backfill window oldest change
+            # first, so a capped run can resume where it stopped
+            return started_at - timedelta(days=settings.sync_backfill_days)
+        if connection.last_sync_status == "partial":
+            # Resuming a capped run from a platform timestamp; no skew
+            return watermark
+        return watermark - WATERMARK_OVERLAP
+
+    def _store(
+        self,
+        platform: str,
+        orders: List[Dict[str, Any]],
+        limit: int,
+        started_at: datetime,
+    ) -> PlatformSyncResult:
+        """Store a fetched page and move the platform's watermark past it."""
+        try:
+            OrderIngestor(self.db).upsert(orders)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error syncing {platform} orders: {e}")
+            return self._record_error(platform, str(e))
+        if orders:
+            self.cache.invalidate()
+
+        # The orders are committed, so the watermark can move. A capped page
+        # is oldest change first, so resume from the newest change on it;
+        # otherwise everything up to the start of this fetch has been seen.
+        connection = self.get_connection(platform)
+        complete = len(orders) < limit
+        if complete:
+            connection.last_sync_at = started_at
+        else:
+            connection.last_sync_at = max(order_updated_at(order) for order in orders)
+        connection.last_sync_status = "success" if complete else "partial"
+        connection.last_error = None
+        connection.orders_synced = (connection.orders_synced or 0) + len(orders)
+        self.db.commit()
+
+        return PlatformSyncResult(
+            platform=platform,
+            orders_synced=len(orders),
+            complete=complete,
+        )
+
+    def _record_error(self, platform: str, error: str) -> PlatformSyncResult:
+        """Record a failed sync, keeping the platform's watermark."""
+        connection = self.get_connection(platform)
+        connection.last_sync_status = "error"
+        connection.last_error = error
+        self.db.commit()
+        return PlatformSyncResult(platform=platform, success=False, error=error)
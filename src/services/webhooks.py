@@ -0,0 +1,266 @@
+"""Webhook verification and queued ingestion."""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.db.database import SessionLocal
+from src.services.aggregator import OrderAggregator, get_aggregator
+from src.services.ingest import OrderIngestor
+from src.services.response_cache import get_response_cache
+
+settings = get_settings()
+
+# Reject replayed Etsy deliveries older than this
+ETSY_TIMESTAMP_TOLERANCE = 5 * 60
+
+# Backoff between attempts to store a batch while the database is down
+WRITE_RETRY_SECONDS = 1.0
+WRITE_RETRY_MAX_SECONDS = 60.0
+
+
+def verify_shopify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Check a Shopify webhook's ``X-Shopify-Hmac-Sha256`` header.
+
+    Args:
+        body: Raw request body
+        signature: Base64 HMAC-SHA256 of the body
+        secret: App's webhook signing secret
+
+    Returns:
+        True if the signature matches
+    """
+    if not secret or not signature:
+        return False
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode(), signature)
+
+
+def verify_etsy_signature(body: bytes, headers: Mapping[str, str], secret: str) -> bool:
+    """
+    Check an Etsy webhook's ``webhook-signature`` header.
+
+    Etsy signs ``{webhook-id}.{webhook-timestamp}.{body}`` with HMAC-SHA256
+    using the base64 secret after its ``whsec_`` prefix.
+
+    Args:
+        body: Raw request body
+        headers: Request headers
+        secret: Webhook signing secret
+
+    Returns:
+        True if one of the signatures matches and the delivery is recent
+    """
+    webhook_id = headers.get("webhook-id")
+    timestamp = headers.get("webhook-timestamp")
+    signatures = headers.get("webhook-signature")
+    if not (secret and webhook_id and timestamp and signatures):
+        return False
+    try:
+        if abs(time.time() - int(timestamp)) > ETSY_TIMESTAMP_TOLERANCE:
+            return False
+        key = base64.b64decode(secret.removeprefix("whsec_"))
+    except ValueError:
+        return False
+
+    signed = f"{webhook_id}.{timestamp}.".encode() + body
+    expected = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+    return any(
+        hmac.compare_digest(expected, candidate.partition(",")[2])
+        for candidate in signatures.split()
+    )
+
+
+@dataclass
+class WebhookEvent:
+    """A verified webhook delivery waiting to be stored."""
+
+    platform: str
+    topic: str
+    payload: Dict[str, Any]
+
+
+def _order_reference(event: WebhookEvent) -> Optional[str]:
+    """ID of the order an event refers to when it carries no order body."""
+    payload = event.payload
+    reference = payload.get("receipt_id") or payload.get("id")
+    if reference is None and payload.get("resource_url"):
+        reference = payload["resource_url"].rstrip("/").rsplit("/", 1)[-1]
+    return str(reference) if reference is not None else None
+
+
+class WebhookConsumer:
+    """
+    Drain queued webhook events into the database in batches.
+
+    Receivers only verify and enqueue, so platforms get their ``200`` at
+    once. The consumer collects up to ``batch_size`` events, waiting at most
+    ``flush_seconds`` after the first, normalizes them with each platform's
+    order formatter and writes the batch with a single upsert.
+
+    Events are already acknowledged, so a batch is never dropped: while the
+    database is unreachable it is retried with backoff, and the full queue
+    makes receivers ask the platforms to redeliver instead. A batch the
+    database rejects is written one order at a time, so only the orders it
+    cannot store are lost.
+    """
+
+    def __init__(
+        self,
+        aggregator: OrderAggregator,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize consumer."""
+        self.aggregator = aggregator
+        self.queue: "asyncio.Queue[WebhookEvent]" = asyncio.Queue(
+            maxsize=queue_size or settings.webhook_queue_size
+        )
+        self.batch_size = batch_size or settings.webhook_batch_size
+        self.flush_seconds = (
+            settings.webhook_flush_seconds if flush_seconds is None else flush_seconds
+        )
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, event: WebhookEvent) -> bool:
+        """Queue an event; False if the queue is full."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            print(f"Webhook queue full, rejecting {event.platform} {event.topic}")
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start draining the queue on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the consumer and store whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Store every queued event now.
+
+        Returns:
+            Number of orders written
+        """
+        written = 0
+        while not self.queue.empty():
+            batch = []
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            written += await self._process(batch)
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._store(batch)
+
+    async def _process(self, batch: List[WebhookEvent]) -> int:
+        orders = await self._resolve_all(batch)
+        if not orders:
+            return 0
+        return await asyncio.to_thread(self._write, orders)
+
+    async def _store(self, batch: List[WebhookEvent]) -> int:
+        """Store a batch, waiting out database outages."""
+        return await self._write_retrying(await self._resolve_all(batch))
+
+    async def _write_retrying(self, orders: List[Dict[str, Any]]) -> int:
+        delay = WRITE_RETRY_SECONDS
+        while orders:
+            try:
+                return await asyncio.to_thread(self._write, orders)
+            except OperationalError as e:
+                print(f"Database unavailable storing webhook orders, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, WRITE_RETRY_MAX_SECONDS)
+            except Exception as e:
+                if len(orders) == 1:
+                    print(f"Dropping {orders[0]['platform']} order {orders[0]['id']} from webhook: {e}")
+                    return 0
+                print(f"Error storing webhook batch, storing its orders one by one: {e}")
+                written = 0
+                for order in orders:
+                    written += await self._write_retrying([order])
+                return written
+        return 0
+
+    async def _resolve_all(self, batch: List[WebhookEvent]) -> List[Dict[str, Any]]:
+        orders = []
+        for event in batch:
+            order = await self._resolve(event)
+            if order:
+                orders.append(order)
+        return orders
+
+    async def _resolve(self, event: WebhookEvent) -> Optional[Dict[str, Any]]:
+        """Unified order for an event, fetching it if only referenced."""
+        client = self.aggregator.clients[event.platform]
+        try:
+            return client.format_order(event.payload)
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        # Thin events name the order but do not carry it
+        order_id = _order_reference(event)
+        if order_id is None:
+            print(f"Ignoring {event.platform} {event.topic} webhook without an order")
+            return None
+        try:
+            return await self.aggregator.fetch_order(event.platform, order_id, fresh=True)
+        except Exception as e:
+            print(f"Error fetching {event.platform} order {order_id} for webhook: {e}")
+            return None
+
+    def _write(self, orders: List[Dict[str, Any]]) -> int:
+        db = self.session_factory()
+        try:
+            written = OrderIngestor(db).upsert(orders)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        get_response_cache().invalidate()
+        for platform in {order["platform"] for order in orders}:
+            self.aggregator.invalidate(platform)
+        return written
+
+
+@lru_cache()
+def get_webhook_consumer() -> WebhookConsumer:
+    """Get the process-wide webhook consumer."""
+    return WebhookConsumer(get_aggregator())
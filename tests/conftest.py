@@ -0,0 +1,34 @@
+"""Shared test configuration."""
+
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before any src module builds
+# its engine from settings.
+_db_dir = tempfile.mkdtemp(prefix="orderhub-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'orderhub.db')}"
+os.environ["DEBUG"] = "false"
+os.environ["REDIS_URL"] = ""
+
+import pytest  # noqa: E402
+
+from src.db.database import SessionLocal, init_db  # noqa: E402
+from src.services.aggregator import OrderAggregator  # noqa: E402
+from src.services.ingest import OrderIngestor  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create all tables and load demo orders into the read model."""
+    init_db()
+
+    aggregator = OrderAggregator()
+    db = SessionLocal()
+    try:
+        OrderIngestor(db).upsert(aggregator.get_all_orders())
+        db.commit()
+    finally:
+        db.close()
+        aggregator.close()
+
+    yield
@@ -0,0 +1,268 @@
+"""Tests for response caching."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.aggregator import OrderAggregator, get_aggregator
+from src.services.cache import TTLCache
+from src.services.response_cache import ResponseCache, cache_key, get_response_cache
+
+client = TestClient(app)
+
+
+class FakeRedis:
+    """Just enough of redis-py for the response cache."""
+
+    def __init__(self):
+        self.values = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.values.get(key)
+
+    def mget(self, *keys):
+        self.gets += 1
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+class TestResponseCache:
+    """Test the shared response cache."""
+
+    def setup_method(self):
+        self.redis = FakeRedis()
+        self.cache = ResponseCache(self.redis, ttl_seconds=30)
+        app.dependency_overrides[get_response_cache] = lambda: self.cache
+
+    def teardown_method(self):
+        app.dependency_overrides.pop(get_response_cache, None)
+
+    def test_cache_key_normalizes_params(self):
+        """Test equivalent queries share a key."""
+        first = cache_key("orders", {"limit": 10, "platform": "shopify", "status": None})
+        second = cache_key("orders", {"platform": "shopify", "limit": "10"})
+
+        assert first == second
+        assert first != cache_key("orders", {"platform": "etsy", "limit": 10})
+
+    def test_disabled_without_redis(self):
+        """Test the cache is a no-op when Redis is not configured."""
+        cache = ResponseCache(None, ttl_seconds=30)
+        cache.set("orders:x", [1], 0)
+
+        assert not cache.enabled
+        assert cache.get("orders:x") == (None, 0)
+
+    def test_repeated_list_served_from_cache(self):
+        """Test an identical list request is answered by one cache read."""
+        first = client.get("/api/orders?limit=5")
+        stored = len(self.redis.values)
+        second = client.get("/api/orders?limit=5")
+
+        assert stored == 1
+        assert second.json() == first.json()
+        assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+    def test_update_invalidates_cached_lists(self):
+        """Test changing an order drops cached responses."""
+        order_id = client.get("/api/orders?platform=amazon&limit=1").json()[0]["id"]
+        client.get("/api/platforms")
+        assert len(self.redis.values) == 2
+
+        response = client.patch(f"/api/orders/{order_id}", json={"carrier": "UPS"})
+        assert response.status_code == 200
+        assert self.cache.get(cache_key("platform_counts", {}))[0] is None
+
+        data = client.get("/api/orders?platform=amazon&limit=1").json()
+        assert data[0]["carrier"] == "UPS"
+
+    def test_page_built_before_invalidation_is_not_served(self):
+        """Test a response stored after an invalidation it raced with is a miss."""
+        cached, generation = self.cache.get("orders:x")
+        assert cached is None
+
+        self.cache.invalidate()
+        self.cache.set("orders:x", ["stale"], generation)
+
+        assert self.cache.get("orders:x") == (None, generation + 1)
+        self.cache.set("orders:x", ["fresh"], generation + 1)
+        assert self.cache.get("orders:x") == (["fresh"], generation + 1)
+
+    def test_platform_health_is_not_cached(self):
+        """Test cached order counts are served with live breaker state."""
+        aggregator = get_aggregator()
+        breaker = aggregator.breakers["etsy"]
+        assert client.get("/api/platforms").json()["platforms"][3]["connected"]
+
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure("etsy is down")
+        try:
+            platforms = client.get("/api/platforms").json()["platforms"]
+        finally:
+            breaker.record_success()
+
+        assert self.redis.gets == 2
+        assert platforms[3]["type"] == "etsy"
+        assert not platforms[3]["connected"]
+        assert platforms[3]["orders_count"] > 0
+
+
+class TestTTLCache:
+    """Test the in-process platform read cache."""
+
+    def test_hits_within_ttl(self):
+        """Test a repeated read within the TTL skips the loader."""
+        cache = TTLCache(max_size=10, ttl_seconds=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get_or_load("page", loader) == 1
+        assert cache.get_or_load("page", loader) == 1
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_least_recently_used_evicted(self):
+        """Test the size limit evicts the least recently used entry."""
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get_or_load("a", lambda: None)
+        cache.set("c", 3)
+
+        assert cache.get_or_load("a", lambda: None) == 1
+        assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+        assert cache.stats()["evictions"] == 2
+
+    def test_stale_value_served_while_refreshing(self):
+        """Test an expired entry is served at once and refreshed behind it."""
+        import threading
+
+        cache = TTLCache(max_size=10, ttl_seconds=0.01, stale_seconds=60)
+        cache.set("page", "old")
+        time.sleep(0.02)
+
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return "new"
+
+        assert cache.get_or_load("page", loader) == "old"
+        assert refreshed.wait(1)
+        time.sleep(0.01)
+        assert cache.stats()["stale_hits"] == 1
+        assert cache._entries["page"][0] == "new"
+
+    def test_aggregator_reuses_platform_pages(self):
+        """Test the aggregator asks a platform once for a repeated page."""
+        aggregator = OrderAggregator()
+        calls = []
+        original = aggregator.shopify.get_orders
+
+        def recording_get_orders(**kwargs):
+            calls.append(kwargs)
+            return original(**kwargs)
+
+        aggregator.shopify.get_orders = recording_get_orders
+        try:
+            first = aggregator.fetch_orders(platforms=["shopify"], limit=5)
+            second = aggregator.fetch_orders(platforms=["shopify"], limit=5)
+        finally:
+            aggregator.close()
+
+        assert len(calls) == 1
+        assert first.orders == second.orders
+        assert aggregator.cache_stats()["shopify"]["hits"] == 1
+
+    def test_cache_stats_endpoint(self):
+        """Test GET /api/platforms/cache/stats reports every platform."""
+        response = client.get("/api/platforms/cache/stats")
+        assert response.status_code == 200
+        assert set(response.json()) == {
+            "shopify", "amazon", "ebay", "etsy", "single_flight", "bulkheads"
+        }
+        assert "hits" in response.json()["shopify"]
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical fetches."""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test callers arriving during a call wait for it instead of repeating it."""
+        import threading
+
+        from src.services.singleflight import SingleFlight
+
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return ["order"]
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("k", fetch)))
+        leader.start()
+        started.wait(1)
+        followers = [
+            threading.Thread(target=lambda: results.append(flights.do("k", fetch)))
+            for _ in range(5)
+        ]
+        for thread in followers:
+            thread.start()
+        while flights.shared < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(1)
+
+        assert len(calls) == 1
+        assert results == [["order"]] * 6
+        assert flights.do("k", fetch) == ["order"]
+        assert len(calls) == 2
+
+    def test_errors_reach_every_waiter(self):
+        """Test a failed call raises for every caller and is not remembered."""
+        import asyncio
+
+        import pytest
+
+        from src.services.singleflight import SingleFlight
+
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("platform down")
+
+        async def run():
+            return await asyncio.gather(
+                *(flights.ado("k", fetch) for _ in range(3)), return_exceptions=True
+            )
+
+        errors = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(isinstance(e, RuntimeError) for e in errors)
+        with pytest.raises(RuntimeError):
+            asyncio.run(flights.ado("k", fetch))
+        assert len(calls) == 2
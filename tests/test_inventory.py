@@ -0,0 +1,482 @@
+"""Tests for inventory management."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.db.database import SessionLocal
+from src.main import app
+from src.config import get_settings
+from src.models.product import InventoryLog, InventoryOutbox, Product
+from src.services.aggregator import OrderAggregator
+from src.services.inventory import InventoryService
+from src.services.inventory_import import InventoryImporter
+from src.services.outbox import InventoryOutboxFlusher, InventoryOutboxService
+
+client = TestClient(app)
+settings = get_settings()
+
+
+class TestInventoryService:
+    """Test atomic stock changes."""
+
+    def setup_method(self):
+        self.db = SessionLocal()
+        self.db.add(Product(sku="TEST-INV-001", name="Test Widget", quantity_available=10))
+        self.db.add(Product(sku="TEST-INV-002", name="Test Gadget", quantity_available=2))
+        self.db.commit()
+        self.service = InventoryService(self.db)
+
+    def teardown_method(self):
+        self.db.query(InventoryLog).filter(InventoryLog.sku.like("TEST-INV-%")).delete()
+        self.db.query(Product).filter(Product.sku.like("TEST-INV-%")).delete()
+        self.db.commit()
+        self.db.close()
+
+    def latest_log(self):
+        return (
+            self.db.query(InventoryLog)
+            .filter(InventoryLog.sku == "TEST-INV-001")
+            .order_by(InventoryLog.id.desc())
+            .first()
+        )
+
+    def test_update_quantity_logs_change(self):
+        """Test a change is applied and logged with exact before/after."""
+        product = self.service.update_quantity("TEST-INV-001", -3, "sale", platform="shopify")
+
+        assert product.quantity_available == 7
+        log = self.latest_log()
+        assert (log.quantity_before, log.quantity_after, log.quantity_change) == (10, 7, -3)
+        assert log.platform == "shopify"
+
+    def test_update_quantity_clamps_at_zero(self):
+        """Test overselling stops at zero and logs the real starting stock."""
+        product = self.service.update_quantity("TEST-INV-001", -15, "sale")
+
+        assert product.quantity_available == 0
+        log = self.latest_log()
+        assert (log.quantity_before, log.quantity_after) == (10, 0)
+
+    def test_set_quantity(self):
+        """Test an absolute update logs the difference."""
+        product = self.service.set_quantity("TEST-INV-001", 25, "adjustment")
+
+        assert product.quantity_available == 25
+        assert self.latest_log().quantity_change == 15
+        assert self.service.set_quantity("TEST-INV-MISSING", 5, "adjustment") is None
+        with pytest.raises(ValueError):
+            self.service.set_quantity("TEST-INV-001", -1, "adjustment")
+
+    def test_reserve_and_release(self):
+        """Test reservations move stock and refuse to oversell."""
+        assert self.service.reserve_inventory("TEST-INV-001", 4, order_id=1)
+        assert not self.service.reserve_inventory("TEST-INV-001", 7, order_id=2)
+        assert not self.service.reserve_inventory("TEST-INV-MISSING", 1, order_id=3)
+
+        product = self.service.get_product("TEST-INV-001")
+        assert (product.quantity_available, product.quantity_reserved) == (6, 4)
+
+        assert self.service.release_reservation("TEST-INV-001", 5, order_id=1)
+        self.db.refresh(product)
+        assert (product.quantity_available, product.quantity_reserved) == (11, 0)
+        assert self.latest_log().quantity_before == 6
+
+    def test_concurrent_reservations_never_oversell(self):
+        """Test racing reservations on one SKU reserve exactly the stock."""
+
+        def reserve(order_id):
+            db = SessionLocal()
+            try:
+                return InventoryService(db).reserve_inventory("TEST-INV-001", 1, order_id)
+            finally:
+                db.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(reserve, range(25)))
+
+        assert results.count(True) == 10
+        product = self.service.get_product("TEST-INV-001")
+        self.db.refresh(product)
+        assert (product.quantity_available, product.quantity_reserved) == (0, 10)
+
+    def test_reserve_orders_all_or_nothing(self):
+        """Test a batch reserves whole orders and skips ones that do not fit."""
+        results = self.service.reserve_orders({
+            1: [{"sku": "TEST-INV-001", "quantity": 3}, {"sku": "TEST-INV-002", "quantity": 1}],
+            2: [{"sku": "TEST-INV-001", "quantity": 2}, {"sku": "TEST-INV-002", "quantity": 2}],
+            3: [{"sku": "TEST-INV-001", "quantity": 1}, {"sku": "TEST-INV-001", "quantity": 1}],
+            4: [{"sku": "TEST-INV-MISSING", "quantity": 1}],
+        })
+
+        assert results == {1: True, 2: False, 3: True, 4: False}
+        stock = {
+            p.sku: (p.quantity_available, p.quantity_reserved)
+            for p in self.db.query(Product).filter(Product.sku.like("TEST-INV-%"))
+        }
+        assert stock == {"TEST-INV-001": (5, 5), "TEST-INV-002": (1, 1)}
+
+        logs = (
+            self.db.query(InventoryLog)
+            .filter(InventoryLog.sku == "TEST-INV-001", InventoryLog.order_id == 3)
+            .one()
+        )
+        assert (logs.quantity_before, logs.quantity_after) == (7, 5)
+
+    def test_reservation_endpoint(self):
+        """Test the API reserves an order or answers 409."""
+        order = {"order_id": 9, "items": [{"sku": "TEST-INV-002", "quantity": 2}]}
+
+        assert client.post("/api/inventory/reservations", json=order).status_code == 201
+        assert client.post("/api/inventory/reservations", json=order).status_code == 409
+
+    def test_patch_sets_quantity(self):
+        """Test the API sets an absolute quantity."""
+        response = client.patch(
+            "/api/inventory/TEST-INV-001",
+            json={"quantity": 3, "sync_platforms": False},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["quantity_available"] == 3
+        assert client.patch(
+            "/api/inventory/TEST-INV-MISSING",
+            json={"quantity": 3, "sync_platforms": False},
+        ).status_code == 404
+        assert client.patch(
+            "/api/inventory/TEST-INV-001",
+            json={"quantity": -1, "sync_platforms": False},
+        ).status_code == 422
+
+
+class TestBulkInventorySync:
+    """Test batched multi-SKU inventory pushes."""
+
+    def setup_method(self):
+        self.aggregator = OrderAggregator()
+        self.quantities = {f"TEST-BULK-{i:03d}": i for i in range(60)}
+
+    def teardown_method(self):
+        self.aggregator.close()
+
+    def test_chunks_by_platform_batch_size(self):
+        """Test each platform gets batches sized for its endpoint."""
+        calls = {"shopify": [], "ebay": [], "etsy": []}
+        for platform in ("shopify", "ebay"):
+            client = self.aggregator.clients[platform]
+            original = client.sync_inventory_bulk
+
+            def recording(quantities, platform=platform, original=original):
+                calls[platform].append(len(quantities))
+                return original(quantities)
+
+            client.sync_inventory_bulk = recording
+        etsy_original = self.aggregator.etsy.sync_inventory
+
+        def etsy_recording(sku, quantity):
+            calls["etsy"].append(1)
+            return etsy_original(sku, quantity)
+
+        self.aggregator.etsy.sync_inventory = etsy_recording
+
+        results = self.aggregator.sync_inventory_bulk(self.quantities)
+
+        assert calls == {"shopify": [60], "ebay": [25, 25, 10], "etsy": [1] * 60}
+        assert len(results) == 60
+        assert all(
+            platforms == {"shopify": True, "amazon": True, "ebay": True, "etsy": True}
+            for platforms in results.values()
+        )
+
+    def test_failed_chunk_fails_only_its_skus(self):
+        """Test one failing batch leaves other batches and platforms synced."""
+        original = self.aggregator.ebay.sync_inventory_bulk
+
+        def failing(quantities):
+            if "TEST-BULK-030" in quantities:
+                raise ValueError("Rejected by eBay")
+            return original(quantities)
+
+        self.aggregator.ebay.sync_inventory_bulk = failing
+
+        results = self.aggregator.sync_inventory_bulk(self.quantities, platforms=["ebay", "shopify"])
+
+        failed = sorted(sku for sku, platforms in results.items() if not platforms["ebay"])
+        assert failed == [f"TEST-BULK-{i:03d}" for i in range(25, 50)]
+        assert all(platforms["shopify"] for platforms in results.values())
+        assert set(results["TEST-BULK-000"]) == {"shopify", "ebay"}
+
+    def test_late_platform_fails_its_skus(self):
+        """Test a platform that misses its deadline is not waited on."""
+        import threading
+        import time
+
+        hang = threading.Event()
+        self.aggregator.ebay.sync_inventory_bulk = lambda quantities: hang.wait(2) and {}
+        try:
+            started = time.monotonic()
+            results = self.aggregator.sync_inventory_bulk(
+                self.quantities, platforms=["ebay", "shopify"], platform_timeouts={"ebay": 0.05}
+            )
+            elapsed = time.monotonic() - started
+        finally:
+            hang.set()
+
+        assert elapsed < 1
+        assert not any(platforms["ebay"] for platforms in results.values())
+        assert all(platforms["shopify"] for platforms in results.values())
+
+    def test_late_platform_keeps_finished_chunks(self):
+        """Test chunks pushed before the deadline report success and later ones never start."""
+        import threading
+        import time
+
+        hang = threading.Event()
+        calls = []
+        original = self.aggregator.ebay.sync_inventory_bulk
+
+        def slow_second_chunk(quantities):
+            calls.append(len(quantities))
+            if len(calls) == 2:
+                hang.wait(2)
+            return original(quantities)
+
+        self.aggregator.ebay.sync_inventory_bulk = slow_second_chunk
+        try:
+            results = self.aggregator.sync_inventory_bulk(
+                self.quantities, platforms=["ebay"], platform_timeouts={"ebay": 0.1}
+            )
+        finally:
+            hang.set()
+        time.sleep(0.1)
+
+        pushed = sorted(sku for sku, platforms in results.items() if platforms["ebay"])
+        assert pushed == [f"TEST-BULK-{i:03d}" for i in range(25)]
+        assert calls == [25, 25]
+
+    def test_single_sku_sync(self):
+        """Test the single-SKU sync reports every platform."""
+        assert self.aggregator.sync_inventory_across_platforms("TEST-BULK-001", 5) == {
+            "shopify": True, "amazon": True, "ebay": True, "etsy": True,
+        }
+
+    def test_bulk_sync_endpoint(self):
+        """Test the API syncs known SKUs and rejects unknown ones."""
+        db = SessionLocal()
+        db.add(Product(sku="TEST-BULK-API", name="Bulk Widget", quantity_available=4))
+        db.commit()
+        try:
+            response = client.post(
+                "/api/inventory/sync/bulk", json={"quantities": {"TEST-BULK-API": 4}}
+            )
+            assert response.status_code == 200
+            assert response.json()["synced"] == 1
+
+            response = client.post(
+                "/api/inventory/sync/bulk", json={"quantities": {"TEST-BULK-NOPE": 4}}
+            )
+            assert response.status_code == 404
+        finally:
+            db.query(Product).filter(Product.sku == "TEST-BULK-API").delete()
+            db.commit()
+            db.close()
+
+
+class TestInventoryOutbox:
+    """Test debounced, coalesced inventory pushes."""
+
+    def setup_method(self):
+        self.db = SessionLocal()
+        self.db.add(Product(sku="TEST-OUTBOX-001", name="Outbox Widget", quantity_available=10))
+        self.db.commit()
+        self.aggregator = OrderAggregator()
+        self.pushes = []
+        original = self.aggregator.sync_inventory_bulk
+
+        def recording(quantities, **kwargs):
+            self.pushes.append(dict(quantities))
+            return original(quantities, **kwargs)
+
+        self.aggregator.sync_inventory_bulk = recording
+        self.flusher = InventoryOutboxFlusher(self.aggregator)
+
+    def teardown_method(self):
+        self.db.query(InventoryOutbox).delete()
+        self.db.query(InventoryLog).filter(InventoryLog.sku == "TEST-OUTBOX-001").delete()
+        self.db.query(Product).filter(Product.sku == "TEST-OUTBOX-001").delete()
+        self.db.commit()
+        self.db.close()
+        self.aggregator.close()
+
+    def entry(self):
+        self.db.expire_all()
+        return self.db.query(InventoryOutbox).filter(InventoryOutbox.sku == "TEST-OUTBOX-001").first()
+
+    def test_edits_coalesce_into_one_push(self):
+        """Test rapid edits leave one outbox entry, pushed once when due."""
+        for quantity in range(1, 11):
+            response = client.patch(
+                "/api/inventory/TEST-OUTBOX-001",
+                json={"quantity": quantity, "sync_platforms": True},
+            )
+            assert response.status_code == 200
+
+        entry = self.entry()
+        assert (entry.quantity, entry.version) == (10, 10)
+
+        # Not due until the debounce window passes
+        assert self.flusher.flush() == 0
+        assert self.pushes == []
+
+        entry.next_attempt_at = entry.next_attempt_at.replace(year=2000)
+        self.db.commit()
+
+        assert self.flusher.flush() == 1
+        assert self.pushes == [{"TEST-OUTBOX-001": 10}]
+        assert self.entry() is None
+
+    def test_failed_push_backs_off(self):
+        """Test a platform failure keeps the entry and delays the retry."""
+        self.aggregator.ebay.sync_inventory = lambda sku, quantity: False
+        InventoryOutboxService(self.db).enqueue({"TEST-OUTBOX-001": 7}, delay_seconds=0)
+        self.db.commit()
+
+        assert self.flusher.flush() == 0
+        entry = self.entry()
+        assert entry.attempts == 1
+        assert entry.last_error == "Failed on ebay"
+
+        # Backing off, so an immediate flush does not push again
+        self.flusher.flush()
+        assert len(self.pushes) == 1
+
+    def test_change_during_push_is_kept(self):
+        """Test a value enqueued while a push is in flight still goes out."""
+        service = InventoryOutboxService(self.db)
+        service.enqueue({"TEST-OUTBOX-001": 3}, delay_seconds=0)
+        self.db.commit()
+
+        entries = service.claim(10)
+        service.enqueue({"TEST-OUTBOX-001": 4}, delay_seconds=0)
+        self.db.commit()
+        service.settle(entries, {"TEST-OUTBOX-001": {"shopify": True}})
+
+        assert self.entry().quantity == 4
+        assert self.flusher.flush() == 1
+        assert self.pushes == [{"TEST-OUTBOX-001": 4}]
+
+    def test_change_during_push_keeps_the_claim(self):
+        """Test an entry changed mid-push is not claimed again until the push settles."""
+        service = InventoryOutboxService(self.db)
+        service.enqueue({"TEST-OUTBOX-001": 3}, delay_seconds=0)
+        self.db.commit()
+
+        entries = service.claim(10)
+        service.enqueue({"TEST-OUTBOX-001": 4}, delay_seconds=0)
+        self.db.commit()
+
+        # Another replica finds nothing due while the first push is in flight
+        assert service.claim(10) == []
+
+        service.settle(entries, {"TEST-OUTBOX-001": {"shopify": False}})
+        assert self.entry().attempts == 0
+        assert self.flusher.flush() == 1
+        assert self.pushes == [{"TEST-OUTBOX-001": 4}]
+
+
+class TestInventoryImport:
+    """Test streaming bulk inventory imports."""
+
+    def setup_method(self):
+        self.db = SessionLocal()
+        for i in range(5):
+            self.db.add(Product(sku=f"TEST-IMPORT-{i}", name="Import Widget", quantity_available=i))
+        self.db.commit()
+
+    def teardown_method(self):
+        self.db.query(InventoryOutbox).delete()
+        self.db.query(InventoryLog).filter(InventoryLog.sku.like("TEST-IMPORT-%")).delete()
+        self.db.query(Product).filter(Product.sku.like("TEST-IMPORT-%")).delete()
+        self.db.commit()
+        self.db.close()
+
+    def quantities(self):
+        self.db.expire_all()
+        return {
+            p.sku: p.quantity_available
+            for p in self.db.query(Product).filter(Product.sku.like("TEST-IMPORT-%"))
+        }
+
+    def test_csv_import_applies_only_changes(self):
+        """Test a CSV upload updates, audits and queues only changed SKUs."""
+        body = (
+            "Name,SKU,Quantity\r\n"
+            "Widget,TEST-IMPORT-0,10\r\n"
+            "Widget,TEST-IMPORT-1,1\r\n"
+            '"Widget, large",TEST-IMPORT-2,20\r\n'
+            "Widget,TEST-IMPORT-NOPE,5\r\n"
+            "Widget,TEST-IMPORT-3,lots\r\n"
+            "Widget,TEST-IMPORT-4,-1\r\n"
+        )
+        response = client.post(
+            "/api/inventory/import", content=body, headers={"Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert {k: result[k] for k in ("rows", "changed", "unchanged", "unknown", "invalid")} == {
+            "rows": 4, "changed": 2, "unchanged": 1, "unknown": 1, "invalid": 2,
+        }
+        assert result["errors"] == [
+            "Line 6: invalid quantity 'lots'",
+            "Line 7: negative quantity -1",
+        ]
+        assert self.quantities() == {
+            "TEST-IMPORT-0": 10, "TEST-IMPORT-1": 1, "TEST-IMPORT-2": 20,
+            "TEST-IMPORT-3": 3, "TEST-IMPORT-4": 4,
+        }
+        logs = self.db.query(InventoryLog).filter(InventoryLog.sku.like("TEST-IMPORT-%")).all()
+        assert sorted((log.sku, log.quantity_change) for log in logs) == [
+            ("TEST-IMPORT-0", 10), ("TEST-IMPORT-2", 18),
+        ]
+        assert {e.sku: e.quantity for e in self.db.query(InventoryOutbox)} == {
+            "TEST-IMPORT-0": 10, "TEST-IMPORT-2": 20,
+        }
+
+    def test_ndjson_import_streams_in_chunks(self):
+        """Test an NDJSON stream split mid-line is applied chunk by chunk."""
+        payload = "".join(
+            json.dumps({"sku": f"TEST-IMPORT-{i}", "quantity": 100 + i}) + "\n" for i in range(5)
+        ).encode()
+        chunks = []
+        importer = InventoryImporter(self.db, chunk_size=2, sync_platforms=False)
+        original_apply = importer.apply
+
+        def recording_apply(quantities, result):
+            chunks.append(len(quantities))
+            original_apply(quantities, result)
+
+        importer.apply = recording_apply
+
+        async def stream():
+            for start in range(0, len(payload), 7):
+                yield payload[start:start + 7]
+
+        result = asyncio.run(importer.run(stream(), "ndjson"))
+
+        assert chunks == [2, 2, 1]
+        assert result.changed == 5
+        assert self.quantities() == {f"TEST-IMPORT-{i}": 100 + i for i in range(5)}
+        assert self.db.query(InventoryOutbox).count() == 0
+
+    def test_unreadable_uploads_rejected(self):
+        """Test uploads of unknown type or without the needed columns are refused."""
+        assert client.post(
+            "/api/inventory/import", content="sku,qty\n", headers={"Content-Type": "text/plain"}
+        ).status_code == 415
+        response = client.post("/api/inventory/import?format=csv", content="sku,qty\nA,1\n")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "CSV header is missing quantity"
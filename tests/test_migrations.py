@@ -0,0 +1,60 @@
+"""Tests for in-place schema upgrades."""
+
+from sqlalchemy import create_engine, inspect, text
+
+from src.db.migrations import upgrade_schema
+
+
+def test_orders_upgrade_keeps_newest_duplicate(tmp_path):
+    """Test an old orders table gets the new column and keys, minus its duplicates."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE orders (id INTEGER PRIMARY KEY, platform VARCHAR(20), "
+            "platform_order_id VARCHAR(255), order_date DATETIME)"
+        ))
+        connection.execute(text(
+            "CREATE TABLE order_items (id INTEGER PRIMARY KEY, order_id INTEGER)"
+        ))
+        connection.execute(text(
+            "INSERT INTO orders VALUES (1, 'shopify', 'A', '2024-01-01'), "
+            "(2, 'shopify', 'A', '2024-01-01'), (3, 'ebay', 'A', '2024-01-01')"
+        ))
+        connection.execute(text("INSERT INTO order_items VALUES (1, 1), (2, 2), (3, 3)"))
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT id FROM orders ORDER BY id")).scalars().all() == [2, 3]
+        assert connection.execute(
+            text("SELECT order_id FROM order_items ORDER BY id")
+        ).scalars().all() == [2, 3]
+    columns = {column["name"] for column in inspect(engine).get_columns("orders")}
+    assert "platform_updated_at" in columns
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("orders")}
+    assert indexes["uq_orders_platform_order"]["unique"]
+    assert indexes["ix_orders_keyset"]["column_names"] == ["order_date", "platform", "platform_order_id"]
+
+
+def test_outbox_upgrade_adds_claim_lease(tmp_path):
+    """Test an old outbox table gets the claim lease column."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE orders (id INTEGER PRIMARY KEY, platform VARCHAR(20), "
+            "platform_order_id VARCHAR(255), order_date DATETIME)"
+        ))
+        connection.execute(text(
+            "CREATE TABLE order_items (id INTEGER PRIMARY KEY, order_id INTEGER)"
+        ))
+        connection.execute(text(
+            "CREATE TABLE inventory_outbox (id INTEGER PRIMARY KEY, sku VARCHAR(100), "
+            "next_attempt_at DATETIME)"
+        ))
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("inventory_outbox")}
+    assert "claimed_until" in columns
@@ -50,6 +50,44 @@ class TestPlatformClients:
         assert len(orders) > 0
         assert all(order["platform"] == "etsy" for order in orders)
 
+    def test_demo_order_ids_are_stable(self):
+        """Test repeated demo fetches return the same orders, so syncs update them in place."""
+        for client_class in [ShopifyClient, AmazonClient, EbayClient, EtsyClient]:
+            platform_client = client_class()
+            first = {order["id"] for order in platform_client.get_orders(limit=50)}
+            second = {order["id"] for order in platform_client.get_orders(limit=50)}
+
+            assert first == second
+
+    def test_order_filters_are_keyword_only(self):
+        """Test every client takes the same filters, by keyword only."""
+        import inspect
+
+        filters = ["status", "created_after", "created_before", "updated_after"]
+        for client_class in [ShopifyClient, AmazonClient, EbayClient, EtsyClient]:
+            parameters = inspect.signature(client_class.get_orders).parameters.values()
+            keyword_only = [p.name for p in parameters if p.kind == p.KEYWORD_ONLY]
+            assert keyword_only == filters
+
+    def test_async_clients_share_http_pool(self):
+        """Test async clients satisfy the protocol and reuse one pooled client."""
+        import asyncio
+
+        from src.services.base import AsyncPlatformClient
+        from src.services.http import close_http_clients
+        from src.services.shopify import AsyncShopifyClient
+
+        first = AsyncShopifyClient(ShopifyClient())
+        second = AsyncShopifyClient(ShopifyClient())
+
+        assert isinstance(first, AsyncPlatformClient)
+        assert first.http is second.http
+
+        orders = asyncio.run(first.get_orders(limit=5))
+        assert all(order["platform"] == "shopify" for order in orders)
+
+        asyncio.run(close_http_clients())
+
 
 class TestOrderAggregator:
     """Test order aggregation service."""
@@ -86,6 +124,105 @@ class TestOrderAggregator:
         # Verify descending order
         assert dates == sorted(dates, reverse=True)
 
+    def test_merge_reads_lazily(self):
+        """Test the k-way merge only consumes what the caller takes."""
+        from itertools import islice
+
+        from src.services.aggregator import merge_newest_first
+
+        consumed = []
+
+        def stream(platform, days):
+            for day in days:
+                consumed.append((platform, day))
+                yield {
+                    "id": f"{platform}-{day}",
+                    "platform": platform,
+                    "order_date": f"2024-01-{day:02d}T00:00:00",
+                }
+
+        merged = merge_newest_first([
+            stream("shopify", [30, 20, 10]),
+            stream("etsy", [25, 15, 5]),
+        ])
+        newest = list(islice(merged, 2))
+
+        assert [o["order_date"][8:10] for o in newest] == ["30", "25"]
+        assert len(consumed) < 6
+
+    def test_merged_cursor_pages(self):
+        """Test the live merge path resumes after a cursor position."""
+        from src.services.pagination import decode_cursor
+
+        from src.services.base import filter_demo_orders
+
+        aggregator = OrderAggregator()
+        orders = aggregator.shopify.get_orders(limit=20)
+        aggregator.clients["shopify"].get_orders = (
+            lambda limit=50, created_before=None: filter_demo_orders(
+                orders, created_before=created_before
+            )[:limit]
+        )
+
+        first = aggregator.fetch_orders(platforms=["shopify"], limit=5)
+        second = aggregator.fetch_orders(
+            platforms=["shopify"], limit=5, after=decode_cursor(first.next_cursor)
+        )
+
+        assert len(second.orders) == 5
+        assert not {o["id"] for o in first.orders} & {o["id"] for o in second.orders}
+
+    def test_filters_pushed_to_platforms(self):
+        """Test status and date filters reach each platform's fetch."""
+        from datetime import datetime, timedelta
+
+        from src.models.order import OrderStatus
+        from src.services.filters import OrderFilter
+
+        aggregator = OrderAggregator()
+        calls = []
+        original = aggregator.amazon.get_orders
+
+        def recording_get_orders(**kwargs):
+            calls.append(kwargs)
+            return original(**kwargs)
+
+        aggregator.clients["amazon"].get_orders = recording_get_orders
+        since = datetime.now() - timedelta(days=10)
+        result = aggregator.fetch_orders(
+            platforms=["amazon"],
+            filters=OrderFilter(status=OrderStatus.SHIPPED, created_after=since),
+        )
+
+        assert calls[0]["status"] == "shipped"
+        assert calls[0]["created_after"] == since
+        assert all(o["status"] == "shipped" for o in result.orders)
+        assert all(datetime.fromisoformat(o["order_date"]) >= since for o in result.orders)
+
+    def test_late_platform_dropped(self):
+        """Test a platform that misses its deadline is reported, not awaited."""
+        import time
+
+        aggregator = OrderAggregator()
+        aggregator.clients["ebay"].get_orders = lambda limit=50: time.sleep(1) or []
+
+        started = time.monotonic()
+        result = aggregator.fetch_orders(
+            limit_per_platform=10,
+            platform_timeouts={"ebay": 0.05}
+        )
+
+        assert time.monotonic() - started < 1
+        assert result.late_platforms == ["ebay"]
+        assert result.orders
+        assert all(order["platform"] != "ebay" for order in result.orders)
+
+    def test_aggregator_is_process_wide(self):
+        """Test the aggregator dependency returns one shared instance."""
+        from src.services.aggregator import get_aggregator
+
+        assert get_aggregator() is get_aggregator()
+
     def test_platform_stats(self):
         """Test platform statistics."""
         aggregator = OrderAggregator()
@@ -137,6 +274,150 @@ class TestOrdersAPI:
         if len(data) > 0:
             assert all(order["status"] == "shipped" for order in data)
 
+    def test_cursor_pagination(self):
+        """Test pages resume after the cursor without overlap."""
+        first = client.get("/api/orders?limit=5")
+        assert first.status_code == 200
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = client.get(f"/api/orders?limit=5&cursor={cursor}")
+        assert second.status_code == 200
+
+        first_ids = {(o["platform"], o["id"]) for o in first.json()}
+        second_ids = {(o["platform"], o["id"]) for o in second.json()}
+        assert second_ids
+        assert not first_ids & second_ids
+        assert first.json()[-1]["order_date"] >= second.json()[0]["order_date"]
+
+    def test_cursor_pages_through_ties(self):
+        """Test orders placed at the same instant are paged by platform and ID."""
+        from src.db.database import SessionLocal
+        from src.services.ingest import OrderIngestor
+
+        placed = "2030-01-01T00:00:00"
+        db = SessionLocal()
+        try:
+            OrderIngestor(db).upsert([
+                {
+                    "id": f"TIE-{i}",
+                    "platform": platform,
+                    "status": "pending",
+                    "order_date": placed,
+                    "customer": {"name": "Tie Breaker"},
+                    "items": [],
+                    "subtotal": 1.0,
+                    "total": 1.0,
+                }
+                for i, platform in enumerate(["shopify", "etsy", "shopify", "ebay", "etsy"])
+            ])
+            db.commit()
+        finally:
+            db.close()
+
+        seen = []
+        url = f"/api/orders?created_after={placed}&limit=2"
+        response = client.get(url)
+        while True:
+            seen += [(o["platform"], o["id"]) for o in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            response = client.get(f"{url}&cursor={response.headers['X-Next-Cursor']}")
+
+        assert len(seen) == len(set(seen)) == 5
+        assert seen == sorted(seen, reverse=True)
+
+    def test_live_list_merges_platforms(self, monkeypatch):
+        """Test the live list merges every platform newest first and pages by cursor."""
+        from datetime import datetime
+
+        from src.services.aggregator import get_aggregator
+        from src.services.base import filter_demo_orders
+
+        aggregator = get_aggregator()
+        for platform_client in aggregator.clients.values():
+            snapshot = platform_client.get_orders(limit=10)
+
+            def frozen(limit=50, snapshot=snapshot, **query):
+                return filter_demo_orders(snapshot, **query)[:limit]
+
+            monkeypatch.setattr(platform_client, "get_orders", frozen)
+        for platform_cache in aggregator.caches.values():
+            platform_cache.clear()
+
+        response = client.get("/api/orders?live=true&limit=8")
+        assert response.status_code == 200
+        first = response.json()
+        dates = [datetime.fromisoformat(order["order_date"]) for order in first]
+        assert len(first) == 8
+        assert dates == sorted(dates, reverse=True)
+
+        cursor = response.headers["X-Next-Cursor"]
+        second = client.get(f"/api/orders?live=true&limit=8&cursor={cursor}").json()
+        assert datetime.fromisoformat(second[0]["order_date"]) <= dates[-1]
+        assert not {(o["platform"], o["id"]) for o in first} & {
+            (o["platform"], o["id"]) for o in second
+        }
+
+        status = aggregator.amazon.get_orders()[0]["status"]
+        matching = client.get(f"/api/orders?live=true&status={status}&platform=amazon").json()
+        assert matching
+        assert all(o["status"] == status and o["platform"] == "amazon" for o in matching)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected."""
+        response = client.get("/api/orders?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_get_and_update_order(self):
+        """Test order detail and updates are served from the read model."""
+        order_id = client.get("/api/orders?platform=shopify&limit=1").json()[0]["id"]
+
+        response = client.get(f"/api/orders/{order_id}")
+        assert response.status_code == 200
+        assert response.json()["id"] == order_id
+
+        response = client.patch(
+            f"/api/orders/{order_id}",
+            json={"status": "shipped", "tracking_number": "1Z000TEST"}
+        )
+        assert response.status_code == 200
+
+        data = client.get(f"/api/orders/{order_id}").json()
+        assert data["status"] == "shipped"
+        assert data["tracking_number"] == "1Z000TEST"
+
+    def test_get_order_by_platform_qualified_id(self):
+        """Test platform-qualified IDs resolve without scanning platforms."""
+        order = client.get("/api/orders?platform=etsy&limit=1").json()[0]
+
+        response = client.get(f"/api/orders/etsy:{order['id']}")
+        assert response.status_code == 200
+        assert response.json()["id"] == order["id"]
+
+        # Not stored locally, so it is fetched with one single-order call
+        response = client.get("/api/orders/SHOP-NEW-1?platform=shopify")
+        assert response.status_code == 200
+        assert response.json()["id"] == "SHOP-NEW-1"
+        assert response.json()["platform"] == "shopify"
+
+    def test_get_missing_order(self):
+        """Test unknown order IDs return 404."""
+        response = client.get("/api/orders/DOES-NOT-EXIST")
+        assert response.status_code == 404
+
+    def test_filter_by_date_range(self):
+        """Test filtering orders by order date in SQL."""
+        response = client.get("/api/orders?limit=500")
+        dates = sorted(o["order_date"] for o in response.json())
+        middle = dates[len(dates) // 2]
+
+        response = client.get(f"/api/orders?created_after={middle}&limit=500")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data
+        assert all(order["order_date"] >= middle for order in data)
+
     def test_sync_orders(self):
         """Test POST /api/orders/sync endpoint."""
         response = client.post("/api/orders/sync")
@@ -0,0 +1,394 @@
+"""Tests for protecting platform calls."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.aggregator import OrderAggregator
+from src.services.breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from src.services.ratelimit import (
+    AdaptiveLimiter,
+    Priority,
+    RateLimitError,
+    TokenBucket,
+    rate_limit_pressure,
+)
+
+client = TestClient(app)
+
+
+class TestRateLimiter:
+    """Test the adaptive per-platform rate limiter."""
+
+    def test_bucket_spaces_calls_after_burst(self):
+        """Test calls beyond the burst wait for tokens."""
+        limiter = AdaptiveLimiter([TokenBucket(rate=50, burst=2)], max_concurrency=4)
+
+        started = time.monotonic()
+        for _ in range(4):
+            with limiter.slot():
+                pass
+
+        # Two calls from the burst, two more at 50 tokens per second
+        assert time.monotonic() - started >= 0.03
+
+    def test_throttling_halves_concurrency_then_recovers(self):
+        """Test AIMD: a 429 halves the limit, successes grow it back slowly."""
+        limiter = AdaptiveLimiter([TokenBucket(rate=1000, burst=100)], max_concurrency=8)
+
+        with pytest.raises(RateLimitError):
+            with limiter.slot():
+                raise RateLimitError(retry_after=0)
+        assert limiter.limit == 4
+
+        for _ in range(4):
+            with limiter.slot():
+                pass
+        assert 4 < limiter.limit < 6
+
+    def test_interactive_calls_jump_the_queue(self):
+        """Test queued user-facing calls run before queued background calls."""
+        limiter = AdaptiveLimiter([TokenBucket(rate=1000, burst=100)], max_concurrency=1)
+        limiter.acquire()
+
+        order = []
+
+        def call(name, priority):
+            with limiter.slot(priority):
+                order.append(name)
+
+        background = threading.Thread(target=call, args=("sync", Priority.BACKGROUND))
+        background.start()
+        while not limiter._queue:
+            time.sleep(0.001)
+        interactive = threading.Thread(target=call, args=("dashboard", Priority.INTERACTIVE))
+        interactive.start()
+        while len(limiter._queue) < 2:
+            time.sleep(0.001)
+
+        limiter.release()
+        background.join(1)
+        interactive.join(1)
+
+        assert order == ["dashboard", "sync"]
+
+    def test_cancelled_async_wait_gives_up_its_place(self):
+        """Test cancelling a queued async call neither leaks nor blocks a slot."""
+        limiter = AdaptiveLimiter([TokenBucket(rate=1000, burst=100)], max_concurrency=1)
+        limiter.acquire()
+
+        async def cancel_waiting_call():
+            async def call():
+                async with limiter.aslot():
+                    pass
+
+            task = asyncio.create_task(call())
+            while not limiter._queue:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.05)
+
+        asyncio.run(cancel_waiting_call())
+        assert not limiter._queue
+
+        limiter.release()
+        assert limiter.in_flight == 0
+        with limiter.slot():
+            assert limiter.in_flight == 1
+
+    def test_rate_limit_headers(self):
+        """Test platform headers that signal a nearly spent limit."""
+        assert rate_limit_pressure("shopify", {"X-Shopify-Shop-Api-Call-Limit": "35/40"})
+        assert not rate_limit_pressure("shopify", {"X-Shopify-Shop-Api-Call-Limit": "3/40"})
+        assert rate_limit_pressure(
+            "etsy", {"x-remaining-today": "50", "x-limit-per-day": "10000"}
+        )
+        assert not rate_limit_pressure("ebay", {})
+
+
+class TestCircuitBreaker:
+    """Test platform circuit breakers and cached health."""
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        """Test consecutive failures open the circuit and reject calls."""
+        breaker = CircuitBreaker("ebay", failure_threshold=3, reset_seconds=60)
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure("timeout")
+        assert breaker.healthy
+
+        breaker.before_call()
+        breaker.record_failure("timeout")
+
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_probe_closes_circuit(self):
+        """Test one probe is let through after the reset timeout."""
+        breaker = CircuitBreaker("etsy", failure_threshold=1, reset_seconds=0.01)
+        breaker.before_call()
+        breaker.record_failure("500")
+        time.sleep(0.02)
+
+        breaker.before_call()
+        assert breaker.state == CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.healthy
+        breaker.before_call()
+
+    def test_failing_platform_is_not_called(self):
+        """Test the aggregator stops calling a platform once its circuit opens."""
+        aggregator = OrderAggregator()
+        calls = []
+
+        def failing_get_orders(**kwargs):
+            calls.append(kwargs)
+            raise ConnectionError("eBay is down")
+
+        aggregator.clients["ebay"].get_orders = failing_get_orders
+        try:
+            for _ in range(7):
+                result = aggregator.fetch_orders(platforms=["ebay", "shopify"], limit=5)
+                aggregator.invalidate("ebay")
+        finally:
+            aggregator.close()
+
+        assert len(calls) == 5
+        assert result.failed_platforms == ["ebay"]
+        assert result.orders
+        assert aggregator.health("ebay")["state"] == "open"
+        assert aggregator.get_platform_stats()["ebay"]["connected"] is False
+
+    def test_health_endpoint_reads_cached_state(self):
+        """Test the health endpoint answers from the breaker unless probing."""
+        response = client.get("/api/platforms/amazon/health")
+        assert response.status_code == 200
+        assert response.json()["state"] == "closed"
+
+        response = client.get("/api/platforms/amazon/health?probe=true")
+        assert response.json()["healthy"] is True
+
+
+class TestRetryAndHedging:
+    """Test retries with backoff and hedged reads."""
+
+    def test_idempotent_read_retried(self, monkeypatch):
+        """Test a transient read failure is retried until it succeeds."""
+        from src.services import retry
+
+        monkeypatch.setattr(
+            retry.settings, "retry_policies", {"shopify.get_orders": {"base_delay": 0.001}}
+        )
+        aggregator = OrderAggregator()
+        original = aggregator.shopify.get_orders
+        calls = []
+
+        def flaky_get_orders(**kwargs):
+            calls.append(kwargs)
+            if len(calls) < 3:
+                raise ConnectionError("connection reset")
+            return original(**kwargs)
+
+        aggregator.clients["shopify"].get_orders = flaky_get_orders
+        try:
+            result = aggregator.fetch_orders(platforms=["shopify"], limit=5)
+        finally:
+            aggregator.close()
+
+        assert len(calls) == 3
+        assert len(result.orders) == 5
+        assert not result.failed_platforms
+
+    def test_status_update_not_retried(self):
+        """Test non-idempotent writes are attempted once."""
+        aggregator = OrderAggregator()
+        calls = []
+
+        def failing_update(*args):
+            calls.append(args)
+            raise ConnectionError("connection reset")
+
+        aggregator.clients["etsy"].update_order_status = failing_update
+        try:
+            with pytest.raises(ConnectionError):
+                aggregator.sync_order_status("etsy", "1", "shipped")
+        finally:
+            aggregator.close()
+
+        assert len(calls) == 1
+
+    def test_policy_overrides(self, monkeypatch):
+        """Test per-platform policy overrides from settings."""
+        from src.services import retry
+
+        monkeypatch.setattr(
+            retry.settings, "retry_policies", {"ebay.get_orders": {"max_attempts": 5}}
+        )
+
+        assert retry.get_retry_policy("ebay", "get_orders").max_attempts == 5
+        assert retry.get_retry_policy("ebay", "get_orders").hedge
+        assert retry.get_retry_policy("amazon", "get_orders").max_attempts == 3
+        assert retry.get_retry_policy("amazon", "update_order_status").max_attempts == 1
+
+    def test_hedged_read_returns_fastest_answer(self):
+        """Test a slow first attempt is overtaken by its duplicate."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.services.retry import hedged_call
+
+        delays = iter([0.3, 0.0])
+
+        def read():
+            time.sleep(next(delays))
+            return "orders"
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            started = time.monotonic()
+            assert hedged_call(executor, read, hedge_after=0.05) == "orders"
+            assert time.monotonic() - started < 0.25
+
+    def test_hedge_waits_for_p95(self):
+        """Test reads are only hedged once a latency baseline exists."""
+        from src.services.retry import LatencyTracker
+
+        tracker = LatencyTracker(min_samples=20)
+        assert tracker.percentile(0.95) is None
+
+        for ms in range(1, 101):
+            tracker.record(ms / 1000)
+        assert tracker.percentile(0.95) == pytest.approx(0.096)
+
+
+class TestBulkheads:
+    """Test per-platform isolation of platform calls."""
+
+    def test_full_bulkhead_rejects_at_once(self):
+        """Test calls beyond the pool and queue are rejected, not queued."""
+        from src.services.bulkhead import Bulkhead, BulkheadFullError
+
+        bulkhead = Bulkhead("ebay", max_concurrent=1, queue_depth=1)
+        release = threading.Event()
+        try:
+            running = bulkhead.submit(release.wait, 1)
+            queued = bulkhead.submit(lambda: "queued")
+            with pytest.raises(BulkheadFullError):
+                bulkhead.submit(lambda: "rejected")
+            with pytest.raises(BulkheadFullError):
+                bulkhead.call(lambda: "rejected")
+
+            release.set()
+            assert running.result(1)
+            assert queued.result(1) == "queued"
+            assert bulkhead.call(lambda: "admitted") == "admitted"
+            assert bulkhead.stats()["rejected"] == 2
+        finally:
+            release.set()
+            bulkhead.shutdown()
+
+    def test_direct_calls_wait_for_a_running_slot(self):
+        """Test calls in the caller's thread or event loop never exceed max_concurrent."""
+        import asyncio
+
+        from src.services.bulkhead import Bulkhead, BulkheadFullError
+
+        bulkhead = Bulkhead("ebay", max_concurrent=1, queue_depth=5)
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        async def awork():
+            async with bulkhead.aslot():
+                work()
+
+        async def run_async():
+            await asyncio.gather(*(awork() for _ in range(3)))
+
+        try:
+            threads = [threading.Thread(target=bulkhead.call, args=(work,)) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            asyncio.run(run_async())
+            for thread in threads:
+                thread.join()
+
+            assert len(peak) == 6
+            assert max(peak) == 1
+
+            hold = threading.Event()
+            holders = [threading.Thread(target=bulkhead.call, args=(hold.wait,)) for _ in range(6)]
+            for thread in holders:
+                thread.start()
+            while bulkhead.stats()["in_flight"] < 6:
+                time.sleep(0.01)
+            with pytest.raises(BulkheadFullError):
+                bulkhead.call(lambda: "rejected")
+            assert bulkhead.stats()["running"] == 1
+            hold.set()
+            for thread in holders:
+                thread.join()
+        finally:
+            bulkhead.shutdown()
+
+    def test_hung_platform_does_not_slow_others(self):
+        """Test a hung platform fills only its own slots."""
+        aggregator = OrderAggregator()
+        aggregator.bulkheads["ebay"].queue_depth = 0
+        hang = threading.Event()
+        aggregator.clients["ebay"].get_orders = lambda **kwargs: hang.wait(2) and []
+
+        try:
+            for _ in range(aggregator.bulkheads["ebay"].max_concurrent):
+                aggregator.bulkheads["ebay"].submit(hang.wait, 2)
+
+            started = time.monotonic()
+            result = aggregator.fetch_orders(limit_per_platform=10)
+            elapsed = time.monotonic() - started
+        finally:
+            hang.set()
+            aggregator.close()
+
+        assert elapsed < 0.5
+        assert result.failed_platforms == ["ebay"]
+        assert {o["platform"] for o in result.orders} == {"shopify", "amazon", "etsy"}
+
+    def test_hung_platform_hedges_do_not_starve_others(self):
+        """Test each platform hedges on its own threads."""
+        from src.services.retry import LatencyTracker
+
+        aggregator = OrderAggregator()
+        hang = threading.Event()
+        ebay = aggregator.bulkheads["ebay"]
+        try:
+            for _ in range(ebay.max_concurrent * 2):
+                ebay.hedge_executor.submit(hang.wait, 2)
+
+            tracker = LatencyTracker(min_samples=1)
+            tracker.record(0.05)
+            aggregator.latencies[("shopify", "get_orders")] = tracker
+
+            started = time.monotonic()
+            assert aggregator._call("shopify", "get_orders", lambda: "orders") == "orders"
+            elapsed = time.monotonic() - started
+        finally:
+            hang.set()
+            aggregator.close()
+
+        assert elapsed < 0.5
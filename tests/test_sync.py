@@ -0,0 +1,400 @@
+"""Tests for incremental order sync."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import redis
+
+from src.config import get_settings
+from src.db.database import SessionLocal
+from src.models.order import Order
+from src.models.platform import PlatformConnection
+from src.services.aggregator import OrderAggregator
+from src.services.base import filter_demo_orders
+from src.services.ingest import OrderIngestor
+from src.services.leases import RELEASE_SCRIPT, RENEW_SCRIPT, LocalLease, RedisLease
+from src.services.scheduler import SyncScheduler
+from src.services.sync import OrderSyncService
+
+settings = get_settings()
+
+
+class TestOrderSync:
+    """Test watermark-based order sync."""
+
+    def setup_method(self):
+        self.db = SessionLocal()
+        self.db.query(PlatformConnection).delete()
+        self.db.commit()
+        self.aggregator = OrderAggregator()
+        self.service = OrderSyncService(self.db, self.aggregator)
+
+    def teardown_method(self):
+        self.db.close()
+        self.aggregator.close()
+
+    def test_first_sync_stores_orders_and_sets_watermark(self):
+        """Test a first sync pulls the full window and records a watermark."""
+        result = self.service.sync_platform("shopify")
+
+        assert result.success
+        assert result.orders_synced > 0
+
+        connection = self.service.get_connection("shopify")
+        assert connection.last_sync_at is not None
+        assert connection.last_sync_status == "success"
+        assert connection.orders_synced == result.orders_synced
+        assert self.db.query(Order).filter(Order.platform == "shopify").count() > 0
+
+    def test_next_sync_asks_only_for_changes(self):
+        """Test a later sync passes the watermark to the platform."""
+        self.service.sync_platform("etsy")
+        watermark = self.service.get_connection("etsy").last_sync_at
+
+        calls = []
+        original = self.aggregator.etsy.get_orders
+
+        def recording_get_orders(**kwargs):
+            calls.append(kwargs)
+            return original(**kwargs)
+
+        self.aggregator.etsy.get_orders = recording_get_orders
+        self.service.sync_platform("etsy")
+
+        assert calls[0]["updated_after"] is not None
+        assert calls[0]["updated_after"] > watermark - timedelta(minutes=5)
+
+    def test_failed_sync_keeps_watermark(self):
+        """Test the watermark does not move when a sync fails."""
+        self.service.sync_platform("ebay")
+        watermark = self.service.get_connection("ebay").last_sync_at
+
+        def failing_get_orders(**kwargs):
+            raise RuntimeError("platform down")
+
+        self.aggregator.ebay.get_orders = failing_get_orders
+        result = self.service.sync_platform("ebay")
+
+        connection = self.service.get_connection("ebay")
+        assert not result.success
+        assert connection.last_sync_at == watermark
+        assert connection.last_sync_status == "error"
+        assert connection.last_error == "platform down"
+
+    def test_capped_syncs_resume_from_platform_update_times(self):
+        """Test capped runs move the watermark by update time until caught up."""
+        now = datetime.utcnow()
+        # Placed two months ago, changed over the last few days
+        orders = [
+            {
+                "id": f"WM{i}",
+                "platform": "amazon",
+                "status": "processing",
+                "order_date": (now - timedelta(days=60)).isoformat(),
+                "updated_at": (now - timedelta(days=5) + timedelta(hours=i)).isoformat(),
+                "customer": {"name": f"Customer {i}"},
+                "items": [],
+                "subtotal": 10.0,
+                "total": 10.0,
+            }
+            for i in range(7)
+        ]
+
+        def get_orders(limit, updated_after=None, **kwargs):
+            return filter_demo_orders(orders[::-1], updated_after=updated_after)[:limit]
+
+        self.aggregator.amazon.get_orders = get_orders
+
+        watermarks = []
+        for _ in range(4):
+            result = self.service.sync_platform("amazon", limit=3)
+            watermarks.append(self.service.get_connection("amazon").last_sync_at)
+
+        assert [w.isoformat() for w in watermarks[:3]] == [
+            orders[2]["updated_at"], orders[4]["updated_at"], orders[6]["updated_at"],
+        ]
+        assert result.complete
+        assert watermarks[3] > watermarks[2]
+        stored = self.db.query(Order).filter(Order.platform_order_id.like("WM%")).count()
+        assert stored == 7
+
+    def test_capped_syncs_move_past_orders_changed_together(self):
+        """Test a full page of orders sharing one update time does not stall the watermark."""
+        now = datetime.utcnow()
+        tied = (now - timedelta(days=2)).isoformat()
+        orders = [
+            {
+                "id": f"SAME{i}",
+                "platform": "amazon",
+                "status": "processing",
+                "order_date": (now - timedelta(days=3)).isoformat(),
+                "updated_at": tied if i < 4 else (now - timedelta(days=1)).isoformat(),
+                "customer": {"name": f"Customer {i}"},
+                "items": [],
+                "subtotal": 10.0,
+                "total": 10.0,
+            }
+            for i in range(5)
+        ]
+
+        def get_orders(limit, updated_after=None, **kwargs):
+            return filter_demo_orders(orders[::-1], updated_after=updated_after)[:limit]
+
+        self.aggregator.amazon.get_orders = get_orders
+
+        watermarks = []
+        for _ in range(3):
+            result = self.service.sync_platform("amazon", limit=3)
+            watermarks.append(self.service.get_connection("amazon").last_sync_at)
+
+        assert watermarks[0].isoformat() == orders[4]["updated_at"]
+        assert result.complete
+        stored = self.db.query(Order).filter(Order.platform_order_id.like("SAME%")).count()
+        assert stored == 5
+
+    def test_sync_all_reports_late_platforms(self, monkeypatch):
+        """Test platforms sync concurrently and a slow one is late, not waited on."""
+        monkeypatch.setattr(settings, "platform_timeout_seconds", 0.5)
+        release = threading.Event()
+        original = self.aggregator.ebay.get_orders
+
+        def hung_get_orders(**kwargs):
+            release.wait(5)
+            return original(**kwargs)
+
+        self.aggregator.ebay.get_orders = hung_get_orders
+        try:
+            started = time.monotonic()
+            results = {r.platform: r for r in self.service.sync_all()}
+            elapsed = time.monotonic() - started
+        finally:
+            release.set()
+
+        assert elapsed < 2
+        assert results["ebay"].late and not results["ebay"].success
+        assert self.service.get_connection("ebay").last_sync_at is None
+        assert all(results[p].success for p in ("shopify", "amazon", "etsy"))
+
+
+class TestOrderIngestor:
+    """Test bulk order upserts."""
+
+    def setup_method(self):
+        self.db = SessionLocal()
+
+    def teardown_method(self):
+        self.db.close()
+
+    def test_upsert_is_idempotent(self):
+        """Test re-ingesting the same orders updates rows in place."""
+        orders = OrderAggregator().etsy.get_orders(limit=5)
+        for order in orders:
+            order["id"] = f"IDEM-{order['id']}"
+        ingestor = OrderIngestor(self.db, batch_size=2)
+
+        assert ingestor.upsert(orders) == len(orders)
+        self.db.commit()
+
+        orders[0]["status"] = "cancelled"
+        orders[0]["items"][0]["quantity"] = 7
+        ingestor.upsert(orders)
+        self.db.commit()
+
+        ids = [o["id"] for o in orders]
+        stored = self.db.query(Order).filter(
+            Order.platform == "etsy", Order.platform_order_id.in_(ids)
+        ).all()
+        assert len(stored) == len(orders)
+
+        changed = next(o for o in stored if o.platform_order_id == orders[0]["id"])
+        assert changed.status.value == "cancelled"
+        assert [item.quantity for item in changed.items] == [7]
+
+
+    def test_older_copy_does_not_overwrite(self):
+        """Test a copy that changed on the platform before the stored one is ignored."""
+        [order] = OrderAggregator().shopify.get_orders(limit=1)
+        order["id"] = "STALE-1"
+        order["status"] = "shipped"
+        order["updated_at"] = "2024-03-02T10:00:00"
+        ingestor = OrderIngestor(self.db)
+        ingestor.upsert([order])
+        self.db.commit()
+
+        stale = {**order, "status": "processing", "updated_at": "2024-03-01T10:00:00"}
+        assert ingestor.upsert([stale]) == 0
+        self.db.commit()
+
+        stored = self.db.query(Order).filter(Order.platform_order_id == "STALE-1").one()
+        assert stored.status.value == "shipped"
+        assert len(stored.items) == len(order["items"])
+
+class TestSyncScheduler:
+    """Test the background sync scheduler."""
+
+    def setup_method(self):
+        self.aggregator = OrderAggregator()
+        self.scheduler = SyncScheduler(self.aggregator, interval_minutes=5, max_orders=3)
+
+    def teardown_method(self):
+        for lease in self.scheduler.leases.values():
+            lease.release()
+        self.aggregator.close()
+
+    def test_run_once_honours_cap_and_records_outcome(self):
+        """Test a scheduled run syncs at most the per-cycle cap."""
+        result = self.scheduler.run_once("shopify")
+
+        assert result.success
+        assert result.orders_synced <= 3
+
+        db = SessionLocal()
+        try:
+            connection = OrderSyncService(db, self.aggregator).get_connection("shopify")
+            assert connection.last_sync_status in ("success", "partial")
+        finally:
+            db.close()
+
+    def test_runs_for_a_platform_do_not_overlap(self):
+        """Test a run is skipped while the same platform is still syncing."""
+        self.scheduler._locks["amazon"].acquire()
+        try:
+            assert self.scheduler.run_once("amazon") is None
+        finally:
+            self.scheduler._locks["amazon"].release()
+
+    def test_next_delay_is_jittered(self):
+        """Test intervals vary within the jitter window."""
+        delays = {self.scheduler.next_delay() for _ in range(20)}
+
+        assert len(delays) > 1
+        assert all(240 <= delay <= 360 for delay in delays)
+
+    def test_only_the_lease_holder_runs(self):
+        """Test a replica without the platform's lease skips the run."""
+        other = SyncScheduler(self.aggregator, interval_minutes=5, max_orders=3)
+        try:
+            assert other.leases["ebay"].acquire()
+            assert self.scheduler.run_once("ebay") is None
+        finally:
+            other.leases["ebay"].release()
+
+        assert self.scheduler.run_once("ebay") is not None
+
+    def test_manual_sync_skips_platforms_already_syncing(self):
+        """Test an on-demand sync takes the same lock and lease as the schedule."""
+        self.scheduler._locks["amazon"].acquire()
+        try:
+            results = self.scheduler.run_now(["amazon", "etsy"])
+        finally:
+            self.scheduler._locks["amazon"].release()
+
+        assert results["amazon"] is None
+        assert results["etsy"].success
+
+        # Not running on a schedule, so the lease is handed straight back
+        other = SyncScheduler(self.aggregator, interval_minutes=5, max_orders=3)
+        try:
+            assert other.leases["etsy"].acquire()
+        finally:
+            other.leases["etsy"].release()
+
+
+class FakeRedis:
+    """Just enough of redis-py for leases, with a controllable clock."""
+
+    def __init__(self):
+        self.now = 0
+        self.keys = {}
+
+    def _get(self, key):
+        value, expires = self.keys.get(key, (None, 0))
+        return value if expires > self.now else None
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and self._get(key) is not None:
+            return None
+        self.keys[key] = (value, self.now + px)
+        return True
+
+    def eval(self, script, numkeys, key, token, *args):
+        if self._get(key) != token:
+            return 0
+        if script == RENEW_SCRIPT:
+            self.keys[key] = (token, self.now + int(args[0]))
+        elif script == RELEASE_SCRIPT:
+            del self.keys[key]
+        return 1
+
+
+class TestLeases:
+    """Test sync leader leases."""
+
+    def test_redis_lease_is_exclusive_until_expiry(self):
+        """Test one holder at a time, with takeover once the lease lapses."""
+        fake = FakeRedis()
+        first = RedisLease(fake, "sync:shopify", ttl_seconds=30)
+        second = RedisLease(fake, "sync:shopify", ttl_seconds=30)
+
+        assert first.acquire()
+        assert not second.acquire()
+
+        fake.now += 20_000
+        assert first.acquire()
+        fake.now += 20_000
+        assert not second.acquire()
+
+        fake.now += 31_000
+        assert second.acquire()
+        assert not first.acquire()
+
+    def test_redis_release_only_drops_own_lease(self):
+        """Test a stale holder cannot release its successor's lease."""
+        fake = FakeRedis()
+        first = RedisLease(fake, "sync:etsy", ttl_seconds=30)
+        second = RedisLease(fake, "sync:etsy", ttl_seconds=30)
+
+        assert first.acquire()
+        fake.now += 31_000
+        assert second.acquire()
+
+        first.release()
+        assert not first.acquire()
+
+        second.release()
+        assert first.acquire()
+        first.release()
+
+    def test_redis_outage_skips_runs(self):
+        """Test no replica leads while Redis is down, and the holder takes it back after."""
+        fake = FakeRedis()
+        first = RedisLease(fake, "sync:amazon", ttl_seconds=30)
+        second = RedisLease(fake, "sync:amazon", ttl_seconds=30)
+        assert first.acquire()
+
+        def unreachable(*args, **kwargs):
+            raise redis.ConnectionError("Connection refused")
+
+        fake.set = fake.eval = unreachable
+        assert not first.acquire()
+        assert not second.acquire()
+        assert not first.held
+
+        del fake.set, fake.eval
+        assert not second.acquire()
+        assert first.acquire()
+        first.release()
+
+    def test_local_lease_fallback(self):
+        """Test the in-process lease behaves the same without Redis."""
+        first = LocalLease("sync:test", ttl_seconds=30)
+        second = LocalLease("sync:test", ttl_seconds=30)
+
+        assert first.acquire()
+        assert not second.acquire()
+
+        first.release()
+        assert second.acquire()
+        assert second.held
+        second.release()
@@ -0,0 +1,188 @@
+"""Tests for webhook ingestion."""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import get_settings
+from src.main import app
+from src.services.aggregator import get_aggregator
+from src.services.webhooks import WebhookConsumer, get_webhook_consumer
+
+client = TestClient(app)
+settings = get_settings()
+
+SHOPIFY_ORDER = {
+    "id": 820982911946154508,
+    "name": "#9999",
+    "email": "jon@example.com",
+    "created_at": "2024-03-01T10:00:00-05:00",
+    "financial_status": "paid",
+    "fulfillment_status": None,
+    "cancelled_at": None,
+    "currency": "USD",
+    "subtotal_price": "59.98",
+    "total_tax": "5.25",
+    "total_price": "65.23",
+    "shipping_lines": [{"price": "0.00"}],
+    "customer": {"first_name": "Jon", "last_name": "Snow"},
+    "shipping_address": {
+        "address1": "1 Wall St",
+        "city": "Winterfell",
+        "province_code": "NY",
+        "zip": "10001",
+        "country_code": "US",
+    },
+    "line_items": [
+        {"sku": "WIDGET-001", "title": "Premium Widget", "quantity": 2, "price": "29.99"}
+    ],
+}
+
+ETSY_RECEIPT = {
+    "receipt_id": 3012345678,
+    "status": "Paid",
+    "is_paid": True,
+    "is_shipped": False,
+    "create_timestamp": 1709300000,
+    "name": "Arya Stark",
+    "buyer_email": "arya@example.com",
+    "first_line": "2 Kings Rd",
+    "city": "Braavos",
+    "state": "NY",
+    "zip": "10002",
+    "country_iso": "US",
+    "subtotal": {"amount": 2499, "divisor": 100, "currency_code": "USD"},
+    "total_tax_cost": {"amount": 206, "divisor": 100, "currency_code": "USD"},
+    "total_shipping_cost": {"amount": 499, "divisor": 100, "currency_code": "USD"},
+    "grandtotal": {"amount": 3204, "divisor": 100, "currency_code": "USD"},
+    "transactions": [
+        {
+            "sku": "ETSY-CRAFT-001",
+            "title": "Handmade Ceramic Mug",
+            "quantity": 1,
+            "price": {"amount": 2499, "divisor": 100, "currency_code": "USD"},
+        }
+    ],
+}
+
+
+def shopify_headers(body: bytes, secret: str = "shopify-secret") -> dict:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).digest()
+    return {
+        "X-Shopify-Hmac-Sha256": base64.b64encode(digest).decode(),
+        "X-Shopify-Topic": "orders/create",
+    }
+
+
+def etsy_headers(body: bytes, key: bytes = b"etsy-key") -> dict:
+    webhook_id, timestamp = "msg_1", str(int(time.time()))
+    signed = f"{webhook_id}.{timestamp}.".encode() + body
+    signature = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+    return {
+        "webhook-id": webhook_id,
+        "webhook-timestamp": timestamp,
+        "webhook-signature": f"v1,{signature}",
+    }
+
+
+class TestWebhooks:
+    """Test webhook receivers and the batch consumer."""
+
+    @pytest.fixture(autouse=True)
+    def consumer(self, monkeypatch):
+        monkeypatch.setattr(settings, "shopify_webhook_secret", "shopify-secret")
+        monkeypatch.setattr(
+            settings, "etsy_webhook_secret", "whsec_" + base64.b64encode(b"etsy-key").decode()
+        )
+        self.consumer = WebhookConsumer(get_aggregator(), queue_size=2, batch_size=10)
+        app.dependency_overrides[get_webhook_consumer] = lambda: self.consumer
+        yield
+        app.dependency_overrides.pop(get_webhook_consumer, None)
+
+    def test_shopify_webhook_stored_after_flush(self):
+        """Test a signed Shopify order is acknowledged, queued and stored."""
+        body = json.dumps(SHOPIFY_ORDER).encode()
+        response = client.post(
+            "/api/webhooks/shopify", content=body, headers=shopify_headers(body)
+        )
+        assert response.status_code == 200
+        assert self.consumer.queue.qsize() == 1
+
+        assert asyncio.run(self.consumer.flush()) == 1
+
+        order = client.get(f"/api/orders/shopify:{SHOPIFY_ORDER['id']}").json()
+        assert order["order_number"] == "#9999"
+        assert order["customer_name"] == "Jon Snow"
+        assert order["order_date"] == "2024-03-01T15:00:00"
+        assert order["items"][0]["quantity"] == 2
+
+    def test_etsy_webhook_stored_after_flush(self):
+        """Test a signed Etsy receipt event is stored from its envelope."""
+        body = json.dumps({"event_type": "order.paid", "data": ETSY_RECEIPT}).encode()
+        response = client.post("/api/webhooks/etsy", content=body, headers=etsy_headers(body))
+        assert response.status_code == 200
+
+        asyncio.run(self.consumer.flush())
+
+        order = client.get(f"/api/orders/etsy:{ETSY_RECEIPT['receipt_id']}").json()
+        assert order["status"] == "processing"
+        assert order["total"] == 32.04
+
+    def test_bad_signatures_rejected(self):
+        """Test unsigned or tampered deliveries are refused."""
+        body = json.dumps(SHOPIFY_ORDER).encode()
+        headers = shopify_headers(body, secret="wrong")
+        assert client.post("/api/webhooks/shopify", content=body, headers=headers).status_code == 401
+        assert client.post("/api/webhooks/etsy", content=body, headers={}).status_code == 401
+        assert self.consumer.queue.empty()
+
+    def test_full_queue_asks_for_redelivery(self):
+        """Test deliveries beyond the queue bound get a 503 instead of piling up."""
+        body = json.dumps(SHOPIFY_ORDER).encode()
+        statuses = [
+            client.post(
+                "/api/webhooks/shopify", content=body, headers=shopify_headers(body)
+            ).status_code
+            for _ in range(3)
+        ]
+
+        assert statuses == [200, 200, 503]
+
+    def test_batch_survives_database_outage_and_bad_order(self, monkeypatch):
+        """Test acknowledged events are retried through an outage and one bad order fails alone."""
+        from sqlalchemy.exc import OperationalError
+
+        from src.services import webhooks
+        from src.services.webhooks import WebhookEvent
+
+        monkeypatch.setattr(webhooks, "WRITE_RETRY_SECONDS", 0.01)
+        good = {**SHOPIFY_ORDER, "id": 820982911946154600, "name": "#9001"}
+        bad = {**SHOPIFY_ORDER, "id": 820982911946154601}
+        batch = [
+            WebhookEvent("shopify", "orders/create", good),
+            WebhookEvent("shopify", "orders/create", bad),
+        ]
+
+        write = self.consumer._write
+        outages = []
+
+        def flaky_write(orders):
+            if not outages:
+                outages.append(1)
+                raise OperationalError("INSERT", {}, Exception("connection refused"))
+            if any(order["id"] == str(bad["id"]) for order in orders):
+                raise ValueError("rejected by the database")
+            return write(orders)
+
+        monkeypatch.setattr(self.consumer, "_write", flaky_write)
+
+        assert asyncio.run(self.consumer._store(batch)) == 1
+        assert outages
+        assert client.get(f"/api/orders/shopify:{good['id']}").json()["order_number"] == "#9001"
+